@@ -1,8 +1,13 @@
 import logging
+from typing import Annotated
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from ...core.config import settings
+from ...db.async_database import get_async_db, run_query
+from ...db.database import get_db
 from ...db.queries import check_missing_results, get_available_seasons
 from ...db.queries import get_teams as db_get_teams
 from ...services.data_processing.data_loader import get_this_seasons_fixtures_data
@@ -16,13 +21,14 @@ logger = logging.getLogger(__name__)
 
 
 @router.get("/seasons")
-def list_seasons():
+async def list_seasons(db: Annotated[AsyncSession, Depends(get_async_db)]):
     """Return all seasons that have fixture data in the database."""
-    return {"seasons": get_available_seasons()}
+    return {"seasons": await run_query(db, get_available_seasons)}
 
 
 @router.get("/fixtures")
 def get_fixtures(
+    db: Annotated[Session, Depends(get_db)],
     matchweek: int = Query(None),
     refresh: bool = False,
     season: str = Query(None),
@@ -32,10 +38,10 @@ def get_fixtures(
     Only attempts a live scrape refresh for the current season.
     """
     target_season = season or settings.CURRENT_SEASON
-    fixtures = get_this_seasons_fixtures_data(season=target_season)
+    fixtures = get_this_seasons_fixtures_data(season=target_season, session=db)
 
     if target_season == settings.CURRENT_SEASON:
-        date_check_refresh = check_missing_results(logger=logger)
+        date_check_refresh = check_missing_results(logger=logger, session=db)
         if refresh or date_check_refresh:
             try:
                 scrape_and_save_fixtures(season=settings.CURRENT_SEASON)
@@ -51,6 +57,6 @@ def get_fixtures(
 
 
 @router.get("/teams")
-def get_teams():
+async def get_teams(db: Annotated[AsyncSession, Depends(get_async_db)]):
     """Return all teams in the database."""
-    return {"teams": db_get_teams()}
+    return {"teams": await run_query(db, db_get_teams)}
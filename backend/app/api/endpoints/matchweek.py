@@ -1,5 +1,9 @@
-from fastapi import APIRouter
+from typing import Annotated
 
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...db.async_database import get_async_db, run_query
 from ...services.data_processing.data_loader import get_this_seasons_fixtures_data
 from ...services.utils.matchweek import get_current_matchweek
 
@@ -7,10 +11,10 @@ router = APIRouter()
 
 
 @router.get("/matchweek", tags=["Fixtures"])
-def get_matchweek():
+async def get_matchweek(db: Annotated[AsyncSession, Depends(get_async_db)]):
     """
     Get current/most recent EPL matchweek.
     """
-    fixtures = get_this_seasons_fixtures_data()
+    fixtures = await run_query(db, get_this_seasons_fixtures_data)
     current_matchweek = get_current_matchweek(fixtures)
     return {"current_matchweek": current_matchweek}
@@ -0,0 +1,21 @@
+import logging
+
+from fastapi import APIRouter, HTTPException
+
+from ...core.config import settings
+from ...services.models.drift import get_drift_monitor
+
+router = APIRouter(tags=["Model"])
+logger = logging.getLogger(__name__)
+
+
+@router.get("/monitoring/drift")
+def get_feature_drift(season: str = None):
+    """Compare live prediction features against the training distribution."""
+    season = season or settings.CURRENT_SEASON
+    monitor = get_drift_monitor(season)
+    if monitor is None:
+        raise HTTPException(
+            status_code=404, detail=f"No drift profile found for season {season}"
+        )
+    return monitor.report()
@@ -20,7 +20,7 @@ COLUMN_MAPPING = {
     "result": "Result",
     "PredScore": "PredScore",
     "PredResult": "PredResult",
-    "venue": "Venue",
+    "venue_display": "Venue",
     "week": "week",
     "FTHG": "FTHG",
     "FTAG": "FTAG",
@@ -28,8 +28,6 @@ COLUMN_MAPPING = {
     "PredFTAG": "PredFTAG",
 }
 
-VENUE_ALIASES = {"The American Express Community Stadium": "The AMEX"}
-
 
 @router.post("/predict")
 def predict_matches(request: MatchInput):
@@ -37,12 +35,10 @@ def predict_matches(request: MatchInput):
     season = request.season or settings.CURRENT_SEASON
     df_input = pd.DataFrame(request.data)
     predictions_df = predictor.predict_pipeline(
-        df_input, cache_duration_hours=24, logger=logger, season=season
+        df_input, cache_duration_hours=None, logger=logger, season=season
     )
 
     predictions_df = predictions_df[COLUMN_MAPPING.keys()].rename(columns=COLUMN_MAPPING)
-    for long, short in VENUE_ALIASES.items():
-        predictions_df["Venue"] = predictions_df["Venue"].replace(long, short)
     predictions_df["Score"] = predictions_df["Score"].replace("None-None", "")
     predictions_df = predictions_df.replace([float("inf"), float("-inf")], None).fillna("")
 
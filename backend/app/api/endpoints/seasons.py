@@ -1,10 +1,12 @@
 import logging
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...core.config import Settings, settings
-from ...db.queries import get_available_seasons
-from ...schemas import MatchweekResponse, SeasonsResponse
+from ...db.async_database import get_async_db, run_query
+from ...db.queries import get_available_seasons, get_league_table
+from ...schemas import LeagueTableResponse, MatchweekResponse, SeasonsResponse
 from ...services import seasons_service
 from ...services.data_processing.data_loader import get_this_seasons_fixtures_data
 from ...services.models.summary import get_or_compute_summary
@@ -14,45 +16,62 @@ router = APIRouter(prefix="/seasons", tags=["Seasons"])
 logger = logging.getLogger(__name__)
 
 
-def get_settings() -> Settings:
-    return settings
-
-
 @router.get("", response_model=SeasonsResponse)
-def list_seasons():
+async def list_seasons(db: Annotated[AsyncSession, Depends(get_async_db)]):
     """Return all seasons available in the database."""
-    return SeasonsResponse(seasons=get_available_seasons())
+    return SeasonsResponse(seasons=await run_query(db, get_available_seasons))
 
 
 @router.get("/{season}/summary")
-def get_season_summary(season: str, cfg: Settings = Depends(get_settings)):
+def get_season_summary(season: str):
     """
     Return pre-computed season summary (superbru points, model performance).
-    Finished seasons are served from cache instantly. Current season is computed live.
+    Served from cache until the season's results or predictions change.
     """
-    summary = get_or_compute_summary(season, current_season=cfg.CURRENT_SEASON)
+    summary = get_or_compute_summary(season)
     if not summary:
         raise HTTPException(status_code=404, detail=f"No data found for season {season}")
     return summary
 
 
+@router.get("/{season}/table", response_model=LeagueTableResponse)
+async def get_season_table(
+    season: str,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    week: int = Query(None),
+):
+    """
+    Return the league table as of the end of a matchweek (the latest with a
+    result by default), read from the materialised league_table.
+    """
+    rows = await run_query(db, get_league_table, season, week=week)
+    if not rows:
+        label = season if week is None else f"{season} matchweek {week}"
+        raise HTTPException(status_code=404, detail=f"No league table for {label}")
+    return LeagueTableResponse(season=season, week=rows[0]["week"], table=rows)
+
+
 @router.get("/{season}/matchweek")
-def get_season_current_matchweek(season: str):
+async def get_season_current_matchweek(
+    season: str, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
     """Return the current/most recent matchweek number for a season."""
-    fixtures = get_this_seasons_fixtures_data(season=season)
+    fixtures = await run_query(db, get_this_seasons_fixtures_data, season=season)
     week = get_current_matchweek(fixtures)
     return {"current_matchweek": week}
 
 
 @router.get("/{season}/matchweek/{week}", response_model=MatchweekResponse)
-def get_matchweek(season: str, week: int):
+async def get_matchweek(
+    season: str, week: int, db: Annotated[AsyncSession, Depends(get_async_db)]
+):
     """
     Return fixtures and predictions for a single matchweek.
 
     For finished seasons predictions are read directly from the DB cache.
     For the current season the prediction pipeline is triggered if needed.
     """
-    result = seasons_service.get_matchweek(season=season, week=week)
+    result = await seasons_service.get_matchweek_async(season=season, week=week, db=db)
     if result is None:
         raise HTTPException(
             status_code=404, detail=f"No data for {season} matchweek {week}"
@@ -22,7 +22,14 @@ class Settings(BaseSettings):
     DEBUG: bool = False
 
     DATABASE_URL: str = "sqlite:///./epl.db"
+    # Serving mode: the API reads a read-only copy at this path, republished
+    # after every write to DATABASE_URL (which then acts as staging).
+    # Empty reads DATABASE_URL directly.
+    SERVING_DATABASE_PATH: str = ""
     ALLOWED_ORIGINS: str = ""
+    # Statements taking longer are logged with their query plan; 0 disables.
+    # With DEBUG on, responses carry per-request X-DB-Statements/X-DB-Time-Ms.
+    SLOW_QUERY_MS: float = 100.0
 
     # App specific variables
     FOOTBALL_DATA_BASE_URL: str = ""
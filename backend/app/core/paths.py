@@ -7,8 +7,8 @@ artifacts_dir = backend_dir / "app" / "services" / "artifacts"
 
 # ARTIFACTS
 
-VENUE_ENCODER_FILEPATH = artifacts_dir / "encoders" / "venue_encoder.pkl"
-TEAM_ENCODER_FILEPATH = artifacts_dir / "encoders" / "team_encoder.pkl"
+VOCABULARY_FILEPATH = artifacts_dir / "encoders" / "vocabulary.json"
+DRIFT_PROFILE_FILEPATH = artifacts_dir / "drift_profile.json"
 SAVED_MODELS_DIRECTORY = artifacts_dir / "models"
 
 
@@ -19,9 +19,28 @@ def season_model_path(season: str) -> Path:
 def season_scaler_path(season: str) -> Path:
     return artifacts_dir / f"scaler_{season}.pkl"
 
+
+def season_vocabulary_path(season: str) -> Path:
+    return artifacts_dir / "encoders" / f"vocabulary_{season}.json"
+
+
+def season_drift_profile_path(season: str) -> Path:
+    return artifacts_dir / f"drift_profile_{season}.json"
+
+
+def feature_store_path(season: str = None, end_year: int = None) -> Path:
+    """Directory of the memory-mapped feature matrix for a training run."""
+    name = season or "default"
+    if end_year is not None:
+        name = f"{name}_to_{end_year}"
+    return artifacts_dir / "features" / name
+
 # DATA
 FIXTURES_TRAINING_DATA_DIR = data_dir / "fixtures_training_data"
 LINEUPS_TRAINING_DATA_DIR = data_dir / "lineups_training_data"
+SHOOTING_STATS_DATA_DIR = data_dir / "shooting_stats"
+STANDINGS_FILEPATH = data_dir / "standings" / "2000-2025.csv"
+SNAPSHOTS_DIR = data_dir / "snapshots"
 
 # CACHE
 SUPERBRU_LEADERBOARD_CACHE = data_dir / "cache" / "leaderboard.json"
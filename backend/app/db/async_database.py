@@ -0,0 +1,87 @@
+"""
+async_database.py
+
+Async engine and sessions for the read endpoints. Async handlers run on the
+event loop instead of the threadpool, so cheap reads (seasons, teams,
+matchweeks) don't queue behind slow sync work such as a prediction run.
+
+The async engine reads the same database as read_engine: the serving
+snapshot in serving mode, DATABASE_URL otherwise. SQLite and PostgreSQL URLs
+are switched to their async drivers (aiosqlite, asyncpg); any other URL must
+already name an async driver.
+
+Queries are not duplicated: run_query() runs the sync functions in
+queries.py on an AsyncSession through SQLAlchemy's greenlet bridge, so the
+same code serves both paths and its I/O goes through the async driver.
+
+Usage:
+    @router.get("/teams")
+    async def get_teams(db: Annotated[AsyncSession, Depends(get_async_db)]):
+        return {"teams": await run_query(db, queries.get_teams)}
+"""
+
+from pathlib import Path
+from typing import Any, Callable
+
+from sqlalchemy import URL, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ..core.config import settings
+from .database import _set_sqlite_pragmas, engine
+from .query_stats import instrument_engine
+from .serving import serving_url, watch_snapshot
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_url(url: URL) -> URL:
+    """`url` with its backend's async driver, if one is known."""
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name())
+    return url.set(drivername=drivername) if drivername else url
+
+
+try:
+    if settings.SERVING_DATABASE_PATH:
+        _path = Path(settings.SERVING_DATABASE_PATH).resolve()
+        async_engine = create_async_engine(serving_url(_path, ASYNC_DRIVERS["sqlite"]))
+        watch_snapshot(async_engine.sync_engine, _path, engine)
+    else:
+        async_engine = create_async_engine(async_url(engine.url))
+        if async_engine.dialect.name == "sqlite":
+            event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+except Exception as e:
+    raise Exception(f"Failed to create async database engine: {e}") from e
+instrument_engine(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+# Dependency for async FastAPI endpoints
+async def get_async_db():
+    """
+    Provide an async session for async endpoints. Like get_db(), one session
+    serves the whole request and is never committed.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def run_query(db: AsyncSession, fn: Callable, *args, **kwargs) -> Any:
+    """
+    Run a sync query (any function taking `session=`, e.g. from queries.py)
+    on `db` without blocking the event loop.
+
+    Args:
+        db: Request-scoped async session.
+        fn: Query function; receives the session's sync facade as `session`.
+        *args, **kwargs: Passed to `fn`.
+
+    Returns:
+        Whatever `fn` returns.
+    """
+    return await db.run_sync(lambda session: fn(*args, session=session, **kwargs))
@@ -0,0 +1,99 @@
+"""
+bulk.py
+
+Set-based INSERT ... ON CONFLICT helpers shared by the loaders and updaters.
+"""
+
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import Table, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def _insert_for(session: Session, table: Table):
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    raise NotImplementedError(f"Bulk upserts are not supported for {dialect}")
+
+
+def upsert_rows(
+    session: Session,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    key_columns: Iterable[str],
+    update_columns: Iterable[str],
+    keep_existing_when_null: bool = True,
+) -> None:
+    """
+    Insert `rows` into `table`, updating `update_columns` of any row whose
+    `key_columns` (which must carry a unique index) already exist.
+
+    Args:
+        session: Open session; the statement runs in its transaction.
+        table: Target table, e.g. Match.__table__.
+        rows: Dicts with the same keys for every row.
+        key_columns: Natural key columns used as the conflict target.
+        update_columns: Columns overwritten on conflict.
+        keep_existing_when_null: Leave a stored value in place when the
+            incoming value is NULL instead of clearing it.
+    """
+    if not rows:
+        return
+    stmt = _insert_for(session, table)
+    excluded = stmt.excluded
+    set_ = {
+        column: (
+            func.coalesce(excluded[column], table.c[column])
+            if keep_existing_when_null
+            else excluded[column]
+        )
+        for column in update_columns
+    }
+    session.execute(
+        stmt.on_conflict_do_update(index_elements=list(key_columns), set_=set_),
+        rows,
+    )
+
+
+def insert_ignore_conflicts(
+    session: Session,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    key_columns: Iterable[str],
+) -> None:
+    """
+    Insert `rows` into `table` in one executemany, silently skipping any row
+    whose `key_columns` (which must carry a unique index) already exist.
+    """
+    if not rows:
+        return
+    stmt = _insert_for(session, table)
+    session.execute(stmt.on_conflict_do_nothing(index_elements=list(key_columns)), rows)
+
+
+def increment_rows(
+    session: Session,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    key_columns: Iterable[str],
+    counter_column: str,
+    update_columns: Iterable[str] = (),
+) -> None:
+    """
+    Insert `rows` into `table`, or add each row's `counter_column` value to
+    the stored one (and overwrite `update_columns`) if its `key_columns`
+    already exist. The increment happens inside the statement, so
+    concurrent writers never lose a bump.
+    """
+    if not rows:
+        return
+    stmt = _insert_for(session, table)
+    set_ = {column: stmt.excluded[column] for column in update_columns}
+    set_[counter_column] = table.c[counter_column] + stmt.excluded[counter_column]
+    session.execute(
+        stmt.on_conflict_do_update(index_elements=list(key_columns), set_=set_), rows
+    )
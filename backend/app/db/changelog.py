@@ -0,0 +1,44 @@
+"""
+changelog.py
+
+Append the match_ids touched by a write to the change_log table, in the same
+transaction as the write itself, so caches can invalidate exactly what
+changed instead of relying on TTLs or full rebuilds.
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from .models import ChangeLog
+
+# (match_id, changed columns); None columns means the row was inserted
+Change = Tuple[int, Optional[Sequence[str]]]
+
+
+def record_changes(
+    session: Session, table_name: str, changes: Iterable[Change]
+) -> None:
+    """
+    Log one change_log row per changed match in a single executemany.
+
+    Args:
+        session: Session holding the write being logged; nothing is committed.
+        table_name: Table that was written, e.g. "matches".
+        changes: (match_id, columns) pairs; pass None as columns for inserts.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "table_name": table_name,
+            "match_id": int(match_id),
+            "operation": "insert" if columns is None else "update",
+            "columns": None if columns is None else ",".join(columns),
+            "changed_at": now,
+        }
+        for match_id, columns in changes
+    ]
+    if rows:
+        session.execute(insert(ChangeLog), rows)
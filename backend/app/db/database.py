@@ -1,10 +1,13 @@
 from contextlib import contextmanager
+from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from ..core.config import settings
+from .query_stats import instrument_engine
+from .serving import create_serving_engine, publish_snapshot
 
 try:
     engine = create_engine(
@@ -16,8 +19,45 @@ try:
 except Exception as e:
     raise Exception(f"Failed to create database engine: {e}")
 
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# writer, NORMAL sync is safe under WAL, and the page cache (negative means
+# KiB) and mmap window keep hot pages out of read() calls. busy_timeout makes
+# a connection wait for the write lock (held by the writer thread, or another
+# process such as a scraper) instead of failing with "database is locked".
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -65536,  # 64 MiB
+    "mmap_size": 268435456,  # 256 MiB
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,  # ms
+}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+instrument_engine(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Reads go to the serving snapshot in serving mode (see serving.py)
+if settings.SERVING_DATABASE_PATH:
+    read_engine = instrument_engine(
+        create_serving_engine(Path(settings.SERVING_DATABASE_PATH), engine)
+    )
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 Base = declarative_base()
 
 
@@ -25,9 +65,12 @@ Base = declarative_base()
 def get_db():
     """
     Provide a database session for dependency injection (e.g., FastAPI).
-    Yields a session and ensures it is closed after use.
+    Yields a session and ensures it is closed after use. One session serves
+    the whole request and is never committed: endpoints only read through
+    it, and writes go through the single writer (writer.run_write). In
+    serving mode it reads the serving snapshot.
     """
-    db = SessionLocal()
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
@@ -52,6 +95,28 @@ def get_session():
         session.close()
 
 
+# Context manager for read-only work outside a request
+@contextmanager
+def read_session():
+    """
+    Provide a session for reads. Nothing is committed; the read transaction
+    is simply released when the session closes. In serving mode it reads
+    the serving snapshot.
+    Usage: with read_session() as session: ...
+    """
+    session = ReadSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def publish_serving_snapshot() -> None:
+    """Publish the staging database as the new serving snapshot (serving mode only)."""
+    if settings.SERVING_DATABASE_PATH:
+        publish_snapshot(engine, Path(settings.SERVING_DATABASE_PATH))
+
+
 def create_tables():
     """
     Create all tables defined in models based on Base metadata.
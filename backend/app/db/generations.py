@@ -0,0 +1,75 @@
+"""
+generations.py
+
+Per-season, per-table data generations. Writers bump the (season, table)
+pairs they change in the same transaction as the write; caches store the
+generation they were built from and stay valid until it moves, instead of
+expiring on a timer.
+"""
+
+from datetime import datetime
+from typing import Iterable, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .bulk import increment_rows
+from .models import DataGeneration
+
+# Season key for tables that are not split by season
+ALL_SEASONS = "*"
+
+# What each derived data set is computed from
+PREDICTION_INPUT_TABLES = ("matches", "match_shooting_stats")
+TRAINING_INPUT_TABLES = (
+    "matches",
+    "match_shooting_stats",
+    "team_season_aggregates",
+    "teams",
+)
+SUMMARY_INPUT_TABLES = ("matches", "predictions_cache")
+METADATA_TABLES = ("matches", "teams")
+
+
+def bump_generations(session: Session, keys: Iterable[Tuple[str, str]]) -> None:
+    """
+    Increment the generation of every (season, table_name) in `keys`.
+
+    Args:
+        session: Session holding the write; nothing is committed.
+        keys: (season, table_name) pairs that changed. Duplicates bump once.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {"season": season, "table_name": table_name, "generation": 1, "updated_at": now}
+        for season, table_name in sorted(set(keys))
+    ]
+    increment_rows(
+        session,
+        DataGeneration.__table__,
+        rows,
+        key_columns=["season", "table_name"],
+        counter_column="generation",
+        update_columns=["updated_at"],
+    )
+
+
+def generation_of(season, tables: Iterable[str] = None, include_earlier: bool = False):
+    """
+    SELECT summing the generations of `tables` (all if None) for `season`,
+    which may be a value, a column to correlate with (e.g. Match.season) or
+    None for every season. The sum only ever grows, so it is a valid cache
+    key for the combination.
+
+    With `include_earlier`, every season up to and including `season` is
+    summed, for data derived from history as well as the season itself.
+    Season strings ("2023-2024") sort chronologically.
+    """
+    stmt = select(func.coalesce(func.sum(DataGeneration.generation), 0))
+    if season is not None and include_earlier:
+        stmt = stmt.where(DataGeneration.season <= season)
+    elif season is not None:
+        stmt = stmt.where(DataGeneration.season == season)
+    if tables is not None:
+        stmt = stmt.where(DataGeneration.table_name.in_(list(tables)))
+    return stmt
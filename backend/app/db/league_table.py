@@ -0,0 +1,120 @@
+"""
+league_table.py
+
+Materialised league table: one row per (season, matchweek, team) with the
+standings after that week's results. Writers of matches call
+refresh_league_table in the same transaction, passing the earliest week
+their change can affect, so only that week and the ones after it are
+rewritten. Reads are then a primary-key range scan, with no aggregation
+per request.
+"""
+
+from collections import defaultdict
+from typing import Dict, List
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from .models import LeagueTableEntry, Match, Team
+
+# Match columns whose change moves the table
+TABLE_INPUT_COLUMNS = ("week", "home_goals", "away_goals")
+
+
+def _ranked(totals: Dict[int, list], names: Dict[int, str]) -> List[int]:
+    """Teams in table order: points, goal difference, goals scored, then name."""
+
+    def key(team_id):
+        played, won, drawn, lost, goals_for, goals_against, points = totals[team_id]
+        return (
+            -points,
+            -(goals_for - goals_against),
+            -goals_for,
+            names.get(team_id, ""),
+        )
+
+    return sorted(totals, key=key)
+
+
+def refresh_league_table(session: Session, season: str, from_week: int = 1) -> int:
+    """
+    Recompute `season`'s table for `from_week` and every later week.
+
+    Weeks run up to the last one with a result. Earlier weeks are left
+    alone: they are still read to build the running totals, but not
+    rewritten. Nothing is committed.
+
+    Args:
+        session: Session holding the write.
+        season: Season string e.g. "2024-2025".
+        from_week: Earliest week whose table can have changed.
+
+    Returns:
+        int: Rows written.
+    """
+    matches = Match.__table__
+    rows = session.execute(
+        select(
+            matches.c.week,
+            matches.c.home_team_id,
+            matches.c.away_team_id,
+            matches.c.home_goals,
+            matches.c.away_goals,
+        ).where(matches.c.season == season)
+    ).all()
+
+    team_ids = {r.home_team_id for r in rows} | {r.away_team_id for r in rows}
+    names = dict(
+        session.execute(
+            select(Team.team_id, Team.name).where(Team.team_id.in_(team_ids))
+        ).all()
+    )
+    results_by_week = defaultdict(list)
+    for r in rows:
+        if r.week is not None and r.home_goals is not None and r.away_goals is not None:
+            results_by_week[r.week].append(r)
+
+    # played, won, drawn, lost, goals_for, goals_against, points
+    totals = {team_id: [0] * 7 for team_id in team_ids}
+    entries = []
+    for week in range(1, max(results_by_week, default=0) + 1):
+        for r in results_by_week.get(week, ()):
+            for team_id, scored, conceded in (
+                (r.home_team_id, r.home_goals, r.away_goals),
+                (r.away_team_id, r.away_goals, r.home_goals),
+            ):
+                t = totals[team_id]
+                outcome = 1 if scored > conceded else 2 if scored == conceded else 3
+                t[0] += 1
+                t[outcome] += 1
+                t[4] += scored
+                t[5] += conceded
+                t[6] += 3 if outcome == 1 else 1 if outcome == 2 else 0
+        if week < from_week:
+            continue
+        for position, team_id in enumerate(_ranked(totals, names), start=1):
+            played, won, drawn, lost, goals_for, goals_against, points = totals[team_id]
+            entries.append(
+                {
+                    "season": season,
+                    "week": week,
+                    "team_id": team_id,
+                    "position": position,
+                    "played": played,
+                    "won": won,
+                    "drawn": drawn,
+                    "lost": lost,
+                    "goals_for": goals_for,
+                    "goals_against": goals_against,
+                    "goal_difference": goals_for - goals_against,
+                    "points": points,
+                }
+            )
+
+    table = LeagueTableEntry.__table__
+    session.execute(
+        delete(table).where(table.c.season == season, table.c.week >= from_week)
+    )
+    if entries:
+        session.execute(insert(table), entries)
+    return len(entries)
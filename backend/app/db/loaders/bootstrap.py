@@ -0,0 +1,311 @@
+"""
+bootstrap.py
+
+Build a fresh database from the local CSV dumps under data/ without touching
+the network:
+
+    data/fixtures_training_data/<YYYY-YY>.csv   FBref scores & fixtures
+    data/shooting_stats/<Team-Name>.csv         FBref shooting match logs
+    data/standings/2000-2025.csv                final tables of earlier seasons
+
+Every file is parsed with vectorised pandas operations, ids are assigned in
+memory and each table is written with one executemany inside a single
+transaction. Secondary indexes are dropped for the load and rebuilt at the
+end, followed by ANALYZE.
+"""
+
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Engine, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from ...core.paths import (
+    FIXTURES_TRAINING_DATA_DIR,
+    SHOOTING_STATS_DATA_DIR,
+    STANDINGS_FILEPATH,
+)
+from ..database import Base
+from ..database import engine as default_engine
+from ..generations import ALL_SEASONS, bump_generations
+from ..league_table import refresh_league_table
+from ..mappings.load_mappings import load_team_ids_mapping, load_team_name_mapping
+from ..metadata_cache import bump_data_generation
+from ..models import UK_TIMEZONE, Match, MatchShootingStat, Team
+from ..season_aggregates import build_team_season_aggregates, is_finished_season
+from ..teams import resolve_team_ids
+from ..venues import resolve_venue_ids
+from .shooting_stats import STAT_COLUMNS
+from .standings import add_standings, read_standings
+
+_SEASON_FILE = re.compile(r"^(\d{4})-(\d{2}|\d{4})$")
+_SCORE = r"^\s*(\d+)\s*[–-]\s*(\d+)\s*$"
+_TEXT_STAT_COLUMNS = {"round", "day", "venue", "result", "opponent"}
+
+
+def _season_from_filename(path: Path) -> str | None:
+    """'2014-15.csv' or '2014-2015.csv' -> '2014-2015'."""
+    match = _SEASON_FILE.match(path.stem)
+    if not match:
+        return None
+    start = int(match.group(1))
+    return f"{start}-{start + 1}"
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    """Rows as dicts with NaN/NaT replaced by None, ready for executemany."""
+    df = df.astype(object)
+    return df.where(df.notna(), None).to_dict("records")
+
+
+def read_fixtures(fixtures_dir: Path) -> pd.DataFrame:
+    """
+    Read every season's fixtures CSV into one frame with parsed dates, times,
+    goals and results. Spacer rows and duplicate fixtures are dropped.
+    """
+    frames = []
+    for path in sorted(fixtures_dir.glob("*.csv")):
+        season = _season_from_filename(path)
+        if season is None:
+            print(
+                f"Skipping {path.name}: file name is not a season (e.g. 2014-15.csv)."
+            )
+            continue
+        frames.append(pd.read_csv(path).assign(season=season))
+    if not frames:
+        return pd.DataFrame()
+
+    raw = pd.concat(frames, ignore_index=True).dropna(subset=["Date", "Home", "Away"])
+    goals = raw["Score"].astype(str).str.extract(_SCORE).astype(float)
+    home_goals, away_goals = goals[0], goals[1]
+
+    def column(name: str) -> pd.Series:
+        return raw.get(name, pd.Series(None, index=raw.index, dtype=object))
+
+    df = pd.DataFrame(
+        {
+            "season": raw["season"],
+            "week": pd.to_numeric(column("Wk"), errors="coerce").astype("Int64"),
+            "day": column("Day"),
+            "date": pd.to_datetime(raw["Date"], format="%Y-%m-%d", errors="coerce"),
+            "time": pd.to_datetime(column("Time"), format="%H:%M", errors="coerce"),
+            "home": raw["Home"],
+            "away": raw["Away"],
+            "home_goals": home_goals.astype("Int64"),
+            "away_goals": away_goals.astype("Int64"),
+            "result": pd.Series(
+                np.select(
+                    [
+                        home_goals > away_goals,
+                        home_goals < away_goals,
+                        home_goals == away_goals,
+                    ],
+                    ["H", "A", "D"],
+                    default=None,
+                ),
+                index=raw.index,
+            ),
+            "attendance": pd.to_numeric(
+                column("Attendance").astype(str).str.replace(",", ""),
+                errors="coerce",
+            ).astype("Int64"),
+            "venue": column("Venue"),
+            "referee": column("Referee"),
+            "match_report": column("Match Report"),
+            "notes": column("Notes"),
+        }
+    ).dropna(subset=["date"])
+    return df.drop_duplicates(subset=["season", "date", "home", "away"]).reset_index(
+        drop=True
+    )
+
+
+def read_shooting_stats(stats_dir: Path) -> pd.DataFrame:
+    """Read every team's shooting match log, tagged with the file's team name."""
+    frames = [
+        pd.read_csv(path).assign(team=path.stem.replace("-", " "))
+        for path in sorted(stats_dir.glob("*.csv"))
+    ]
+    if not frames:
+        return pd.DataFrame()
+    raw = pd.concat(frames, ignore_index=True).dropna(subset=["Date", "Opponent"])
+    df = raw.reindex(columns=["team", *STAT_COLUMNS]).rename(columns=STAT_COLUMNS)
+    df["date"] = pd.to_datetime(raw["Date"], format="%Y-%m-%d", errors="coerce")
+    numeric = [c for c in STAT_COLUMNS.values() if c not in _TEXT_STAT_COLUMNS]
+    df[numeric] = df[numeric].apply(pd.to_numeric, errors="coerce")
+    return df.dropna(subset=["date"]).reset_index(drop=True)
+
+
+def _team_rows(names) -> list[dict]:
+    name_mapping = load_team_name_mapping()
+    ids_mapping = load_team_ids_mapping()
+    rows = []
+    for team_id, name in enumerate(sorted(names), start=1):
+        fullname = name_mapping.get(name, name)
+        rows.append(
+            {
+                "team_id": team_id,
+                "name": name,
+                "fullname": fullname,
+                "fbref_team_id": ids_mapping.get(
+                    fullname.replace(" ", "-"), f"unknown-{fullname}"
+                ),
+            }
+        )
+    return rows
+
+
+def _match_frame(
+    fixtures: pd.DataFrame, team_ids: dict, venue_ids: dict
+) -> pd.DataFrame:
+    df = fixtures.assign(
+        home_team_id=fixtures["home"].map(team_ids),
+        away_team_id=fixtures["away"].map(team_ids),
+        venue_id=fixtures["venue"].map(venue_ids),
+    ).sort_values(["season", "date", "time", "home"], na_position="first")
+    df["match_id"] = np.arange(1, len(df) + 1)
+    # Vectorised models.kickoff_utc: UK local date + time (midnight if unknown)
+    local = df["date"] + (df["time"] - df["time"].dt.normalize()).fillna(
+        pd.Timedelta(0)
+    )
+    df["kickoff_utc"] = (
+        local.dt.tz_localize(
+            UK_TIMEZONE.zone, ambiguous=False, nonexistent="shift_forward"
+        )
+        .dt.tz_convert("UTC")
+        .dt.tz_localize(None)
+    )
+    return df
+
+
+def _shooting_stat_frame(
+    stats: pd.DataFrame, matches: pd.DataFrame, team_ids: dict
+) -> pd.DataFrame:
+    stats = stats.assign(
+        team_id=stats["team"].map(team_ids), opponent_id=stats["opponent"].map(team_ids)
+    )
+    unknown = stats.loc[stats["team_id"].isna(), "team"].unique()
+    if len(unknown):
+        print(f"Skipping shooting stats for unknown teams: {sorted(unknown)}")
+    stats = stats.dropna(subset=["team_id", "opponent_id"]).astype(
+        {"team_id": int, "opponent_id": int}
+    )
+    is_home = stats["venue"] == "Home"
+    stats["home_team_id"] = np.where(is_home, stats["team_id"], stats["opponent_id"])
+    stats["away_team_id"] = np.where(is_home, stats["opponent_id"], stats["team_id"])
+    key = ["date", "home_team_id", "away_team_id"]
+    stats = stats.merge(matches[["match_id", *key]], on=key)
+    return stats.drop_duplicates(subset=["team_id", "match_id"])
+
+
+def bootstrap_database(
+    engine: Engine = default_engine,
+    fixtures_dir: Path = FIXTURES_TRAINING_DATA_DIR,
+    stats_dir: Path = SHOOTING_STATS_DATA_DIR,
+    standings_path: Path = STANDINGS_FILEPATH,
+) -> dict[str, int]:
+    """
+    Populate an empty database from the local CSV dumps.
+
+    Returns:
+        dict[str, int]: Rows written per table (empty if the database already
+        holds matches or there are no fixtures to load).
+    """
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        if session.scalar(select(func.count()).select_from(Match)):
+            print("Database already holds matches; bootstrap only fills an empty one.")
+            return {}
+
+    fixtures = read_fixtures(fixtures_dir)
+    if fixtures.empty:
+        print(f"No fixtures CSVs found in {fixtures_dir}.")
+        return {}
+    stats = read_shooting_stats(stats_dir)
+    standings = read_standings(standings_path)
+    if standings.empty:
+        print(
+            f"Warning: {standings_path} not found; the first season's prior-season "
+            "features will use defaults."
+        )
+
+    counts = {}
+    with Session(engine) as session, session.begin():
+        conn = session.connection()
+        indexes = [
+            index for table in Base.metadata.sorted_tables for index in table.indexes
+        ]
+        for index in indexes:
+            index.drop(conn)
+
+        teams = _team_rows(pd.concat([fixtures["home"], fixtures["away"]]).unique())
+        session.execute(insert(Team), teams)
+        team_ids = resolve_team_ids(
+            session,
+            [
+                *fixtures["home"].unique(),
+                *fixtures["away"].unique(),
+                *stats.get("team", []),
+                *stats.get("opponent", []),
+            ],
+            fuzzy=False,
+        )
+        venue_ids = resolve_venue_ids(session, fixtures["venue"].dropna().unique())
+
+        matches = _match_frame(fixtures, team_ids, venue_ids)
+        match_rows = matches.assign(
+            date=matches["date"].dt.date,
+            time=matches["time"].dt.time.where(matches["time"].notna(), None),
+        )[[c.name for c in Match.__table__.columns]]
+        session.execute(insert(Match), _records(match_rows))
+
+        stat_rows = pd.DataFrame()
+        if not stats.empty:
+            stat_rows = _shooting_stat_frame(stats, matches, team_ids)
+            session.execute(
+                insert(MatchShootingStat),
+                _records(stat_rows[["match_id", "team_id", *STAT_COLUMNS.values()]]),
+            )
+
+        seasons = matches["season"].unique()
+        table_rows = sum(refresh_league_table(session, season) for season in seasons)
+        # Official positions first, so the aggregates built below use them
+        aggregate_rows = add_standings(session, standings)
+        finished = [season for season in seasons if is_finished_season(session, season)]
+        aggregate_rows += sum(
+            build_team_season_aggregates(session, season) for season in finished
+        )
+
+        generations = [(ALL_SEASONS, "teams")]
+        generations += [(season, "matches") for season in seasons]
+        generations += [(season, "league_table") for season in seasons]
+        generations += [(season, "team_season_aggregates") for season in finished]
+        if not stat_rows.empty:
+            stat_seasons = matches.loc[
+                matches["match_id"].isin(stat_rows["match_id"]), "season"
+            ]
+            generations += [
+                (season, "match_shooting_stats") for season in stat_seasons.unique()
+            ]
+        bump_generations(session, generations)
+
+        for index in indexes:
+            index.create(conn)
+        conn.execute(text("ANALYZE"))
+        counts = {
+            "teams": len(teams),
+            "matches": len(matches),
+            "shooting_stats": len(stat_rows),
+            "league_table": table_rows,
+            "team_season_aggregates": aggregate_rows,
+        }
+    bump_data_generation()
+
+    seasons = fixtures["season"].nunique()
+    print(
+        f"Bootstrapped {counts['teams']} teams, {counts['matches']} matches and "
+        f"{counts['shooting_stats']} shooting stats from {seasons} seasons."
+    )
+    return counts
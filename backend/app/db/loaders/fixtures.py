@@ -2,8 +2,15 @@ from datetime import datetime
 
 import pandas as pd
 
-from ..database import get_session
+from ..changelog import record_changes
+from ..generations import ALL_SEASONS, bump_generations
+from ..league_table import refresh_league_table
+from ..metadata_cache import bump_data_generation
 from ..models import Match, Team
+from ..season_aggregates import close_season_if_finished
+from ..teams import resolve_team_ids
+from ..venues import resolve_venue_ids
+from ..writer import run_write
 
 
 def parse_score(score):
@@ -40,22 +47,24 @@ def add_teams(
     teams.update(df.get("Home", pd.Series([])).dropna().unique())
     teams.update(df.get("Away", pd.Series([])).dropna().unique())
 
-    team_map = {}
-    with get_session() as session:
-        for team_name in teams:
-            # Check for existing team
-            existing_team = session.query(Team).filter_by(name=team_name).first()
-            if existing_team:
-                team_map[team_name] = existing_team.team_id
-                continue
-
+    def write(session):
+        # Known spellings only: a name with no alias is a new team, not a typo
+        team_map = resolve_team_ids(session, teams, fuzzy=False)
+        new_teams = sorted(teams - team_map.keys())
+        for team_name in new_teams:
             fullname = team_full_name_mapping.get(team_name, team_name)
             fbref_team_id = team_ids_mapping.get(fullname.replace(" ", "-"), "unknown")
-            team = Team(name=team_name, fullname=fullname, fbref_team_id=fbref_team_id)
-            session.add(team)
-            session.flush()
-            team_map[team_name] = team.team_id
-        session.commit()
+            session.add(
+                Team(name=team_name, fullname=fullname, fbref_team_id=fbref_team_id)
+            )
+        session.flush()
+        team_map.update(resolve_team_ids(session, new_teams, fuzzy=False))
+        if new_teams:
+            bump_generations(session, [(ALL_SEASONS, "teams")])
+        return team_map
+
+    team_map = run_write(write)
+    bump_data_generation()
     return team_map
 
 
@@ -90,8 +99,10 @@ def add_matches(df: pd.DataFrame, season: str, team_map: dict) -> dict:
             f"Warning: Missing columns in DataFrame for season {season}: {missing_columns}"
         )
 
-    match_map = {}
-    with get_session() as session:
+    def write(session):
+        match_map = {}
+        inserted = []
+        venue_ids = resolve_venue_ids(session, df.get("Venue", pd.Series([])).unique())
         for _, row in df.iterrows():
             if "Date" not in df.columns or pd.isna(row.get("Date")):
                 print("Skipping row: Missing or invalid Date.")
@@ -138,7 +149,7 @@ def add_matches(df: pd.DataFrame, season: str, team_map: dict) -> dict:
                     attendance=int(row.get("Attendance"))
                     if pd.notna(row.get("Attendance"))
                     else None,
-                    venue=row.get("Venue"),
+                    venue_id=venue_ids.get(row.get("Venue")),
                     referee=row.get("Referee"),
                     match_report=row.get("Match Report"),
                     notes=row.get("Notes"),
@@ -146,10 +157,19 @@ def add_matches(df: pd.DataFrame, season: str, team_map: dict) -> dict:
                 session.add(match)
                 session.flush()
                 match_map[(date, home_team_id)] = match.match_id
+                inserted.append((match.match_id, None))
             except Exception as e:
                 print(
                     f"Error processing row for {season} on {row.get('Date', 'unknown')}: {e}"
                 )
                 continue
-        session.commit()
+        record_changes(session, "matches", inserted)
+        if inserted:
+            refresh_league_table(session, season)
+            bump_generations(session, [(season, "matches"), (season, "league_table")])
+            close_season_if_finished(session, season)
+        return match_map
+
+    match_map = run_write(write)
+    bump_data_generation()
     return match_map
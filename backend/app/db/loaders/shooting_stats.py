@@ -1,10 +1,33 @@
-from datetime import datetime
-
 import pandas as pd
 from sqlalchemy import select
 
-from ..database import get_session
-from ..models import Match, MatchShootingStat, Team
+from ..bulk import insert_ignore_conflicts
+from ..changelog import record_changes
+from ..generations import bump_generations
+from ..metadata_cache import bump_data_generation
+from ..models import Match, MatchShootingStat
+from ..teams import resolve_team_ids
+from ..writer import run_write
+
+# Scraped column -> match_shooting_stats column
+STAT_COLUMNS = {
+    "Round": "round",
+    "Day": "day",
+    "Venue": "venue",
+    "Result": "result",
+    "GF": "gf",
+    "GA": "ga",
+    "Opponent": "opponent",
+    "Sh": "sh",
+    "SoT": "sot",
+    "SoT%": "sot_percent",
+    "G/Sh": "g_per_sh",
+    "G/SoT": "g_per_sot",
+    "Dist": "dist",
+    "PK": "pk",
+    "PKatt": "pkatt",
+    "FK": "fk",
+}
 
 
 def add_shooting_stats(df: pd.DataFrame, team_name: str, seasons: list[str]) -> None:
@@ -20,25 +43,7 @@ def add_shooting_stats(df: pd.DataFrame, team_name: str, seasons: list[str]) ->
         print("Argument `df` is not a pandas DataFrame")
         return
 
-    expected_columns = [
-        "Date",
-        "Round",
-        "Day",
-        "Venue",
-        "Result",
-        "GF",
-        "GA",
-        "Opponent",
-        "Sh",
-        "SoT",
-        "SoT%",
-        "G/Sh",
-        "G/SoT",
-        "Dist",
-        "PK",
-        "PKatt",
-        "FK",
-    ]
+    expected_columns = ["Date", *STAT_COLUMNS]
     missing_columns = [col for col in expected_columns if col not in df.columns]
     if missing_columns:
         print(
@@ -47,98 +52,93 @@ def add_shooting_stats(df: pd.DataFrame, team_name: str, seasons: list[str]) ->
 
     df = df.dropna(subset=["Date"])  # Filter out rows with missing values
 
-    with get_session() as session:
-        # Get team_id
-        team = session.execute(
-            select(Team).filter_by(name=team_name)
-        ).scalar_one_or_none()
-        if not team:
+    def write(session):
+        # Resolve the team and every opponent through the alias index
+        team_ids = resolve_team_ids(
+            session, [team_name, *df.get("Opponent", pd.Series([])).unique()]
+        )
+        team_id = team_ids.get(team_name)
+        if team_id is None:
             print(f"Team {team_name} not found.")
             return
 
-        team_id = team.team_id
-
         # Create a map of matches for lookup
         matches = session.execute(
             select(
-                Match.match_id, Match.date, Match.home_team_id, Match.away_team_id
+                Match.match_id,
+                Match.season,
+                Match.date,
+                Match.home_team_id,
+                Match.away_team_id,
             ).filter(Match.season.in_(seasons))
         ).all()
         match_map = {
             (match.date, match.home_team_id): match.match_id for match in matches
         }
+        season_of = {match.match_id: match.season for match in matches}
+
+        # Stats already stored for this team in these seasons
+        existing = set(
+            session.scalars(
+                select(MatchShootingStat.match_id)
+                .join(Match)
+                .where(MatchShootingStat.team_id == team_id, Match.season.in_(seasons))
+            )
+        )
 
-        # Get opponent team IDs
-        opponent_map = {
-            t.name: t.team_id for t in session.execute(select(Team)).scalars()
-        }
+        dates = pd.to_datetime(df["Date"], format="%Y-%m-%d", errors="coerce")
+        values = df.reindex(columns=list(STAT_COLUMNS)).astype(object)
+        values = values.where(values.notna(), None).rename(columns=STAT_COLUMNS)
+
+        rows = []
+        for date, stat in zip(dates, values.to_dict("records"), strict=True):
+            opponent_name = stat["opponent"]
+            if pd.isna(date):
+                print(f"Skipping {team_name} vs {opponent_name}: invalid date.")
+                continue
+            date = date.date()
+            opponent_team_id = team_ids.get(opponent_name)
+            if not opponent_team_id:
+                print(f"Opponent {opponent_name} not found for {team_name} on {date}.")
+                continue
 
-        # Insert shooting stats
-        for _, row in df.iterrows():
-            try:
-                date = datetime.strptime(row["Date"], "%Y-%m-%d").date()
-                is_home = row["Venue"] == "Home"
-                opponent_name = row["Opponent"]
-                opponent_team_id = opponent_map.get(opponent_name)
-
-                if not opponent_team_id:
-                    print(
-                        f"Opponent {opponent_name} not found for {team_name} on {date}."
-                    )
-                    continue
-
-                # Determine match_id
-                match_key = (date, (team_id if is_home else opponent_team_id))
-                match_id = match_map.get(match_key)
-
-                if match_id is None:
-                    print(
-                        f"No match found for ({'Home' if is_home else 'Away'}) {team_name} vs {opponent_name} on {date}."
-                    )
-                    continue
-
-                # Check for existing record
-                existing_stat = session.execute(
-                    select(MatchShootingStat).filter_by(
-                        match_id=match_id, team_id=team_id
-                    )
-                ).scalar_one_or_none()
-
-                if existing_stat:
-                    # print(f"Shooting stat already exists for match_id={match_id}, team={team_name}.")
-                    continue
-
-                # Create new shooting stat record
-                stat = MatchShootingStat(
-                    match_id=match_id,
-                    team_id=team_id,
-                    round=row.get("Round"),
-                    day=row.get("Day"),
-                    venue=row.get("Venue"),
-                    result=row.get("Result"),
-                    gf=row.get("GF", None),
-                    ga=row.get("GA", None),
-                    opponent=row.get("Opponent"),
-                    sh=row.get("Sh", None),
-                    sot=row.get("SoT", None),
-                    sot_percent=row.get("SoT%", None),
-                    g_per_sh=row.get("G/Sh", None),
-                    g_per_sot=row.get("G/SoT", None),
-                    dist=row.get("Dist", None),
-                    pk=row.get("PK", None),
-                    pkatt=row.get("PKatt", None),
-                    fk=row.get("FK", None),
+            # Determine match_id
+            is_home = stat["venue"] == "Home"
+            match_id = match_map.get((date, team_id if is_home else opponent_team_id))
+            if match_id is None:
+                print(
+                    f"No match found for ({'Home' if is_home else 'Away'}) {team_name} vs {opponent_name} on {date}."
                 )
-                session.add(stat)
+                continue
 
-            except Exception as e:
-                print(f"Error processing row for {team_name} on {row['Date']}: {e}")
+            if match_id in existing:
                 continue
+            existing.add(match_id)
+            rows.append({"match_id": match_id, "team_id": team_id, **stat})
+
+        # One executemany; rows written concurrently since the prefetch are skipped
+        insert_ignore_conflicts(
+            session,
+            MatchShootingStat.__table__,
+            rows,
+            key_columns=["team_id", "match_id"],
+        )
+        record_changes(
+            session, "match_shooting_stats", [(row["match_id"], None) for row in rows]
+        )
+        bump_generations(
+            session,
+            [(season_of[row["match_id"]], "match_shooting_stats") for row in rows],
+        )
+        return len(rows)
 
-        session.commit()
+    inserted = run_write(write)
+    bump_data_generation()
+    if inserted is not None:
+        print(f"Shooting stats for {team_name}: {inserted} inserted.")
 
 
 if __name__ == "__main__":
     # Example usage
     df = pd.read_csv("../../data/shooting_stats_2013_Arsenal.csv")
-    add_shooting_stats(df, team_name="Arsenal", season="2013-2014")
+    add_shooting_stats(df, team_name="Arsenal", seasons=["2013-2014"])
@@ -0,0 +1,91 @@
+"""
+standings.py
+
+Load the final league tables in the standings CSV. Every season's positions
+are stored as official_standings, which season_aggregates.py uses instead of
+ranking on matches alone (the published table includes points deductions).
+Seasons that predate the fixtures in the database are also seeded straight
+into team_season_aggregates; the others are aggregated from their matches.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..bulk import insert_ignore_conflicts
+from ..generations import bump_generations
+from ..models import Match, OfficialStanding, TeamSeasonAggregate
+from ..teams import resolve_team_ids
+
+
+def read_standings(path: Path) -> pd.DataFrame:
+    """
+    Final league tables with seasons as "2013-2014" and goal columns as
+    integers. Empty if the file doesn't exist.
+    """
+    if not Path(path).exists():
+        return pd.DataFrame()
+    df = pd.read_csv(path, usecols=["Season", "Pos", "Team", "GF", "GA", "GD"])
+    # GD uses a Unicode minus (U+2212) and a leading "+" in some rows
+    for col in ["GF", "GA", "GD"]:
+        df[col] = pd.to_numeric(
+            df[col]
+            .astype(str)
+            .str.replace("−", "-", regex=False)
+            .str.replace("+", "", regex=False),
+            errors="coerce",
+        )
+    start = df["Season"].astype(str).str[:4].astype(int)
+    df["Season"] = start.astype(str) + "-" + (start + 1).astype(str)
+    return df.dropna(subset=["Pos", "GF", "GA", "GD"])
+
+
+def add_standings(session: Session, standings: pd.DataFrame) -> int:
+    """
+    Store the official positions of every CSV season, and insert aggregates
+    for the CSV seasons that have no matches. Call before building the
+    aggregates of seasons with matches, so they pick up the official
+    positions. Teams that are not in the database are skipped. Nothing is
+    committed.
+
+    Returns:
+        int: Aggregate rows inserted.
+    """
+    if standings.empty:
+        return 0
+    team_ids = resolve_team_ids(session, standings["Team"].unique(), fuzzy=False)
+    standings = standings[standings["Team"].isin(team_ids)]
+    positions = [
+        {"season": row.Season, "team_id": team_ids[row.Team], "position": int(row.Pos)}
+        for row in standings.itertuples(index=False)
+    ]
+    insert_ignore_conflicts(
+        session,
+        OfficialStanding.__table__,
+        positions,
+        key_columns=["season", "team_id"],
+    )
+
+    with_matches = set(session.scalars(select(Match.season).distinct()))
+    standings = standings[~standings["Season"].isin(with_matches)]
+    rows = [
+        {
+            "season": row.Season,
+            "team_id": team_ids[row.Team],
+            "position": int(row.Pos),
+            "goals_for": int(row.GF),
+            "goals_against": int(row.GA),
+            "goal_difference": int(row.GD),
+        }
+        for row in standings.itertuples(index=False)
+    ]
+    insert_ignore_conflicts(
+        session, TeamSeasonAggregate.__table__, rows, key_columns=["season", "team_id"]
+    )
+    bump_generations(
+        session,
+        [(season, "team_season_aggregates") for season in standings["Season"].unique()],
+    )
+    return len(rows)
@@ -26,3 +26,12 @@ def load_team_ids_mapping() -> dict:
     except FileNotFoundError:
         print("Warning: team_ids_mapping.json not found.")
         return {}
+
+
+def load_venue_aliases_mapping() -> dict:
+    try:
+        filepath = os.path.join(current_dir, "venue_aliases_mapping.json")
+        return load_json_file(filepath)
+    except FileNotFoundError:
+        print("Warning: venue_aliases_mapping.json not found.")
+        return {}
@@ -0,0 +1,84 @@
+"""
+metadata_cache.py
+
+Process-wide cache for the small reference sets read on almost every
+request and pipeline run: seasons, teams and venues. Entries are tagged with
+the data generation of the matches and teams tables (see generations.py),
+which is re-read at most once every WATERMARK_CHECK_SECONDS, so steady-state
+reads are served from memory and writes from any process are picked up
+within that interval. Writers in this process call bump_data_generation()
+after committing so their own changes show up immediately.
+"""
+
+import copy
+import functools
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .generations import METADATA_TABLES
+
+WATERMARK_CHECK_SECONDS = 1.0
+
+_watermark: Optional[int] = None
+_checked_at = 0.0
+_entries: Dict[tuple, Tuple[int, object]] = {}
+_lock = threading.Lock()
+
+
+def data_generation(session: Session = None) -> int:
+    """Data generation of the reference tables, re-read when the last check is stale."""
+    global _watermark, _checked_at
+    now = time.monotonic()
+    watermark = _watermark
+    if watermark is None or now - _checked_at >= WATERMARK_CHECK_SECONDS:
+        from .queries import get_data_generation  # queries caches through this module
+
+        watermark = get_data_generation(tables=METADATA_TABLES, session=session)
+        with _lock:
+            if watermark != _watermark:
+                _entries.clear()
+            _watermark, _checked_at = watermark, now
+    return watermark
+
+
+def bump_data_generation() -> None:
+    """Re-read the generation on the next lookup; call after committing a write."""
+    global _watermark
+    with _lock:
+        _watermark = None
+        _entries.clear()
+
+
+def clear_metadata_cache() -> None:
+    """Drop every cached entry and the remembered generation."""
+    bump_data_generation()
+
+
+def cached_metadata(fn: Callable) -> Callable:
+    """
+    Cache a query's result per argument set for the current data generation.
+
+    The `session` argument is not part of the key: every session sees the
+    same committed reference data. Callers get a copy, so mutating a result
+    never leaks into the cache.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, session=None, **kwargs):
+        key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+        generation = data_generation(session)
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == generation:
+            return copy.deepcopy(entry[1])
+
+        value = fn(*args, session=session, **kwargs)
+        with _lock:
+            # Don't store a result read while a writer was bumping the generation
+            if _watermark == generation:
+                _entries[key] = (generation, value)
+        return copy.deepcopy(value)
+
+    return wrapper
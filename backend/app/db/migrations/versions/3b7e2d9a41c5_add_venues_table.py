@@ -0,0 +1,111 @@
+"""Add venues and venue_aliases tables, replace matches.venue with venue_id
+
+Revision ID: 3b7e2d9a41c5
+Revises: 51c8f9b14003
+Create Date: 2026-10-19 09:12:31.118204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7e2d9a41c5"
+down_revision: Union[str, Sequence[str], None] = "51c8f9b14003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# venue_aliases_mapping.json as of this revision
+VENUE_ALIASES_MAPPING = {
+    "The American Express Community Stadium": {
+        "display_name": "The AMEX",
+        "aliases": ["The American Express Stadium"],
+    },
+    "St. Mary's Stadium": {
+        "display_name": None,
+        "aliases": ["St Mary's Stadium"],
+    },
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "venues",
+        sa.Column("venue_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("display_name", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("venue_id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "venue_aliases",
+        sa.Column("alias", sa.String(), nullable=False),
+        sa.Column("venue_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["venue_id"], ["venues.venue_id"]),
+        sa.PrimaryKeyConstraint("alias"),
+    )
+    with op.batch_alter_table("matches") as batch_op:
+        batch_op.add_column(sa.Column("venue_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_matches_venue_id_venues", "venues", ["venue_id"], ["venue_id"]
+        )
+
+    # Resolve every distinct venue string to a canonical venue
+    conn = op.get_bind()
+    mapping = VENUE_ALIASES_MAPPING
+    canonical_names = {
+        alias: canonical
+        for canonical, entry in mapping.items()
+        for alias in entry.get("aliases", [])
+    }
+    raw_names = [
+        r[0]
+        for r in conn.execute(
+            sa.text("SELECT DISTINCT venue FROM matches WHERE venue IS NOT NULL")
+        )
+    ]
+
+    venue_ids = {}
+    for name in sorted({canonical_names.get(n, n) for n in raw_names}):
+        conn.execute(
+            sa.text("INSERT INTO venues (name, display_name) VALUES (:name, :display)"),
+            {"name": name, "display": mapping.get(name, {}).get("display_name")},
+        )
+        venue_ids[name] = conn.execute(
+            sa.text("SELECT venue_id FROM venues WHERE name = :name"), {"name": name}
+        ).scalar_one()
+
+    aliases = {name: venue_ids[name] for name in venue_ids}
+    aliases.update({n: venue_ids[canonical_names.get(n, n)] for n in raw_names})
+    for alias, venue_id in aliases.items():
+        conn.execute(
+            sa.text("INSERT INTO venue_aliases (alias, venue_id) VALUES (:a, :v)"),
+            {"a": alias, "v": venue_id},
+        )
+    conn.execute(
+        sa.text(
+            "UPDATE matches SET venue_id = "
+            "(SELECT venue_id FROM venue_aliases WHERE alias = matches.venue)"
+        )
+    )
+
+    with op.batch_alter_table("matches") as batch_op:
+        batch_op.drop_column("venue")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("matches") as batch_op:
+        batch_op.add_column(sa.Column("venue", sa.String(), nullable=True))
+    op.execute(
+        "UPDATE matches SET venue = "
+        "(SELECT name FROM venues WHERE venues.venue_id = matches.venue_id)"
+    )
+    with op.batch_alter_table("matches") as batch_op:
+        batch_op.drop_constraint("fk_matches_venue_id_venues", type_="foreignkey")
+        batch_op.drop_column("venue_id")
+    op.drop_table("venue_aliases")
+    op.drop_table("venues")
@@ -0,0 +1,360 @@
+"""Add team_season_aggregates
+
+Revision ID: 4b9d1e6a7f30
+Revises: e7a4c19b2d58
+Create Date: 2026-10-19 14:37:05.662114
+
+Also adds official_standings. Both are filled from the standings CSV and the
+finished seasons already stored; after that the fixture writers add each
+season when it finishes. The backfill is a frozen copy of the standings
+loader and app.db.season_aggregates as of this revision, so later changes to
+the application code don't change what this migration does.
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Sequence, Union
+
+import pandas as pd
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql, sqlite
+
+# revision identifiers, used by Alembic.
+revision: str = "4b9d1e6a7f30"
+down_revision: Union[str, Sequence[str], None] = "e7a4c19b2d58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# <project root>/data/standings/2000-2025.csv
+STANDINGS_FILEPATH = (
+    Path(__file__).resolve().parents[5] / "data" / "standings" / "2000-2025.csv"
+)
+
+# Tables as of this revision
+matches = sa.table(
+    "matches",
+    sa.column("season", sa.String),
+    sa.column("home_team_id", sa.Integer),
+    sa.column("away_team_id", sa.Integer),
+    sa.column("home_goals", sa.Integer),
+    sa.column("away_goals", sa.Integer),
+)
+teams = sa.table(
+    "teams",
+    sa.column("team_id", sa.Integer),
+    sa.column("name", sa.String),
+    sa.column("fullname", sa.String),
+)
+team_aliases = sa.table(
+    "team_aliases",
+    sa.column("alias", sa.String),
+    sa.column("team_id", sa.Integer),
+    sa.column("source", sa.String),
+)
+official_standings = sa.table(
+    "official_standings",
+    sa.column("season", sa.String),
+    sa.column("team_id", sa.Integer),
+    sa.column("position", sa.Integer),
+)
+AGGREGATE_COLUMNS = [
+    "season",
+    "team_id",
+    "position",
+    "played",
+    "won",
+    "drawn",
+    "lost",
+    "goals_for",
+    "goals_against",
+    "goal_difference",
+    "points",
+    "computed_at",
+]
+team_season_aggregates = sa.table(
+    "team_season_aggregates",
+    *(sa.column(name, sa.Integer) for name in AGGREGATE_COLUMNS[1:-1]),
+    sa.column("season", sa.String),
+    sa.column("computed_at", sa.DateTime),
+)
+data_generation = sa.table(
+    "data_generation",
+    sa.column("season", sa.String),
+    sa.column("table_name", sa.String),
+    sa.column("generation", sa.Integer),
+    sa.column("updated_at", sa.DateTime),
+)
+
+
+def _current_season() -> str:
+    """settings.CURRENT_SEASON: the environment's, else the season running today."""
+    if os.environ.get("CURRENT_SEASON"):
+        return os.environ["CURRENT_SEASON"]
+    now = datetime.now()
+    year = now.year if now.month >= 8 else now.year - 1
+    return f"{year}-{year + 1}"
+
+
+def _read_standings(path: Path) -> pd.DataFrame:
+    """Final league tables with seasons as "2013-2014" and integer goal columns."""
+    if not path.exists():
+        return pd.DataFrame()
+    df = pd.read_csv(path, usecols=["Season", "Pos", "Team", "GF", "GA", "GD"])
+    # GD uses a Unicode minus (U+2212) and a leading "+" in some rows
+    for col in ["GF", "GA", "GD"]:
+        df[col] = pd.to_numeric(
+            df[col]
+            .astype(str)
+            .str.replace("−", "-", regex=False)
+            .str.replace("+", "", regex=False),
+            errors="coerce",
+        )
+    start = df["Season"].astype(str).str[:4].astype(int)
+    df["Season"] = start.astype(str) + "-" + (start + 1).astype(str)
+    return df.dropna(subset=["Pos", "GF", "GA", "GD"])
+
+
+def _resolve_team_ids(conn, names) -> dict:
+    """
+    Team ids by alias, then by team name or full name (recording the alias).
+    Names matching neither are left out.
+    """
+    resolved = dict(
+        conn.execute(
+            sa.select(team_aliases.c.alias, team_aliases.c.team_id).where(
+                team_aliases.c.alias.in_(names)
+            )
+        ).all()
+    )
+    known = {}
+    for team_id, name, fullname in conn.execute(
+        sa.select(teams.c.team_id, teams.c.name, teams.c.fullname)
+    ):
+        known.setdefault(name, (team_id, "name"))
+        known.setdefault(fullname, (team_id, "fullname"))
+    new_aliases = [
+        {"alias": name, "team_id": known[name][0], "source": known[name][1]}
+        for name in sorted(set(names) - resolved.keys())
+        if name in known
+    ]
+    if new_aliases:
+        conn.execute(sa.insert(team_aliases), new_aliases)
+    resolved.update({row["alias"]: row["team_id"] for row in new_aliases})
+    return resolved
+
+
+def _insert(conn, table):
+    """INSERT supporting ON CONFLICT on both SQLite and PostgreSQL."""
+    return (sqlite if conn.dialect.name == "sqlite" else postgresql).insert(table)
+
+
+def _insert_ignore_conflicts(conn, table, rows: list[dict]) -> None:
+    """Insert rows keyed on (season, team_id), skipping keys already stored."""
+    if rows:
+        stmt = _insert(conn, table).on_conflict_do_nothing(
+            index_elements=["season", "team_id"]
+        )
+        conn.execute(stmt, rows)
+
+
+def _bump_generations(conn, seasons) -> None:
+    """Increment each season's team_season_aggregates generation."""
+    rows = [
+        {
+            "season": season,
+            "table_name": "team_season_aggregates",
+            "generation": 1,
+            "updated_at": datetime.utcnow(),
+        }
+        for season in sorted(set(seasons))
+    ]
+    if rows:
+        stmt = _insert(conn, data_generation)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["season", "table_name"],
+            set_={
+                "generation": data_generation.c.generation + stmt.excluded.generation,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        conn.execute(stmt, rows)
+
+
+def _add_standings(conn, standings: pd.DataFrame) -> None:
+    """
+    Store the official positions of every CSV season, and seed aggregates for
+    the CSV seasons that have no matches.
+    """
+    if standings.empty:
+        return
+    team_ids = _resolve_team_ids(conn, list(standings["Team"].unique()))
+    standings = standings[standings["Team"].isin(team_ids)]
+    _insert_ignore_conflicts(
+        conn,
+        official_standings,
+        [
+            {
+                "season": row.Season,
+                "team_id": team_ids[row.Team],
+                "position": int(row.Pos),
+            }
+            for row in standings.itertuples(index=False)
+        ],
+    )
+
+    with_matches = set(conn.scalars(sa.select(matches.c.season).distinct()))
+    standings = standings[~standings["Season"].isin(with_matches)]
+    _insert_ignore_conflicts(
+        conn,
+        team_season_aggregates,
+        [
+            {
+                "season": row.Season,
+                "team_id": team_ids[row.Team],
+                "position": int(row.Pos),
+                "goals_for": int(row.GF),
+                "goals_against": int(row.GA),
+                "goal_difference": int(row.GD),
+                "computed_at": datetime.utcnow(),
+            }
+            for row in standings.itertuples(index=False)
+        ],
+    )
+    _bump_generations(conn, standings["Season"].unique())
+
+
+def _is_finished(conn, season: str) -> bool:
+    total, unplayed = conn.execute(
+        sa.select(
+            sa.func.count(),
+            sa.func.count().filter(
+                matches.c.home_goals.is_(None) | matches.c.away_goals.is_(None)
+            ),
+        ).where(matches.c.season == season)
+    ).one()
+    return total > 0 and (unplayed == 0 or season < _current_season())
+
+
+def _build_aggregates(conn, season: str) -> None:
+    """Replace `season`'s aggregates with its final table, built in SQL."""
+    has_result = (
+        (matches.c.season == season)
+        & matches.c.home_goals.is_not(None)
+        & matches.c.away_goals.is_not(None)
+    )
+    sides = sa.union_all(
+        sa.select(
+            matches.c.home_team_id.label("team_id"),
+            matches.c.home_goals.label("scored"),
+            matches.c.away_goals.label("conceded"),
+        ).where(has_result),
+        sa.select(
+            matches.c.away_team_id.label("team_id"),
+            matches.c.away_goals.label("scored"),
+            matches.c.home_goals.label("conceded"),
+        ).where(has_result),
+    ).subquery("sides")
+
+    def count(condition):
+        return sa.func.sum(sa.case((condition, 1), else_=0))
+
+    won = count(sides.c.scored > sides.c.conceded)
+    drawn = count(sides.c.scored == sides.c.conceded)
+    scored = sa.func.sum(sides.c.scored)
+    conceded = sa.func.sum(sides.c.conceded)
+    totals = (
+        sa.select(
+            sides.c.team_id,
+            sa.func.count().label("played"),
+            won.label("won"),
+            drawn.label("drawn"),
+            count(sides.c.scored < sides.c.conceded).label("lost"),
+            scored.label("goals_for"),
+            conceded.label("goals_against"),
+            (scored - conceded).label("goal_difference"),
+            (3 * won + drawn).label("points"),
+        )
+        .group_by(sides.c.team_id)
+        .subquery("totals")
+    )
+    ranked = sa.func.row_number().over(
+        order_by=(
+            totals.c.points.desc(),
+            totals.c.goal_difference.desc(),
+            totals.c.goals_for.desc(),
+            teams.c.name,
+        )
+    )
+    rows = (
+        sa.select(
+            sa.literal(season),
+            totals.c.team_id,
+            sa.func.coalesce(official_standings.c.position, ranked),
+            totals.c.played,
+            totals.c.won,
+            totals.c.drawn,
+            totals.c.lost,
+            totals.c.goals_for,
+            totals.c.goals_against,
+            totals.c.goal_difference,
+            totals.c.points,
+            sa.literal(datetime.utcnow()),
+        )
+        .join_from(totals, teams, totals.c.team_id == teams.c.team_id)
+        .outerjoin(
+            official_standings,
+            (official_standings.c.season == season)
+            & (official_standings.c.team_id == totals.c.team_id),
+        )
+    )
+    conn.execute(
+        sa.delete(team_season_aggregates).where(
+            team_season_aggregates.c.season == season
+        )
+    )
+    conn.execute(sa.insert(team_season_aggregates).from_select(AGGREGATE_COLUMNS, rows))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "official_standings",
+        sa.Column("season", sa.String(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.team_id"]),
+        sa.PrimaryKeyConstraint("season", "team_id"),
+    )
+    op.create_table(
+        "team_season_aggregates",
+        sa.Column("season", sa.String(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("played", sa.Integer(), nullable=True),
+        sa.Column("won", sa.Integer(), nullable=True),
+        sa.Column("drawn", sa.Integer(), nullable=True),
+        sa.Column("lost", sa.Integer(), nullable=True),
+        sa.Column("goals_for", sa.Integer(), nullable=False),
+        sa.Column("goals_against", sa.Integer(), nullable=False),
+        sa.Column("goal_difference", sa.Integer(), nullable=False),
+        sa.Column("points", sa.Integer(), nullable=True),
+        sa.Column("computed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.team_id"]),
+        sa.PrimaryKeyConstraint("season", "team_id"),
+    )
+
+    conn = op.get_bind()
+    _add_standings(conn, _read_standings(STANDINGS_FILEPATH))
+    seasons = conn.scalars(sa.select(matches.c.season).distinct()).all()
+    finished = [season for season in seasons if _is_finished(conn, season)]
+    for season in finished:
+        _build_aggregates(conn, season)
+    _bump_generations(conn, finished)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("team_season_aggregates")
+    op.drop_table("official_standings")
@@ -0,0 +1,32 @@
+"""Add predictions_cache.model_version
+
+Revision ID: 5e2c8d7b1a94
+Revises: 4b9d1e6a7f30
+Create Date: 2026-10-19 23:12:40.518203
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e2c8d7b1a94"
+down_revision: Union[str, Sequence[str], None] = "4b9d1e6a7f30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing predictions have no model version, so they are recomputed once
+    op.add_column(
+        "predictions_cache", sa.Column("model_version", sa.String(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("predictions_cache") as batch_op:
+        batch_op.drop_column("model_version")
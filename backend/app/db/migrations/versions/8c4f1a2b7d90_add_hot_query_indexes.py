@@ -0,0 +1,63 @@
+"""Add indexes for the hot match, shooting stats and prediction cache queries
+
+Revision ID: 8c4f1a2b7d90
+Revises: 3b7e2d9a41c5
+Create Date: 2026-10-19 14:03:52.417730
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4f1a2b7d90"
+down_revision: Union[str, Sequence[str], None] = "3b7e2d9a41c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MISSING_RESULT = sa.text("home_goals IS NULL OR away_goals IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_matches_season_week", "matches", ["season", "week"])
+    op.create_index(
+        "ix_matches_season_date_teams",
+        "matches",
+        ["season", "date", "home_team_id", "away_team_id"],
+    )
+    op.create_index(
+        "ix_matches_missing_result",
+        "matches",
+        ["date", "time"],
+        sqlite_where=MISSING_RESULT,
+        postgresql_where=MISSING_RESULT,
+    )
+    op.create_index(
+        "ix_match_shooting_stats_team_match",
+        "match_shooting_stats",
+        ["team_id", "match_id"],
+    )
+    op.create_index(
+        "ix_predictions_cache_match_timestamp",
+        "predictions_cache",
+        ["match_id", "timestamp"],
+    )
+    # Refresh the planner statistics so the new indexes are used
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_predictions_cache_match_timestamp", table_name="predictions_cache"
+    )
+    op.drop_index(
+        "ix_match_shooting_stats_team_match", table_name="match_shooting_stats"
+    )
+    op.drop_index("ix_matches_missing_result", table_name="matches")
+    op.drop_index("ix_matches_season_date_teams", table_name="matches")
+    op.drop_index("ix_matches_season_week", table_name="matches")
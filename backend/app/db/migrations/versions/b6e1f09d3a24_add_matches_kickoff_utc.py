@@ -0,0 +1,81 @@
+"""Add matches.kickoff_utc and index unplayed matches by it
+
+Revision ID: b6e1f09d3a24
+Revises: a9d3f5b27c18
+Create Date: 2026-10-19 19:42:27.650113
+
+"""
+
+from datetime import date, datetime, time
+from typing import Sequence, Union
+
+import pytz
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e1f09d3a24"
+down_revision: Union[str, Sequence[str], None] = "a9d3f5b27c18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MISSING_RESULT = sa.text("home_goals IS NULL OR away_goals IS NULL")
+UK_TIMEZONE = pytz.timezone("Europe/London")
+
+
+def kickoff_utc(match_date: date, match_time: time = None) -> datetime:
+    """app.db.models.kickoff_utc as of this revision."""
+    if match_date is None:
+        return None
+    local = UK_TIMEZONE.localize(datetime.combine(match_date, match_time or time(0, 0)))
+    return local.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def _parse(value, kind):
+    # Raw SQL on SQLite returns the stored ISO strings
+    if value is None or isinstance(value, kind):
+        return value
+    return kind.fromisoformat(value)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("matches", sa.Column("kickoff_utc", sa.DateTime(), nullable=True))
+
+    conn = op.get_bind()
+    rows = [
+        {"id": match_id, "kickoff": kickoff_utc(_parse(d, date), _parse(t, time))}
+        for match_id, d, t in conn.execute(
+            sa.text("SELECT match_id, date, time FROM matches")
+        )
+    ]
+    if rows:
+        conn.execute(
+            sa.text(
+                "UPDATE matches SET kickoff_utc = :kickoff WHERE match_id = :id"
+            ).bindparams(sa.bindparam("kickoff", type_=sa.DateTime())),
+            rows,
+        )
+
+    op.drop_index("ix_matches_missing_result", table_name="matches")
+    op.create_index(
+        "ix_matches_missing_result",
+        "matches",
+        ["kickoff_utc"],
+        sqlite_where=MISSING_RESULT,
+        postgresql_where=MISSING_RESULT,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_matches_missing_result", table_name="matches")
+    op.create_index(
+        "ix_matches_missing_result",
+        "matches",
+        ["date", "time"],
+        sqlite_where=MISSING_RESULT,
+        postgresql_where=MISSING_RESULT,
+    )
+    with op.batch_alter_table("matches") as batch_op:
+        batch_op.drop_column("kickoff_utc")
@@ -0,0 +1,41 @@
+"""Add data_generation table and predictions_cache.data_generation
+
+Revision ID: c3f8a2d6e914
+Revises: b6e1f09d3a24
+Create Date: 2026-10-19 20:41:12.208315
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f8a2d6e914"
+down_revision: Union[str, Sequence[str], None] = "b6e1f09d3a24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "data_generation",
+        sa.Column("season", sa.String(), nullable=False),
+        sa.Column("table_name", sa.String(), nullable=False),
+        sa.Column("generation", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("season", "table_name"),
+    )
+    # Existing predictions have no generation, so they are recomputed once
+    op.add_column(
+        "predictions_cache", sa.Column("data_generation", sa.Integer(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("predictions_cache") as batch_op:
+        batch_op.drop_column("data_generation")
+    op.drop_table("data_generation")
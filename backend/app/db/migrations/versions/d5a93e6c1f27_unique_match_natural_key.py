@@ -0,0 +1,48 @@
+"""Make (season, date, home_team_id, away_team_id) a unique key on matches
+
+Revision ID: d5a93e6c1f27
+Revises: 8c4f1a2b7d90
+Create Date: 2026-10-19 15:26:08.903114
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a93e6c1f27"
+down_revision: Union[str, Sequence[str], None] = "8c4f1a2b7d90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NATURAL_KEY = ["season", "date", "home_team_id", "away_team_id"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    duplicates = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                f"SELECT {', '.join(NATURAL_KEY)}, COUNT(*) FROM matches "
+                f"GROUP BY {', '.join(NATURAL_KEY)} HAVING COUNT(*) > 1"
+            )
+        )
+        .all()
+    )
+    if duplicates:
+        # Duplicate matches may each own predictions and shooting stats, so
+        # refuse to pick a survivor automatically.
+        raise RuntimeError(
+            f"Cannot add unique key, duplicate matches found: {duplicates}"
+        )
+    op.drop_index("ix_matches_season_date_teams", table_name="matches")
+    op.create_index("uq_matches_natural_key", "matches", NATURAL_KEY, unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_matches_natural_key", table_name="matches")
+    op.create_index("ix_matches_season_date_teams", "matches", NATURAL_KEY)
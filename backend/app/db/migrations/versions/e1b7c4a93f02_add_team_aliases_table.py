@@ -0,0 +1,98 @@
+"""Add team_aliases table and seed it from teams and team_names_mapping.json
+
+Revision ID: e1b7c4a93f02
+Revises: d5a93e6c1f27
+Create Date: 2026-10-19 16:48:12.540317
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1b7c4a93f02"
+down_revision: Union[str, Sequence[str], None] = "d5a93e6c1f27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# team_names_mapping.json as of this revision
+TEAM_NAME_MAPPING = {
+    "Manchester Utd": "Manchester United",
+    "West Ham": "West Ham",
+    "Swansea City": "Swansea City",
+    "Burnley": "Burnley",
+    "Tottenham": "Tottenham Hotspur",
+    "Southampton": "Southampton",
+    "Sunderland": "Sunderland",
+    "QPR": "Queens Park Rangers",
+    "Stoke City": "Stoke City",
+    "Liverpool": "Liverpool",
+    "Aston Villa": "Aston Villa",
+    "Everton": "Everton",
+    "West Brom": "West Brom",
+    "Leicester City": "Leicester City",
+    "Crystal Palace": "Crystal Palace",
+    "Hull City": "Hull City",
+    "Arsenal": "Arsenal",
+    "Manchester City": "Manchester City",
+    "Newcastle Utd": "Newcastle United",
+    "Sheffield Utd": "Sheffield United",
+    "Chelsea": "Chelsea",
+    "Norwich City": "Norwich City",
+    "Bournemouth": "Bournemouth",
+    "Watford": "Watford",
+    "Middlesbrough": "Middlesbrough",
+    "Huddersfield": "Huddersfield Town",
+    "Brighton": "Brighton and Hove Albion",
+    "Cardiff City": "Cardiff City",
+    "Wolves": "Wolverhampton Wanderers",
+    "Leeds United": "Leeds United",
+    "Fulham": "Fulham",
+    "Luton Town": "Luton Town",
+    "Brentford": "Brentford",
+    "Nott'ham Forest": "Nottingham Forest",
+    "Ipswich Town": "Ipswich Town",
+    "Man. United": "Manchester United",
+    "Man. City": "Manchester City",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "team_aliases",
+        sa.Column("alias", sa.String(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("source", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.team_id"]),
+        sa.PrimaryKeyConstraint("alias"),
+    )
+
+    # Seed every spelling we already know; the first source wins on clashes
+    conn = op.get_bind()
+    aliases = {}
+    by_name = {}
+    for team_id, name, fullname in conn.execute(
+        sa.text("SELECT team_id, name, fullname FROM teams")
+    ):
+        by_name[name] = by_name[fullname] = team_id
+        aliases.setdefault(name, (team_id, "name"))
+        aliases.setdefault(fullname, (team_id, "fullname"))
+    for alias, target in TEAM_NAME_MAPPING.items():
+        if target in by_name:
+            aliases.setdefault(alias, (by_name[target], "mapping"))
+
+    if aliases:
+        conn.execute(
+            sa.text(
+                "INSERT INTO team_aliases (alias, team_id, source) VALUES (:a, :t, :s)"
+            ),
+            [{"a": a, "t": t, "s": s} for a, (t, s) in aliases.items()],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("team_aliases")
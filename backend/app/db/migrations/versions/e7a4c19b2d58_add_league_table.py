@@ -0,0 +1,154 @@
+"""Add league_table
+
+Revision ID: e7a4c19b2d58
+Revises: c3f8a2d6e914
+Create Date: 2026-10-19 09:12:44.318902
+
+The table is filled for every season already stored; after that the
+fixture writers keep it up to date. The backfill is a frozen copy of
+app.db.league_table.refresh_league_table as of this revision, so later
+changes to the application code don't change what this migration does.
+"""
+
+from collections import defaultdict
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a4c19b2d58"
+down_revision: Union[str, Sequence[str], None] = "c3f8a2d6e914"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables as of this revision
+matches = sa.table(
+    "matches",
+    sa.column("season", sa.String),
+    sa.column("week", sa.Integer),
+    sa.column("home_team_id", sa.Integer),
+    sa.column("away_team_id", sa.Integer),
+    sa.column("home_goals", sa.Integer),
+    sa.column("away_goals", sa.Integer),
+)
+teams = sa.table(
+    "teams", sa.column("team_id", sa.Integer), sa.column("name", sa.String)
+)
+league_table = sa.table(
+    "league_table",
+    *(
+        sa.column(name)
+        for name in (
+            "season",
+            "week",
+            "team_id",
+            "position",
+            "played",
+            "won",
+            "drawn",
+            "lost",
+            "goals_for",
+            "goals_against",
+            "goal_difference",
+            "points",
+        )
+    ),
+)
+
+
+def _season_table(season: str, rows: list, names: dict) -> list[dict]:
+    """Table rows for every week of `season` up to the last with a result."""
+    team_ids = {r.home_team_id for r in rows} | {r.away_team_id for r in rows}
+    results_by_week = defaultdict(list)
+    for r in rows:
+        if r.week is not None and r.home_goals is not None and r.away_goals is not None:
+            results_by_week[r.week].append(r)
+
+    # played, won, drawn, lost, goals_for, goals_against, points
+    totals = {team_id: [0] * 7 for team_id in team_ids}
+
+    def rank(team_id):
+        *_, goals_for, goals_against, points = totals[team_id]
+        return (-points, goals_against - goals_for, -goals_for, names.get(team_id, ""))
+
+    entries = []
+    for week in range(1, max(results_by_week, default=0) + 1):
+        for r in results_by_week.get(week, ()):
+            for team_id, scored, conceded in (
+                (r.home_team_id, r.home_goals, r.away_goals),
+                (r.away_team_id, r.away_goals, r.home_goals),
+            ):
+                t = totals[team_id]
+                outcome = 1 if scored > conceded else 2 if scored == conceded else 3
+                t[0] += 1
+                t[outcome] += 1
+                t[4] += scored
+                t[5] += conceded
+                t[6] += 3 if outcome == 1 else 1 if outcome == 2 else 0
+        for position, team_id in enumerate(sorted(totals, key=rank), start=1):
+            played, won, drawn, lost, goals_for, goals_against, points = totals[team_id]
+            entries.append(
+                {
+                    "season": season,
+                    "week": week,
+                    "team_id": team_id,
+                    "position": position,
+                    "played": played,
+                    "won": won,
+                    "drawn": drawn,
+                    "lost": lost,
+                    "goals_for": goals_for,
+                    "goals_against": goals_against,
+                    "goal_difference": goals_for - goals_against,
+                    "points": points,
+                }
+            )
+    return entries
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "league_table",
+        sa.Column("season", sa.String(), nullable=False),
+        sa.Column("week", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("played", sa.Integer(), nullable=False),
+        sa.Column("won", sa.Integer(), nullable=False),
+        sa.Column("drawn", sa.Integer(), nullable=False),
+        sa.Column("lost", sa.Integer(), nullable=False),
+        sa.Column("goals_for", sa.Integer(), nullable=False),
+        sa.Column("goals_against", sa.Integer(), nullable=False),
+        sa.Column("goal_difference", sa.Integer(), nullable=False),
+        sa.Column("points", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.team_id"]),
+        sa.PrimaryKeyConstraint("season", "week", "team_id"),
+    )
+
+    conn = op.get_bind()
+    names = dict(conn.execute(sa.select(teams.c.team_id, teams.c.name)).all())
+    rows_by_season = defaultdict(list)
+    for row in conn.execute(
+        sa.select(
+            matches.c.season,
+            matches.c.week,
+            matches.c.home_team_id,
+            matches.c.away_team_id,
+            matches.c.home_goals,
+            matches.c.away_goals,
+        )
+    ):
+        rows_by_season[row.season].append(row)
+
+    entries = []
+    for season, rows in rows_by_season.items():
+        entries.extend(_season_table(season, rows, names))
+    if entries:
+        conn.execute(sa.insert(league_table), entries)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("league_table")
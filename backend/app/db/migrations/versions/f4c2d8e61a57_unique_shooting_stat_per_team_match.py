@@ -0,0 +1,47 @@
+"""Make (team_id, match_id) a unique key on match_shooting_stats
+
+Revision ID: f4c2d8e61a57
+Revises: e1b7c4a93f02
+Create Date: 2026-10-19 17:31:45.208861
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f4c2d8e61a57"
+down_revision: Union[str, Sequence[str], None] = "e1b7c4a93f02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicates are repeated scrapes of the same match log; keep the first
+    op.execute(
+        "DELETE FROM match_shooting_stats WHERE stat_id NOT IN "
+        "(SELECT MIN(stat_id) FROM match_shooting_stats GROUP BY team_id, match_id)"
+    )
+    op.drop_index(
+        "ix_match_shooting_stats_team_match", table_name="match_shooting_stats"
+    )
+    op.create_index(
+        "uq_match_shooting_stats_team_match",
+        "match_shooting_stats",
+        ["team_id", "match_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "uq_match_shooting_stats_team_match", table_name="match_shooting_stats"
+    )
+    op.create_index(
+        "ix_match_shooting_stats_team_match",
+        "match_shooting_stats",
+        ["team_id", "match_id"],
+    )
@@ -1,6 +1,20 @@
+from datetime import date as date_type
 from datetime import datetime
+from datetime import time as time_type
 
-from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, String, Time
+import pytz
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Time,
+    or_,
+)
 from sqlalchemy.orm import relationship
 
 from .database import Base
@@ -25,6 +39,7 @@ class Team(Base):
         "Match", back_populates="away_team", foreign_keys="Match.away_team_id"
     )
     shooting_stats = relationship("MatchShootingStat", back_populates="team")
+    aliases = relationship("TeamAlias", back_populates="team")
 
     def __repr__(self):
         return f"<Team(name='{self.name}', fullname='{self.fullname}')>"
@@ -33,6 +48,76 @@ class Team(Base):
         return {c.name: getattr(self, c.name) for c in self.__table__.columns}
 
 
+class TeamAlias(Base):
+    """
+    Maps every spelling of a team seen in scraped data (short name, full
+    name, mapping entries and confirmed fuzzy matches) to its team.
+    """
+
+    __tablename__ = "team_aliases"
+    alias = Column(String, primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.team_id"), nullable=False)
+    source = Column(String, nullable=False)  # "name", "fullname", "mapping" or "fuzzy"
+
+    team = relationship("Team", back_populates="aliases")
+
+
+class Venue(Base):
+    """
+    Represents a stadium under its canonical name.
+    """
+
+    __tablename__ = "venues"
+    venue_id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)  # Canonical name
+    display_name = Column(
+        String, nullable=True
+    )  # Short label for the UI, e.g. "The AMEX"
+
+    aliases = relationship("VenueAlias", back_populates="venue")
+    matches = relationship("Match", back_populates="venue")
+
+    def __repr__(self):
+        return f"<Venue(name='{self.name}')>"
+
+    def to_dict(self):
+        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+
+
+class VenueAlias(Base):
+    """
+    Maps every spelling of a stadium seen in scraped data (including the
+    canonical name itself) to its venue.
+    """
+
+    __tablename__ = "venue_aliases"
+    alias = Column(String, primary_key=True)
+    venue_id = Column(Integer, ForeignKey("venues.venue_id"), nullable=False)
+
+    venue = relationship("Venue", back_populates="aliases")
+
+
+UK_TIMEZONE = pytz.timezone("Europe/London")
+
+
+def kickoff_utc(match_date: date_type, match_time: time_type = None) -> datetime:
+    """
+    Naive UTC kickoff for a UK local date and time. Matches without a
+    kickoff time count from midnight UK time.
+    """
+    if match_date is None:
+        return None
+    local = UK_TIMEZONE.localize(
+        datetime.combine(match_date, match_time or time_type(0, 0))
+    )
+    return local.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def _kickoff_utc_default(context) -> datetime:
+    params = context.get_current_parameters()
+    return kickoff_utc(params.get("date"), params.get("time"))
+
+
 class Match(Base):
     """
     Represents a Premier League match.
@@ -51,10 +136,32 @@ class Match(Base):
     away_goals = Column(Integer, nullable=True)  # From Score (e.g., "1" from "2–1")
     result = Column(String, nullable=True)  # Derived: "H", "A", "D"
     attendance = Column(Integer, nullable=True)
-    venue = Column(String, nullable=True)
+    venue_id = Column(Integer, ForeignKey("venues.venue_id"), nullable=True)
     referee = Column(String, nullable=True)
     match_report = Column(String, nullable=True)  # URL or identifier
     notes = Column(String, nullable=True)  # e.g., postponed matches
+    # Derived from date + time on insert; writers that change either update it
+    kickoff_utc = Column(DateTime, nullable=True, default=_kickoff_utc_default)
+
+    __table_args__ = (
+        Index("ix_matches_season_week", "season", "week"),
+        # Natural key used by the set-based fixture upsert
+        Index(
+            "uq_matches_natural_key",
+            "season",
+            "date",
+            "home_team_id",
+            "away_team_id",
+            unique=True,
+        ),
+        # Only matches still waiting for a result (check_missing_results)
+        Index(
+            "ix_matches_missing_result",
+            "kickoff_utc",
+            sqlite_where=or_(home_goals.is_(None), away_goals.is_(None)),
+            postgresql_where=or_(home_goals.is_(None), away_goals.is_(None)),
+        ),
+    )
 
     home_team = relationship(
         "Team", back_populates="home_matches", foreign_keys=[home_team_id]
@@ -62,6 +169,7 @@ class Match(Base):
     away_team = relationship(
         "Team", back_populates="away_matches", foreign_keys=[away_team_id]
     )
+    venue = relationship("Venue", back_populates="matches")
     shooting_stats = relationship("MatchShootingStat", back_populates="match")
 
     def __repr__(self):
@@ -74,6 +182,10 @@ class Match(Base):
         data["away_team"] = self.away_team.name if self.away_team else None
         data["home_team_fullname"] = self.home_team.fullname if self.home_team else None
         data["away_team_fullname"] = self.away_team.fullname if self.away_team else None
+        data["venue"] = self.venue.name if self.venue else None
+        data["venue_display"] = (
+            (self.venue.display_name or self.venue.name) if self.venue else None
+        )
         data["Score"] = f"{self.home_goals}-{self.away_goals}"
         data["FTHG"] = self.home_goals
         data["FTAG"] = self.away_goals
@@ -106,6 +218,11 @@ class MatchShootingStat(Base):
     pkatt = Column(Integer, nullable=True)  # Penalty kick attempts
     fk = Column(Integer, nullable=True)  # Free kicks
 
+    __table_args__ = (
+        # One row per team per match; also serves lookups by team
+        Index("uq_match_shooting_stats_team_match", "team_id", "match_id", unique=True),
+    )
+
     match = relationship("Match", back_populates="shooting_stats")
     team = relationship("Team", back_populates="shooting_stats")
 
@@ -129,7 +246,119 @@ class PredictionsCache(Base):
     pred_score = Column(String, nullable=False)
     pred_result = Column(String, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
+    # Generation of the input data the prediction was computed from
+    data_generation = Column(Integer, nullable=True)
+    # Model and scaler artifacts it was computed with (see model_version_for_season)
+    model_version = Column(String, nullable=True)
+
+    __table_args__ = (
+        # Covers the freshness check in check_cache without touching the table
+        Index("ix_predictions_cache_match_timestamp", "match_id", "timestamp"),
+    )
+
+    def to_dict(self):
+        data = {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return data
+
+
+class ChangeLog(Base):
+    """
+    Append-only record of writes to match data. `seq` only ever grows, so a
+    reader that remembers the last seq it saw can ask for everything newer.
+    """
+
+    __tablename__ = "change_log"
+    seq = Column(Integer, primary_key=True)
+    table_name = Column(String, nullable=False)  # e.g. "matches"
+    match_id = Column(Integer, nullable=False)
+    operation = Column(String, nullable=False)  # "insert" or "update"
+    columns = Column(String, nullable=True)  # Comma-separated; NULL for inserts
+    changed_at = Column(DateTime, default=datetime.utcnow)
+
+    # AUTOINCREMENT so seq is never reused, even after rows are pruned
+    __table_args__ = {"sqlite_autoincrement": True}
 
     def to_dict(self):
         data = {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        data["columns"] = self.columns.split(",") if self.columns else None
         return data
+
+
+class DataGeneration(Base):
+    """
+    Write counter per (season, table). Writers bump the rows they touch in
+    the same transaction as the data, so a cache that stores the generation
+    it was built from is valid for exactly as long as the counter holds.
+    Tables without a season (teams) use the season "*".
+    """
+
+    __tablename__ = "data_generation"
+    season = Column(String, primary_key=True)
+    table_name = Column(String, primary_key=True)
+    generation = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class LeagueTableEntry(Base):
+    """
+    A team's league position as of the end of a matchweek: the results of
+    the season's matches with week <= `week`. Derived from matches by
+    league_table.refresh_league_table; never written directly.
+    """
+
+    __tablename__ = "league_table"
+    season = Column(String, primary_key=True)
+    week = Column(Integer, primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.team_id"), primary_key=True)
+    position = Column(Integer, nullable=False)
+    played = Column(Integer, nullable=False)
+    won = Column(Integer, nullable=False)
+    drawn = Column(Integer, nullable=False)
+    lost = Column(Integer, nullable=False)
+    goals_for = Column(Integer, nullable=False)
+    goals_against = Column(Integer, nullable=False)
+    goal_difference = Column(Integer, nullable=False)
+    points = Column(Integer, nullable=False)
+
+    team = relationship("Team")
+
+
+class OfficialStanding(Base):
+    """
+    A team's final position in the published league table of a season, from
+    the standings CSV. It includes points deductions, which matches can't
+    show, so it takes precedence over the position computed from them.
+    """
+
+    __tablename__ = "official_standings"
+    season = Column(String, primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.team_id"), primary_key=True)
+    position = Column(Integer, nullable=False)
+
+    team = relationship("Team")
+
+
+class TeamSeasonAggregate(Base):
+    """
+    A team's final record for a finished season: built from matches when
+    the season's last result is stored (season_aggregates.py), with the
+    official position where there is one. Seasons from before the first one
+    in matches are seeded from the standings CSV and only carry position and
+    goals.
+    """
+
+    __tablename__ = "team_season_aggregates"
+    season = Column(String, primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.team_id"), primary_key=True)
+    position = Column(Integer, nullable=False)
+    played = Column(Integer, nullable=True)
+    won = Column(Integer, nullable=True)
+    drawn = Column(Integer, nullable=True)
+    lost = Column(Integer, nullable=True)
+    goals_for = Column(Integer, nullable=False)
+    goals_against = Column(Integer, nullable=False)
+    goal_difference = Column(Integer, nullable=False)
+    points = Column(Integer, nullable=True)
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+    team = relationship("Team")
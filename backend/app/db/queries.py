@@ -1,13 +1,130 @@
 import logging
-from datetime import datetime
-from typing import Any, Dict, List
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List
 
+import pandas as pd
 import pytz
-from sqlalchemy import func, or_
-from sqlalchemy.orm import joinedload
+from sqlalchemy import String, cast, func, or_, select
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.sql import Select
+
+from .database import read_session
+from .generations import generation_of
+from .metadata_cache import cached_metadata
+from .models import (
+    UK_TIMEZONE,
+    ChangeLog,
+    DataGeneration,
+    LeagueTableEntry,
+    Match,
+    MatchShootingStat,
+    PredictionsCache,
+    Team,
+    TeamSeasonAggregate,
+    Venue,
+)
+
+# A result is expected this long after kickoff (check_missing_results)
+MATCH_DURATION = timedelta(hours=2)
+
+# Columns of PredictionsCache added to match rows, under their frame names
+PREDICTION_LABELS = {
+    "pred_fthg": "PredFTHG",
+    "pred_ftag": "PredFTAG",
+    "pred_score": "PredScore",
+    "pred_result": "PredResult",
+}
+
+
+@contextmanager
+def _session(session: Session = None):
+    """
+    Use the caller's session (e.g. the request-scoped one from get_db) if
+    given, otherwise a short-lived read session. Neither is committed here.
+    """
+    if session is not None:
+        yield session
+        return
+    with read_session() as session:
+        yield session
+
+
+def _match_select(*criteria, with_predictions: bool = False) -> Select:
+    """
+    Core SELECT of matches in the shape of Match.to_dict(): every match
+    column plus team and venue names, Score, FTHG and FTAG; with
+    `with_predictions`, also the cached prediction (None if there is none).
+    Rows come back as plain tuples, with no ORM instances or identity map.
+    """
+    matches = Match.__table__
+    home = Team.__table__.alias("home")
+    away = Team.__table__.alias("away")
+    venues = Venue.__table__
+    predictions = PredictionsCache.__table__
+
+    def goals(column):
+        # Same text as the f-string in to_dict: "2-1", "None-None" if unplayed
+        return func.coalesce(cast(column, String), "None")
+
+    columns = [
+        *matches.c,
+        home.c.name.label("home_team"),
+        away.c.name.label("away_team"),
+        home.c.fullname.label("home_team_fullname"),
+        away.c.fullname.label("away_team_fullname"),
+        venues.c.name.label("venue"),
+        func.coalesce(venues.c.display_name, venues.c.name).label("venue_display"),
+        (goals(matches.c.home_goals) + "-" + goals(matches.c.away_goals)).label(
+            "Score"
+        ),
+        matches.c.home_goals.label("FTHG"),
+        matches.c.away_goals.label("FTAG"),
+    ]
+    joined = (
+        matches.outerjoin(home, matches.c.home_team_id == home.c.team_id)
+        .outerjoin(away, matches.c.away_team_id == away.c.team_id)
+        .outerjoin(venues, matches.c.venue_id == venues.c.venue_id)
+    )
+    if with_predictions:
+        columns += [
+            predictions.c[name].label(label)
+            for name, label in PREDICTION_LABELS.items()
+        ]
+        joined = joined.outerjoin(
+            predictions, matches.c.match_id == predictions.c.match_id
+        )
+    return (
+        select(*columns)
+        .select_from(joined)
+        .where(*criteria)
+        .order_by(matches.c.match_id)
+    )
+
+
+def _fixture_criteria(season, week, home_team_id, away_team_id) -> list:
+    criteria = []
+    if season:
+        criteria.append(Match.__table__.c.season == season)
+    if week:
+        criteria.append(Match.__table__.c.week == week)
+    if home_team_id:
+        criteria.append(Match.__table__.c.home_team_id == home_team_id)
+    if away_team_id:
+        criteria.append(Match.__table__.c.away_team_id == away_team_id)
+    return criteria
+
+
+def _records(stmt: Select, session: Session) -> List[Dict[str, Any]]:
+    with _session(session) as session:
+        return [row._asdict() for row in session.execute(stmt)]
+
 
-from .database import get_session
-from .models import Match, MatchShootingStat, PredictionsCache, Team
+def _frame(stmt: Select, session: Session) -> pd.DataFrame:
+    """DataFrame straight from the result tuples, without a dict per row."""
+    with _session(session) as session:
+        result = session.execute(stmt)
+        return pd.DataFrame(result.all(), columns=list(result.keys()))
 
 
 def get_seasons_fixtures(
@@ -15,6 +132,7 @@ def get_seasons_fixtures(
     week: int = None,
     home_team_id: int = None,
     away_team_id: int = None,
+    session: Session = None,
 ) -> List[Dict[str, Any]]:
     """
     Retrieve fixtures for a given season, week, home team, and/or away team.
@@ -28,48 +146,129 @@ def get_seasons_fixtures(
     Returns:
         List[Dict[str, Any]]: List of fixture dictionaries with team names.
     """
-    with get_session() as session:
-        query = session.query(Match)
-        if season:
-            query = query.filter(Match.season == season)
-        if week:
-            query = query.filter(Match.week == week)
-        if home_team_id:
-            query = query.filter(Match.home_team_id == home_team_id)
-        if away_team_id:
-            query = query.filter(Match.away_team_id == away_team_id)
-        results = query.all()
-        # Return as list of dicts with team names
-        return [m.to_dict() for m in results]
+    criteria = _fixture_criteria(season, week, home_team_id, away_team_id)
+    return _records(_match_select(*criteria), session)
+
+
+def get_seasons_fixtures_frame(
+    season: str = None,
+    week: int = None,
+    home_team_id: int = None,
+    away_team_id: int = None,
+    session: Session = None,
+) -> pd.DataFrame:
+    """
+    get_seasons_fixtures() as a DataFrame, for callers that build one anyway.
+
+    Returns:
+        pd.DataFrame: One row per fixture, same columns as the dictionaries.
+    """
+    criteria = _fixture_criteria(season, week, home_team_id, away_team_id)
+    return _frame(_match_select(*criteria), session)
+
+
+def get_fixtures_frame(seasons: Iterable[str], session: Session = None) -> pd.DataFrame:
+    """
+    Load the fixtures of several seasons in one Core SELECT, reading only the
+    columns the feature pipeline uses straight into a DataFrame.
+
+    Args:
+        seasons (Iterable[str]): Seasons to load, e.g. ["2022-2023", "2023-2024"].
+
+    Returns:
+        pd.DataFrame: One row per match, ordered by season then match_id, with
+        'date' parsed to datetime64 and goals numeric (NaN if not yet played).
+    """
+    matches = Match.__table__
+    home = Team.__table__.alias("home")
+    away = Team.__table__.alias("away")
+    venues = Venue.__table__
+    stmt = (
+        select(
+            matches.c.match_id,
+            matches.c.season,
+            matches.c.week,
+            matches.c.day,
+            # Read as text so no per-row date/time objects are built
+            cast(matches.c.date, String).label("date"),
+            cast(matches.c.time, String).label("time"),
+            home.c.name.label("home_team"),
+            away.c.name.label("away_team"),
+            venues.c.name.label("venue"),
+            matches.c.home_goals.label("FTHG"),
+            matches.c.away_goals.label("FTAG"),
+            matches.c.result,
+        )
+        .select_from(
+            matches.join(home, matches.c.home_team_id == home.c.team_id)
+            .join(away, matches.c.away_team_id == away.c.team_id)
+            .outerjoin(venues, matches.c.venue_id == venues.c.venue_id)
+        )
+        .where(matches.c.season.in_(list(seasons)))
+        .order_by(matches.c.season, matches.c.match_id)
+    )
+    with _session(session) as session:
+        result = session.execute(stmt)
+        df = pd.DataFrame(result.all(), columns=list(result.keys()))
+
+    if df.empty:
+        return df
+    df["date"] = pd.to_datetime(df["date"].str[:10], format="%Y-%m-%d")
+    df["week"] = pd.to_numeric(df["week"])
+    df["FTHG"] = pd.to_numeric(df["FTHG"])
+    df["FTAG"] = pd.to_numeric(df["FTAG"])
+    return df
 
 
 def get_shooting_stats(
-    team_id: int = None, match_id: int = None
+    team_id: int = None,
+    match_id: int = None,
+    season: str = None,
+    exclude_seasons: Iterable[str] = None,
+    session: Session = None,
 ) -> List[Dict[str, Any]]:
     """
-    Retrieve shooting stats, optionally filtered by team ID and/or match ID.
+    Retrieve shooting stats, optionally filtered by team ID, match ID and/or season.
 
     Args:
         team_id (int, optional): The team ID to filter by.
         match_id (int, optional): The match ID to filter by.
+        season (str, optional): Only stats for matches in this season.
+        exclude_seasons (Iterable[str], optional): Skip stats for matches in these
+            seasons.
 
     Returns:
         List[Dict[str, Any]]: List of shooting stat dictionaries.
     """
-    with get_session() as session:
+    with _session(session) as session:
         query = session.query(MatchShootingStat).options(
-            joinedload(MatchShootingStat.match),
-            joinedload(MatchShootingStat.team),
+            joinedload(MatchShootingStat.match).load_only(
+                Match.time, Match.week, Match.date
+            ),
+            joinedload(MatchShootingStat.team).load_only(Team.name),
         )
         if team_id:
             query = query.filter(MatchShootingStat.team_id == team_id)
         if match_id:
             query = query.filter(MatchShootingStat.match_id == match_id)
+        if season or exclude_seasons:
+            season_match_ids = select(Match.match_id)
+            if season:
+                season_match_ids = season_match_ids.where(Match.season == season)
+            if exclude_seasons:
+                season_match_ids = season_match_ids.where(
+                    Match.season.not_in(list(exclude_seasons))
+                )
+            query = query.filter(MatchShootingStat.match_id.in_(season_match_ids))
         return [s.to_dict() for s in query.all()]
 
 
+@cached_metadata
 def get_teams(
-    name: str = None, team_id: int = None, fbref_team_id: str = None
+    name: str = None,
+    team_id: int = None,
+    fbref_team_id: str = None,
+    session: Session = None,
 ) -> List[Dict[str, Any]]:
     """
     Retrieve teams, optionally filtered by name, team ID, or fbref team ID.
@@ -82,7 +281,7 @@ def get_teams(
     Returns:
         List[Dict[str, Any]]: List of team dictionaries.
     """
-    with get_session() as session:
+    with _session(session) as session:
         query = session.query(Team)
         if name:
             query = query.filter(Team.name == name)
@@ -93,24 +292,28 @@ def get_teams(
         return [t.to_dict() for t in query.all()]
 
 
-def get_teams_names() -> List[str]:
+@cached_metadata
+def get_teams_names(session: Session = None) -> List[str]:
     """
     Retrieve a list of all team names.
 
     Returns:
         List[str]: List of team names.
     """
-    return [team["name"] for team in get_teams()]
+    return [team["name"] for team in get_teams(session=session)]
 
 
-def get_all_venues() -> List[str]:
-    """Return all distinct non-null venue names across every season in the DB."""
-    with get_session() as session:
-        rows = session.query(Match.venue).filter(Match.venue.isnot(None)).distinct().all()
+@cached_metadata
+def get_all_venues(session: Session = None) -> List[str]:
+    """Return the canonical name of every venue in the DB."""
+    with _session(session) as session:
+        rows = session.query(Venue.name).all()
         return [r[0] for r in rows]
 
 
-def get_team_details(team_identifier: str = None, by: str = "name") -> Dict[str, Any]:
+def get_team_details(
+    team_identifier: str = None, by: str = "name", session: Session = None
+) -> Dict[str, Any]:
     """
     Retrieve details for a specific team by name, team ID, or fbref team ID.
 
@@ -123,7 +326,7 @@ def get_team_details(team_identifier: str = None, by: str = "name") -> Dict[str,
     """
     if not team_identifier:
         return {}
-    with get_session() as session:
+    with _session(session) as session:
         query = session.query(Team)
         if by == "name":
             query = query.filter(Team.name == team_identifier)
@@ -135,7 +338,9 @@ def get_team_details(team_identifier: str = None, by: str = "name") -> Dict[str,
         return team.to_dict() if team else {}
 
 
-def get_teams_by_season(seasons: list[str]) -> List[Dict[str, Any]]:
+def get_teams_by_season(
+    seasons: list[str], session: Session = None
+) -> List[Dict[str, Any]]:
     """
     Retrieve a list of teams that played in a specific season.
 
@@ -145,7 +350,7 @@ def get_teams_by_season(seasons: list[str]) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: List of team dictionaries for the given season.
     """
-    with get_session() as session:
+    with _session(session) as session:
         # Query distinct home and away teams from matches in the given season
         home_teams = (
             session.query(Team)
@@ -166,7 +371,13 @@ def get_teams_by_season(seasons: list[str]) -> List[Dict[str, Any]]:
         return [t.to_dict() for t in teams.values()]
 
 
-def get_match_id(season: str, week: str, home_team_id: int, away_team_id: int) -> int:
+def get_match_id(
+    season: str,
+    week: str,
+    home_team_id: int,
+    away_team_id: int,
+    session: Session = None,
+) -> int:
     """
     Get the match ID for a given season and team IDs.
     Args:
@@ -176,7 +387,7 @@ def get_match_id(season: str, week: str, home_team_id: int, away_team_id: int) -
     Returns:
         int: The match ID for the given season and team IDs.
     """
-    with get_session() as session:
+    with _session(session) as session:
         matches = (
             session.query(Match)
             .filter(
@@ -190,117 +401,286 @@ def get_match_id(season: str, week: str, home_team_id: int, away_team_id: int) -
         return matches.match_id if matches else None
 
 
-def get_matchweek_with_predictions(season: str, week: int) -> List[Dict[str, Any]]:
+def get_matchweek_with_predictions(
+    season: str, week: int, session: Session = None
+) -> List[Dict[str, Any]]:
     """
     Return all matches for a given season/week joined with their cached predictions.
     """
-    with get_session() as session:
-        rows = (
-            session.query(Match, PredictionsCache)
-            .outerjoin(PredictionsCache, Match.match_id == PredictionsCache.match_id)
-            .filter(Match.season == season, Match.week == week)
-            .all()
+    stmt = _match_select(
+        Match.__table__.c.season == season,
+        Match.__table__.c.week == week,
+        with_predictions=True,
+    )
+    return _records(stmt, session)
+
+
+def get_matchweek_frame(
+    season: str, week: int, session: Session = None
+) -> pd.DataFrame:
+    """get_matchweek_with_predictions() as a DataFrame."""
+    stmt = _match_select(
+        Match.__table__.c.season == season,
+        Match.__table__.c.week == week,
+        with_predictions=True,
+    )
+    return _frame(stmt, session)
+
+
+def get_season_with_predictions(
+    season: str, session: Session = None
+) -> List[Dict[str, Any]]:
+    """
+    Return all matches for a season joined with their cached predictions.
+    Used for summary computation.
+    """
+    stmt = _match_select(Match.__table__.c.season == season, with_predictions=True)
+    return _records(stmt, session)
+
+
+def get_season_with_predictions_frame(
+    season: str, session: Session = None
+) -> pd.DataFrame:
+    """get_season_with_predictions() as a DataFrame."""
+    stmt = _match_select(Match.__table__.c.season == season, with_predictions=True)
+    return _frame(stmt, session)
+
+
+def get_league_table(
+    season: str, week: int = None, session: Session = None
+) -> List[Dict[str, Any]]:
+    """
+    League table for a season as of the end of a matchweek, read from the
+    materialised league_table.
+
+    Args:
+        season (str): Season string e.g. "2024-2025".
+        week (int, optional): Matchweek; defaults to the latest with a result.
+
+    Returns:
+        List[Dict[str, Any]]: One row per team in position order, with the
+        team's name; empty if the season has no results up to that week.
+    """
+    table = LeagueTableEntry.__table__
+    teams = Team.__table__
+    if week is None:
+        week = (
+            select(func.max(table.c.week))
+            .where(table.c.season == season)
+            .scalar_subquery()
         )
-        results = []
-        for match, pred in rows:
-            data = match.to_dict()
-            data["PredFTHG"] = pred.pred_fthg if pred else None
-            data["PredFTAG"] = pred.pred_ftag if pred else None
-            data["PredScore"] = pred.pred_score if pred else None
-            data["PredResult"] = pred.pred_result if pred else None
-            results.append(data)
-        return results
+    stmt = (
+        select(
+            table.c.week,
+            table.c.position,
+            table.c.team_id,
+            teams.c.name.label("team"),
+            *(
+                table.c[c]
+                for c in (
+                    "played", "won", "drawn", "lost",
+                    "goals_for", "goals_against", "goal_difference", "points",
+                )
+            ),
+        )
+        .join(teams, table.c.team_id == teams.c.team_id)
+        .where(table.c.season == season, table.c.week == week)
+        .order_by(table.c.position)
+    )
+    return _records(stmt, session)
 
 
-def get_season_with_predictions(season: str) -> List[Dict[str, Any]]:
+def get_team_season_aggregates(
+    seasons: Iterable[str], session: Session = None
+) -> pd.DataFrame:
     """
-    Return all matches for a season joined with their cached predictions.
-    Used for summary computation.
+    Final position and goals of every team in the given finished seasons, in
+    one primary-key lookup.
+
+    Args:
+        seasons (Iterable[str]): Seasons e.g. ["2022-2023", "2023-2024"];
+            seasons that haven't finished have no rows.
+
+    Returns:
+        pd.DataFrame: Columns season, team, position, goals_for,
+        goals_against and goal_difference.
     """
-    with get_session() as session:
-        rows = (
-            session.query(Match, PredictionsCache)
-            .outerjoin(PredictionsCache, Match.match_id == PredictionsCache.match_id)
-            .filter(Match.season == season)
-            .all()
+    table = TeamSeasonAggregate.__table__
+    teams = Team.__table__
+    stmt = (
+        select(
+            table.c.season,
+            teams.c.name.label("team"),
+            table.c.position,
+            table.c.goals_for,
+            table.c.goals_against,
+            table.c.goal_difference,
         )
-        results = []
-        for match, pred in rows:
-            data = match.to_dict()
-            data["PredFTHG"] = pred.pred_fthg if pred else None
-            data["PredFTAG"] = pred.pred_ftag if pred else None
-            data["PredScore"] = pred.pred_score if pred else None
-            data["PredResult"] = pred.pred_result if pred else None
-            results.append(data)
-        return results
-
-
-def get_season_match_ids(season: str) -> List[int]:
-    with get_session() as session:
+        .join(teams, table.c.team_id == teams.c.team_id)
+        .where(table.c.season.in_(list(seasons)))
+        .order_by(table.c.season, table.c.position)
+    )
+    return _frame(stmt, session)
+
+
+def get_season_fingerprint(season: str, session: Session = None) -> Dict[str, Any]:
+    """
+    Summarise everything stored for a season in one SELECT: row counts, the
+    highest ids, total goals and the latest prediction time. The values
+    change whenever the season's matches, shooting stats or cached
+    predictions are written, so they identify the data generation a
+    snapshot was exported from.
+    """
+    in_season = Match.season == season
+    season_matches = select(Match.match_id).where(in_season)
+    aggregates = {
+        "matches": select(func.count()).where(in_season),
+        "unplayed": select(func.count()).where(
+            in_season, or_(Match.home_goals.is_(None), Match.away_goals.is_(None))
+        ),
+        "max_match_id": select(func.max(Match.match_id)).where(in_season),
+        "goals": select(func.sum(Match.home_goals + Match.away_goals)).where(in_season),
+        "shooting_stats": select(func.count()).where(
+            MatchShootingStat.match_id.in_(season_matches)
+        ),
+        "max_stat_id": select(func.max(MatchShootingStat.stat_id)).where(
+            MatchShootingStat.match_id.in_(season_matches)
+        ),
+        "predictions": select(func.count()).where(
+            PredictionsCache.match_id.in_(season_matches)
+        ),
+        "last_prediction_at": select(func.max(PredictionsCache.timestamp)).where(
+            PredictionsCache.match_id.in_(season_matches)
+        ),
+        "data_generation": generation_of(season),
+    }
+    stmt = select(*(q.scalar_subquery().label(k) for k, q in aggregates.items()))
+    with _session(session) as session:
+        row = session.execute(stmt).one()
+    return {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in row._mapping.items()
+    }
+
+
+def get_season_match_ids(season: str, session: Session = None) -> List[int]:
+    with _session(session) as session:
         rows = session.query(Match.match_id).filter(Match.season == season).all()
         return [r[0] for r in rows]
 
 
-def get_available_seasons() -> List[str]:
+@cached_metadata
+def get_available_seasons(session: Session = None) -> List[str]:
     """
     Return a sorted list of seasons that have fixture data in the DB.
     """
-    with get_session() as session:
+    with _session(session) as session:
         rows = session.query(Match.season).distinct().all()
         seasons = sorted([r[0] for r in rows if r[0]])
         return seasons
 
 
+def get_data_generation(
+    season: str = None,
+    tables: Iterable[str] = None,
+    session: Session = None,
+    include_earlier: bool = False,
+) -> int:
+    """
+    Current data generation of `tables` (default: all) in `season` (default:
+    every season), or in `season` and every earlier one with
+    `include_earlier`. Caches store this and are valid while it is unchanged.
+    """
+    with _session(session) as session:
+        return session.scalar(generation_of(season, tables, include_earlier))
+
+
+def get_season_generations(
+    seasons: Iterable[str], tables: Iterable[str] = None, session: Session = None
+) -> Dict[str, int]:
+    """
+    get_data_generation() for several seasons in one query. Seasons that have
+    never been written map to 0.
+    """
+    seasons = list(seasons)
+    if not seasons:
+        return {}
+    stmt = (
+        select(DataGeneration.season, func.sum(DataGeneration.generation))
+        .where(DataGeneration.season.in_(seasons))
+        .group_by(DataGeneration.season)
+    )
+    if tables is not None:
+        stmt = stmt.where(DataGeneration.table_name.in_(list(tables)))
+    with _session(session) as session:
+        generations = dict(session.execute(stmt).all())
+    return {season: generations.get(season, 0) for season in seasons}
+
+
+def get_latest_change_seq(session: Session = None) -> int:
+    """Highest change_log sequence number, or 0 if nothing has been logged."""
+    with _session(session) as session:
+        return session.scalar(select(func.coalesce(func.max(ChangeLog.seq), 0)))
+
+
+def get_changes_since(
+    seq: int, table_name: str = None, session: Session = None
+) -> List[Dict[str, Any]]:
+    """
+    Return every change logged after sequence number `seq`, oldest first.
+
+    Args:
+        seq: Last sequence number the caller has already processed.
+        table_name: Only return changes to this table (e.g. "matches").
+    """
+    stmt = select(ChangeLog).where(ChangeLog.seq > seq).order_by(ChangeLog.seq)
+    if table_name is not None:
+        stmt = stmt.where(ChangeLog.table_name == table_name)
+    with _session(session) as session:
+        return [change.to_dict() for change in session.scalars(stmt)]
+
+
 def check_missing_results(
-    logger: logging.Logger, current_datetime: datetime = None
+    logger: logging.Logger, current_datetime: datetime = None, session: Session = None
 ) -> bool:
     """
     Check for matches that have been played (date + time + 2 hours in past) but have missing home_goals or away_goals.
 
     Args:
-        current_datetime (datetime, optional): Current datetime for comparison. Defaults to now in UK (Europe/London).
+        current_datetime (datetime, optional): Current datetime for comparison. Defaults to now;
+            naive values are taken as UK (Europe/London) time.
 
     Returns:
         bool: True if any past matches have missing home_goals or away_goals, False otherwise.
     """
-    # Ensure UK timezone
-    uk_tz = pytz.timezone("Europe/London")
     if current_datetime is None:
-        current_datetime = datetime.now(uk_tz)
-    else:
-        current_datetime = current_datetime.astimezone(uk_tz)
-
-    with get_session() as session:
-        # Combine date and time in SQL, defaulting time to 00:00:00 if NULL
-        match_datetime = func.coalesce(
-            func.datetime(Match.date, Match.time), func.datetime(Match.date, "00:00:00")
-        )
-
-        # Add 2 hours for match duration
-        match_end_datetime = func.datetime(match_datetime, "+2 hours")
-
-        # Query matches where end time is past and results are missing
-        missing_results = (
-            session.query(Match)
-            .filter(
-                Match.date.isnot(None),
-                match_end_datetime < current_datetime,
+        current_datetime = datetime.now(pytz.utc)
+    elif current_datetime.tzinfo is None:
+        current_datetime = UK_TIMEZONE.localize(current_datetime)
+
+    # Same predicate as the partial index, so this is a range scan over
+    # unplayed matches only.
+    cutoff = (
+        (current_datetime - MATCH_DURATION).astimezone(pytz.utc).replace(tzinfo=None)
+    )
+    with _session(session) as session:
+        match_ids = session.scalars(
+            select(Match.match_id).where(
                 or_(Match.home_goals.is_(None), Match.away_goals.is_(None)),
+                Match.kickoff_utc < cutoff,
             )
-            .all()
-        )
-
-        # Log findings
-        if missing_results:
-            match_ids = [match.match_id for match in missing_results]
-            logger.warning(
-                f"Found {len(missing_results)} past matches with missing home_goals/away_goals: {match_ids}"
-            )
-        else:
-            logger.info("No past matches with missing home_goals/away_goals found")
+        ).all()
 
-        return bool(missing_results)
+    # Log findings
+    if match_ids:
+        logger.warning(
+            f"Found {len(match_ids)} past matches with missing "
+            f"home_goals/away_goals: {match_ids}"
+        )
+    else:
+        logger.info("No past matches with missing home_goals/away_goals found")
 
+    return bool(match_ids)
 
 if __name__ == "__main__":
     print(get_teams_names())
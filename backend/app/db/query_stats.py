@@ -0,0 +1,152 @@
+"""
+query_stats.py
+
+Statement counts and DB time per request and per pipeline stage, plus a
+slow-query log.
+
+Every engine is instrumented with cursor event hooks. Each statement is added
+to the stages active in the current context (track_queries() blocks nest, so
+a stage's totals include its sub-stages). The context follows the work into
+threadpool endpoints and onto the writer thread. Statements slower than
+settings.SLOW_QUERY_MS are logged with their parameters and, on SQLite,
+EXPLAIN QUERY PLAN, so unindexed scans show up as "SCAN <table>".
+
+Usage:
+    with track_queries("predict: load training data") as stats:
+        ...
+    stats.statements, stats.seconds
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import Engine, event
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Longest parameter repr written to the slow-query log
+MAX_LOGGED_PARAMS = 500
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+class QueryStats:
+    """Running totals for one request or pipeline stage."""
+
+    __slots__ = ("label", "parent", "statements", "seconds")
+
+    def __init__(self, label: str, parent: Optional["QueryStats"] = None):
+        self.label = label
+        self.parent = parent
+        self.statements = 0
+        self.seconds = 0.0
+
+    def add(self, seconds: float) -> None:
+        stats = self
+        while stats is not None:
+            stats.statements += 1
+            stats.seconds += seconds
+            stats = stats.parent
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Innermost stage being tracked in this context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def track_queries(label: str, level: int = logging.INFO) -> Iterator[QueryStats]:
+    """
+    Count the statements run inside the block and log the totals on exit.
+
+    Args:
+        label: Name of the request or stage, used in the log line.
+        level: Log level of the summary line.
+    """
+    stats = QueryStats(label, parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        logger.log(
+            level,
+            "%s: %d SQL statements, %.1f ms in the database",
+            label,
+            stats.statements,
+            stats.seconds * 1000,
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.add(elapsed)
+    if settings.SLOW_QUERY_MS > 0 and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        _log_slow_query(conn, statement, parameters, executemany, elapsed)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and exception_context.cursor is not None:
+        started = conn.info.get("query_started_at")
+        if started:
+            started.pop()
+
+
+def _log_slow_query(conn, statement, parameters, executemany, elapsed) -> None:
+    params = repr(parameters)
+    if len(params) > MAX_LOGGED_PARAMS:
+        params = params[:MAX_LOGGED_PARAMS] + "..."
+    plan = _query_plan(conn, statement, parameters[0] if executemany else parameters)
+    logger.warning(
+        "Slow query (%.1f ms): %s\nParameters: %s%s",
+        elapsed * 1000,
+        statement,
+        params,
+        f"\nQuery plan:\n{plan}" if plan else "",
+    )
+
+
+def _query_plan(conn, statement: str, parameters) -> Optional[str]:
+    """EXPLAIN QUERY PLAN of `statement` on SQLite; None elsewhere or on failure."""
+    if conn.dialect.name != "sqlite":
+        return None
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    try:
+        # Raw DBAPI cursor, so the EXPLAIN itself is neither counted nor logged
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    except Exception as e:
+        logger.debug("EXPLAIN QUERY PLAN failed: %s", e)
+        return None
+    # Rows are (id, parent, notused, detail)
+    return "\n".join(f"  {row[-1]}" for row in rows)
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Attach the statement counter and slow-query log to `engine` (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
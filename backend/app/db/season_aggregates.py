@@ -0,0 +1,161 @@
+"""
+season_aggregates.py
+
+Final per-team records of finished seasons (team_season_aggregates), used by
+the prior-season standing features. A season is finished once every one of
+its matches has a result, or once it is over (before CURRENT_SEASON), so a
+result that never arrives can't hold it open. The writer that stores the
+last result builds the season's rows in the same transaction, with one
+INSERT ... SELECT that aggregates matches in SQL. Later corrections to a
+finished season's results rebuild them the same way.
+
+Positions come from official_standings where the season has one: the
+published table includes points deductions, which matches can't show.
+Otherwise teams are ranked on the matches alone.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import case, delete, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from .generations import bump_generations
+from .models import Match, OfficialStanding, Team, TeamSeasonAggregate
+
+AGGREGATE_COLUMNS = [
+    "season",
+    "team_id",
+    "position",
+    "played",
+    "won",
+    "drawn",
+    "lost",
+    "goals_for",
+    "goals_against",
+    "goal_difference",
+    "points",
+    "computed_at",
+]
+
+
+def is_finished_season(session: Session, season: str) -> bool:
+    """
+    True if `season` has matches and every one of them has a result, or the
+    season is before the current one.
+    """
+    matches = Match.__table__
+    total, unplayed = session.execute(
+        select(
+            func.count(),
+            func.count().filter(
+                matches.c.home_goals.is_(None) | matches.c.away_goals.is_(None)
+            ),
+        ).where(matches.c.season == season)
+    ).one()
+    return total > 0 and (unplayed == 0 or season < settings.CURRENT_SEASON)
+
+
+def build_team_season_aggregates(session: Session, season: str) -> int:
+    """
+    Replace `season`'s rows with its final table, aggregated from matches in
+    SQL. Positions are the official ones if stored; otherwise teams are
+    ranked like the league table: points, goal difference, goals scored,
+    then name. Nothing is committed.
+
+    Returns:
+        int: Rows written.
+    """
+    matches = Match.__table__
+    teams = Team.__table__
+    official = OfficialStanding.__table__
+    table = TeamSeasonAggregate.__table__
+
+    has_result = (
+        (matches.c.season == season)
+        & matches.c.home_goals.is_not(None)
+        & matches.c.away_goals.is_not(None)
+    )
+    # One row per team per match, from that team's side
+    sides = union_all(
+        select(
+            matches.c.home_team_id.label("team_id"),
+            matches.c.home_goals.label("scored"),
+            matches.c.away_goals.label("conceded"),
+        ).where(has_result),
+        select(
+            matches.c.away_team_id.label("team_id"),
+            matches.c.away_goals.label("scored"),
+            matches.c.home_goals.label("conceded"),
+        ).where(has_result),
+    ).subquery("sides")
+
+    won = func.sum(case((sides.c.scored > sides.c.conceded, 1), else_=0))
+    drawn = func.sum(case((sides.c.scored == sides.c.conceded, 1), else_=0))
+    totals = (
+        select(
+            sides.c.team_id,
+            func.count().label("played"),
+            won.label("won"),
+            drawn.label("drawn"),
+            func.sum(case((sides.c.scored < sides.c.conceded, 1), else_=0)).label(
+                "lost"
+            ),
+            func.sum(sides.c.scored).label("goals_for"),
+            func.sum(sides.c.conceded).label("goals_against"),
+            (func.sum(sides.c.scored) - func.sum(sides.c.conceded)).label(
+                "goal_difference"
+            ),
+            (3 * won + drawn).label("points"),
+        )
+        .group_by(sides.c.team_id)
+        .subquery("totals")
+    )
+    ranked = func.row_number().over(
+        order_by=(
+            totals.c.points.desc(),
+            totals.c.goal_difference.desc(),
+            totals.c.goals_for.desc(),
+            teams.c.name,
+        )
+    )
+    position = func.coalesce(official.c.position, ranked)
+    rows = (
+        select(
+            literal(season),
+            totals.c.team_id,
+            position,
+            totals.c.played,
+            totals.c.won,
+            totals.c.drawn,
+            totals.c.lost,
+            totals.c.goals_for,
+            totals.c.goals_against,
+            totals.c.goal_difference,
+            totals.c.points,
+            literal(datetime.utcnow()),
+        )
+        .join_from(totals, teams, totals.c.team_id == teams.c.team_id)
+        .outerjoin(
+            official,
+            (official.c.season == season) & (official.c.team_id == totals.c.team_id),
+        )
+    )
+
+    session.execute(delete(table).where(table.c.season == season))
+    return session.execute(insert(table).from_select(AGGREGATE_COLUMNS, rows)).rowcount
+
+
+def close_season_if_finished(session: Session, season: str) -> bool:
+    """
+    Build `season`'s aggregates if it is finished, bumping
+    (season, "team_season_aggregates"). Call after writing results.
+
+    Returns:
+        bool: Whether the season was finished (and its rows rebuilt).
+    """
+    if not is_finished_season(session, season):
+        return False
+    build_team_season_aggregates(session, season)
+    bump_generations(session, [(season, "team_season_aggregates")])
+    return True
@@ -0,0 +1,137 @@
+"""
+serving.py
+
+Read-only serving snapshot of the database.
+
+With SERVING_DATABASE_PATH set, DATABASE_URL is the staging database that
+ingest, training and the prediction cache write to, and every read goes to
+a copy of it at SERVING_DATABASE_PATH. Publishing a new copy costs a full
+read of the database, so it happens once at the end of an ingest or
+training run, and after each prediction cache write (writer.py): the
+staging DB is copied with SQLite's online backup API to a temporary file,
+which is then renamed over the old copy.
+The rename is atomic, so readers see either the old snapshot or the new
+one, never a partial file.
+
+The copy is opened read-only and immutable, so serving reads take no locks
+and never wait on a writer. A connection remembers which file it opened;
+when the pool hands it out again after a swap it is discarded and replaced
+by one on the new file, so requests move over as soon as they next check
+out a connection.
+"""
+
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.exc import DisconnectionError
+
+logger = logging.getLogger(__name__)
+
+# No WAL or busy_timeout: the file is immutable, so there is nothing to wait for
+SERVING_PRAGMAS = {
+    "query_only": "ON",
+    "cache_size": -65536,  # 64 MiB
+    "mmap_size": 268435456,  # 256 MiB
+    "temp_store": "MEMORY",
+}
+
+# One publish at a time per process; the first-connection publish and the
+# writer's would otherwise copy the database twice at once
+_publish_lock = threading.RLock()
+
+
+def _snapshot_id(path: Path) -> tuple:
+    """Identity of the file currently at `path`; changes on every publish."""
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def publish_snapshot(source: Engine, target: Path) -> Path:
+    """
+    Copy the `source` SQLite database to `target` and swap it in atomically.
+
+    Args:
+        source: Engine of the staging database.
+        target: Path of the serving snapshot.
+
+    Returns:
+        Path: `target`.
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with _publish_lock:
+        # Unique temp file, so publishers in other processes never share one
+        fd, tmp = tempfile.mkstemp(
+            prefix=f"{target.name}.", suffix=".tmp", dir=target.parent
+        )
+        os.close(fd)
+        try:
+            connection = source.raw_connection()
+            try:
+                copy = sqlite3.connect(tmp)
+                try:
+                    connection.driver_connection.backup(copy)
+                    # The copy inherits WAL mode; a single self-contained file
+                    # is what read-only, immutable readers need
+                    copy.execute("PRAGMA journal_mode=DELETE")
+                finally:
+                    copy.close()
+            finally:
+                connection.close()
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+    return target
+
+
+def serving_url(path: Path, driver: str = "sqlite") -> str:
+    """URL opening the snapshot at `path` read-only and immutable."""
+    return f"{driver}:///file:{path}?mode=ro&immutable=1&uri=true"
+
+
+def watch_snapshot(engine: Engine, path: Path, source: Engine) -> None:
+    """
+    Install the serving listeners on `engine` (a sync engine, or an async
+    engine's .sync_engine): read-only pragmas, and moving pooled connections
+    to the new file after a swap. If no snapshot exists yet, the first
+    connection publishes one from `source`.
+    """
+
+    @event.listens_for(engine, "do_connect")
+    def _remember_snapshot(dialect, connection_record, cargs, cparams):
+        if not path.exists():
+            with _publish_lock:
+                # Another connection may have published while we waited
+                if not path.exists():
+                    publish_snapshot(source, path)
+        # Taken before opening, so a swap in between only costs a reconnect
+        connection_record.info["snapshot"] = _snapshot_id(path)
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in SERVING_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, "checkout")
+    def _move_to_new_snapshot(dbapi_connection, connection_record, connection_proxy):
+        if connection_record.info.get("snapshot") != _snapshot_id(path):
+            # The pool discards this connection and opens one on the new file
+            raise DisconnectionError("Serving snapshot was replaced")
+
+
+def create_serving_engine(path: Path, source: Engine) -> Engine:
+    """Engine reading the serving snapshot at `path`, published from `source`."""
+    path = Path(path).resolve()
+    engine = create_engine(serving_url(path), connect_args={"check_same_thread": False})
+    watch_snapshot(engine, path, source)
+    return engine
@@ -0,0 +1,90 @@
+"""
+teams.py
+
+Resolve team names from any source (FBref fixtures and shooting stats,
+Superbru) to team ids through the team_aliases index. Known spellings are a
+primary-key lookup; only strings never seen before are fuzzy matched, and the
+result is stored so the same string is never fuzzy matched twice.
+"""
+
+from typing import Dict, Iterable
+
+from fuzzywuzzy import process
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .mappings.load_mappings import load_team_name_mapping
+from .models import Team, TeamAlias
+
+FUZZY_MATCH_THRESHOLD = 80
+
+
+def _known_aliases(session: Session) -> Dict[str, tuple[int, str]]:
+    """Every spelling we can resolve without fuzzy matching, with its source."""
+    known = {
+        alias: (team_id, source)
+        for alias, team_id, source in session.execute(
+            select(TeamAlias.alias, TeamAlias.team_id, TeamAlias.source)
+        )
+    }
+    teams = session.execute(select(Team.team_id, Team.name, Team.fullname)).all()
+    by_name = {}
+    for team_id, name, fullname in teams:
+        by_name[name] = by_name[fullname] = team_id
+        known.setdefault(name, (team_id, "name"))
+        known.setdefault(fullname, (team_id, "fullname"))
+    for alias, target in load_team_name_mapping().items():
+        if target in by_name:
+            known.setdefault(alias, (by_name[target], "mapping"))
+    return known
+
+
+def resolve_team_ids(
+    session: Session, names: Iterable[str], fuzzy: bool = True
+) -> Dict[str, int]:
+    """
+    Map each team name to its team_id, recording an alias row for every name
+    resolved for the first time.
+
+    Args:
+        session: Open session; new aliases are flushed but not committed.
+        names: Team names as they appear in scraped data.
+        fuzzy: Fuzzy match names that are not a known alias. Loaders that
+            create teams turn this off so a new club is never folded into an
+            existing one.
+
+    Returns:
+        Dict[str, int]: Mapping of each resolved name to a team_id. Names
+        that could not be resolved are left out.
+    """
+    names = {name for name in names if isinstance(name, str) and name}
+    if not names:
+        return {}
+
+    resolved = dict(
+        session.execute(
+            select(TeamAlias.alias, TeamAlias.team_id).where(TeamAlias.alias.in_(names))
+        ).all()
+    )
+    missing = sorted(names - resolved.keys())
+    if not missing:
+        return resolved
+
+    known = _known_aliases(session)
+    for name in missing:
+        if name in known:
+            team_id, source = known[name]
+        elif fuzzy and known:
+            best, score = process.extractOne(name, list(known))
+            if score < FUZZY_MATCH_THRESHOLD:
+                print(f"No close match for team '{name}' ({best=}).")
+                continue
+            team_id, source = known[best][0], "fuzzy"
+            print(f"Matched team '{name}' to '{best}' (score {score}).")
+        else:
+            continue
+        session.add(TeamAlias(alias=name, team_id=team_id, source=source))
+        resolved[name] = team_id
+
+    session.flush()
+    return resolved
@@ -1,11 +1,18 @@
-from datetime import datetime
+from typing import Any, Dict, List, Tuple
 
 import pandas as pd
-from fuzzywuzzy import process
 from sqlalchemy import select
 
-from ..database import get_session
-from ..models import Match, Team
+from ..bulk import upsert_rows
+from ..changelog import record_changes
+from ..generations import bump_generations
+from ..league_table import TABLE_INPUT_COLUMNS, refresh_league_table
+from ..metadata_cache import bump_data_generation
+from ..models import Match, kickoff_utc
+from ..season_aggregates import close_season_if_finished
+from ..teams import resolve_team_ids
+from ..venues import resolve_venue_ids
+from ..writer import run_write
 
 
 def parse_score(score):
@@ -20,147 +27,191 @@ def parse_score(score):
         return None, None, None
 
 
-def upsert_fixtures(df: pd.DataFrame, season: str) -> None:
+MATCH_KEY_COLUMNS = ["season", "date", "home_team_id", "away_team_id"]
+MATCH_UPDATE_COLUMNS = [
+    "week",
+    "day",
+    "time",
+    "home_goals",
+    "away_goals",
+    "result",
+    "attendance",
+    "venue_id",
+    "referee",
+    "match_report",
+    "notes",
+    "kickoff_utc",
+]
+
+
+def _value(row: pd.Series, column: str):
+    """Return the row's value for `column`, or None if missing/NaN."""
+    value = row.get(column)
+    return None if pd.isna(value) else value
+
+
+def _fixture_rows(
+    df: pd.DataFrame,
+    season: str,
+    team_ids: Dict[str, int],
+    venue_ids: Dict[str, int],
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Turn scraped rows into `matches` rows keyed by the natural key."""
+    dates = pd.to_datetime(df["Date"], errors="coerce")
+    times = (
+        pd.to_datetime(df["Time"], format="%H:%M", errors="coerce")
+        if "Time" in df.columns
+        else pd.Series(pd.NaT, index=df.index)
+    )
+    rows = {}
+    skipped = 0
+    for idx, row in df.iterrows():
+        home_team_id = team_ids.get(row.get("Home"))
+        away_team_id = team_ids.get(row.get("Away"))
+        if pd.isna(dates[idx]) or home_team_id is None or away_team_id is None:
+            skipped += 1
+            continue
+        home_goals, away_goals, result = parse_score(row.get("Score"))
+        week = _value(row, "Wk")
+        attendance = _value(row, "Attendance")
+        try:
+            week = int(week) if week is not None else None
+            attendance = int(attendance) if attendance is not None else None
+        except (ValueError, TypeError):
+            # One malformed row must not abort the whole season's write
+            print(f"Skipping fixture row {idx}: Wk={week!r}, Attendance={attendance!r}")
+            skipped += 1
+            continue
+        key = (season, dates[idx].date(), home_team_id, away_team_id)
+        rows[key] = {
+            **dict(zip(MATCH_KEY_COLUMNS, key, strict=True)),
+            "week": week,
+            "day": _value(row, "Day"),
+            "time": times[idx].time() if pd.notna(times[idx]) else None,
+            "home_goals": home_goals,
+            "away_goals": away_goals,
+            "result": result,
+            "attendance": attendance,
+            "venue_id": venue_ids.get(row.get("Venue")),
+            "referee": _value(row, "Referee"),
+            "match_report": _value(row, "Match Report"),
+            "notes": _value(row, "Notes"),
+            "kickoff_utc": None,  # Filled in once the stored time is known
+        }
+    return list(rows.values()), skipped
+
+
+def upsert_fixtures(df: pd.DataFrame, season: str) -> Dict[str, int]:
     """
     Upsert fixtures in the matches table from a DataFrame. Creates new matches if they don't exist,
-    updates existing matches with new results.
+    updates existing matches with new results. Values missing from the scraped
+    table never overwrite what is already stored.
+
+    The whole table is written with one INSERT ... ON CONFLICT DO UPDATE keyed
+    on (season, date, home_team_id, away_team_id), after a single SELECT of the
+    season's existing matches to work out what actually changes. Every
+    inserted or updated match is appended to the change log with the columns
+    that changed. If a result or a match's week changed, the season's
+    league table is refreshed from the earliest affected week, and once
+    every result is in the season's final aggregates are built.
 
     Args:
         df: DataFrame with match data (expected columns: Date, Home, Away, Score, week, Day, Time, etc.).
         season: Season string (e.g., "2023-2024").
+
+    Returns:
+        Dict[str, int]: Counts of 'inserted', 'updated', 'unchanged' and 'skipped' rows.
     """
-    # Define expected columns
-    expected_columns = ["Date", "Home", "Away", "Score"]
-    missing_columns = [col for col in expected_columns if col not in df.columns]
-    if missing_columns:
-        print(
-            f"Warning: Missing columns in DataFrame for season {season}: {missing_columns}"
-        )
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
 
     # Ensure required columns exist
     required_columns = ["Date", "Home", "Away", "Score"]
     if not all(col in df.columns for col in required_columns):
         print(f"Error: Missing required columns {required_columns} for season {season}")
-        return
-
-    with get_session() as session:
-        # Get team IDs with fuzzy matching
-        all_teams = session.execute(select(Team.name, Team.team_id)).all()
-        team_map = {t.name: t.team_id for t in all_teams}
-        team_names = list(team_map.keys())
-
-        for idx, row in df.iterrows():
-            try:
-                # Parse date
-                date_str = row.get("Date")
-                if pd.isna(date_str):
-                    print(f"Skipping row {idx}: Missing Date.")
-                    continue
-                date = pd.to_datetime(date_str, errors="coerce").date()
-                if date is None:
-                    print(f"Skipping row {idx}: Invalid Date format '{date_str}'.")
-                    continue
-
-                # Fuzzy match team names
-                home_team = row.get("Home")
-                away_team = row.get("Away")
-                if pd.isna(home_team) or pd.isna(away_team):
-                    print(f"Skipping row {idx} on {date}: Missing Home or Away team.")
-                    continue
-
-                home_match, home_score = (
-                    process.extractOne(home_team, team_names)
-                    if team_names
-                    else (None, 0)
-                )
-                away_match, away_score = (
-                    process.extractOne(away_team, team_names)
-                    if team_names
-                    else (None, 0)
-                )
-                if home_score < 80:
-                    print(
-                        f"Skipping row {idx} on {date}: No close match for Home='{home_team}' {home_match=}."
-                    )
-                    continue
-                if away_score < 80:
-                    print(
-                        f"Skipping row {idx} on {date}: No close match for Away='{away_team}' {away_match=}."
-                    )
-                    continue
-
-                home_team_id = team_map.get(home_match)
-                away_team_id = team_map.get(away_match)
-
-                # Find existing match
-                match = session.execute(
-                    select(Match).filter_by(
-                        season=season,
-                        date=date,
-                        home_team_id=home_team_id,
-                        away_team_id=away_team_id,
-                    )
-                ).scalar_one_or_none()
-
-                # Parse score (for both update and insert)
-                home_goals, away_goals, result = parse_score(row.get("Score"))
-
-                if match:
-                    # Update existing match
-                    if home_goals is not None:
-                        match.home_goals = home_goals
-                        match.away_goals = away_goals
-                        match.result = result
-                    # Update other fields if provided
-                    match.week = row.get("Wk", match.week)
-                    match.day = row.get("Day", match.day)
-                    match.time = (
-                        datetime.strptime(row["Time"], "%H:%M").time()
-                        if pd.notna(row.get("Time"))
-                        else match.time
-                    )
-                    match.attendance = (
-                        int(row.get("Attendance"))
-                        if pd.notna(row.get("Attendance"))
-                        else match.attendance
-                    )
-                    match.venue = row.get("Venue", match.venue)
-                    match.referee = row.get("Referee", match.referee)
-                    match.match_report = row.get("Match Report", match.match_report)
-                    match.notes = row.get("Notes", match.notes)
-                    print(
-                        f"Updated match_id={match.match_id} for {home_team} vs {away_team} on {date}."
-                    )
-                else:
-                    # Create new match
-                    match = Match(
-                        season=season,
-                        week=row.get("Wk"),
-                        day=row.get("Day"),
-                        date=date,
-                        time=datetime.strptime(row["Time"], "%H:%M").time()
-                        if pd.notna(row.get("Time"))
-                        else None,
-                        home_team_id=home_team_id,
-                        away_team_id=away_team_id,
-                        home_goals=home_goals,
-                        away_goals=away_goals,
-                        result=result,
-                        attendance=int(row.get("Attendance"))
-                        if pd.notna(row.get("Attendance"))
-                        else None,
-                        venue=row.get("Venue"),
-                        referee=row.get("Referee"),
-                        match_report=row.get("Match Report"),
-                        notes=row.get("Notes"),
-                    )
-                    session.add(match)
-                    print(
-                        f"Created new match for {home_team} vs {away_team} on {date}."
-                    )
-
-            except Exception as e:
-                print(f"Error processing row {idx} on {date_str}: {e}")
+        return counts
+
+    def write(session):
+        # Reset so a retried job doesn't count its rows twice
+        counts.update(inserted=0, updated=0, unchanged=0)
+        team_ids = resolve_team_ids(
+            session, pd.concat([df["Home"], df["Away"]]).unique()
+        )
+        venue_ids = resolve_venue_ids(session, df.get("Venue", pd.Series([])).unique())
+        rows, counts["skipped"] = _fixture_rows(df, season, team_ids, venue_ids)
+
+        matches = Match.__table__
+        existing = {
+            tuple(r[1:5]): (r[0], dict(zip(MATCH_UPDATE_COLUMNS, r[5:], strict=True)))
+            for r in session.execute(
+                select(
+                    matches.c.match_id,
+                    *(matches.c[c] for c in MATCH_KEY_COLUMNS + MATCH_UPDATE_COLUMNS),
+                ).where(matches.c.season == season)
+            )
+        }
+
+        changed, updates, inserted_keys, table_weeks = [], [], set(), set()
+        for row in rows:
+            key = tuple(row[c] for c in MATCH_KEY_COLUMNS)
+            if key not in existing:
+                row["kickoff_utc"] = kickoff_utc(row["date"], row["time"])
+                counts["inserted"] += 1
+                inserted_keys.add(key)
+                changed.append(row)
+                if row["home_goals"] is not None:
+                    table_weeks.add(row["week"])
                 continue
+            match_id, current = existing[key]
+            row["kickoff_utc"] = kickoff_utc(
+                row["date"], row["time"] or current["time"]
+            )
+            columns = [
+                c
+                for c in MATCH_UPDATE_COLUMNS
+                if row[c] is not None and row[c] != current[c]
+            ]
+            if columns:
+                counts["updated"] += 1
+                updates.append((match_id, columns))
+                changed.append(row)
+                if set(columns) & set(TABLE_INPUT_COLUMNS):
+                    table_weeks.update((row["week"], current["week"]))
+            else:
+                counts["unchanged"] += 1
+
+        upsert_rows(
+            session,
+            matches,
+            changed,
+            key_columns=MATCH_KEY_COLUMNS,
+            update_columns=MATCH_UPDATE_COLUMNS,
+        )
 
-        session.commit()
+        inserts = []
+        if inserted_keys:
+            inserts = [
+                (r[0], None)
+                for r in session.execute(
+                    select(
+                        matches.c.match_id, *(matches.c[c] for c in MATCH_KEY_COLUMNS)
+                    ).where(matches.c.season == season)
+                )
+                if tuple(r[1:]) in inserted_keys
+            ]
+        record_changes(session, "matches", inserts + updates)
+        keys = [(season, "matches")] if changed else []
+        table_weeks.discard(None)
+        if table_weeks:
+            refresh_league_table(session, season, from_week=min(table_weeks))
+            keys.append((season, "league_table"))
+            close_season_if_finished(session, season)
+        bump_generations(session, keys)
+
+    run_write(write)
+    bump_data_generation()
+
+    print(
+        f"Fixtures for {season}: {counts['inserted']} inserted, {counts['updated']} updated, "
+        f"{counts['unchanged']} unchanged, {counts['skipped']} skipped."
+    )
+    return counts
@@ -1,9 +1,11 @@
 import pandas as pd
 from sqlalchemy import select
 
-from ..database import get_session
+from ..generations import ALL_SEASONS, bump_generations
 from ..mappings.load_mappings import load_team_ids_mapping, load_team_name_mapping
+from ..metadata_cache import bump_data_generation
 from ..models import Team
+from ..writer import publish_writes, run_write
 
 
 def upsert_team(
@@ -26,7 +28,7 @@ def upsert_team(
     team_name_mapping = load_team_name_mapping()
     team_ids_mapping = load_team_ids_mapping()
 
-    with get_session() as session:
+    def write(session):
         if df is not None:
             # Batch mode: Process DataFrame
             expected_columns = ["Name", "Fullname", "FBrefTeamID"]
@@ -120,12 +122,16 @@ def upsert_team(
             print("Error: Must provide either 'name' or 'df'.")
             return
 
-        session.commit()
+        bump_generations(session, [(ALL_SEASONS, "teams")])
+
+    run_write(write)
+    bump_data_generation()
 
 
 if __name__ == "__main__":
     # Example usage: Single team
     upsert_team(name="Ipswich Town")
+    publish_writes()
 
     # Example usage: DataFrame
     # df = pd.DataFrame({
@@ -0,0 +1,72 @@
+"""
+venues.py
+
+Resolve scraped stadium names to canonical venue ids at write time, so read
+paths never need to rewrite venue strings.
+"""
+
+from typing import Dict, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .mappings.load_mappings import load_venue_aliases_mapping
+from .models import Venue, VenueAlias
+
+
+def resolve_venue_ids(session: Session, names: Iterable[str]) -> Dict[str, int]:
+    """
+    Map each venue name to its canonical venue_id, creating venues and alias
+    rows for names that have not been seen before.
+
+    Args:
+        session: Open session; new rows are flushed but not committed.
+        names: Venue names as they appear in scraped data.
+
+    Returns:
+        Dict[str, int]: Mapping of each input name to a venue_id.
+    """
+    names = {name for name in names if isinstance(name, str) and name}
+    if not names:
+        return {}
+
+    resolved = dict(
+        session.execute(
+            select(VenueAlias.alias, VenueAlias.venue_id).where(
+                VenueAlias.alias.in_(names)
+            )
+        ).all()
+    )
+    missing = sorted(names - resolved.keys())
+    if not missing:
+        return resolved
+
+    mapping = load_venue_aliases_mapping()
+    canonical_names = {
+        alias: canonical
+        for canonical, entry in mapping.items()
+        for alias in entry.get("aliases", [])
+    }
+
+    for name in missing:
+        if name in resolved:
+            continue
+        canonical = canonical_names.get(name, name)
+        venue = session.execute(
+            select(Venue).filter_by(name=canonical)
+        ).scalar_one_or_none()
+        if venue is None:
+            venue = Venue(
+                name=canonical,
+                display_name=mapping.get(canonical, {}).get("display_name"),
+            )
+            session.add(venue)
+            session.flush()
+            if canonical != name:
+                session.add(VenueAlias(alias=canonical, venue_id=venue.venue_id))
+                resolved[canonical] = venue.venue_id
+        session.add(VenueAlias(alias=name, venue_id=venue.venue_id))
+        resolved[name] = venue.venue_id
+
+    session.flush()
+    return resolved
@@ -0,0 +1,213 @@
+"""
+writer.py
+
+Single writer for the database. SQLite allows one writer at a time, so
+instead of letting request handlers, scrapers and training runs race for the
+write lock (and stall on "database is locked"), every mutation is queued to
+one background thread. The thread drains whatever is queued and runs it in
+a single transaction, so bursts of small writes cost one commit. Readers
+never go through the writer and stay concurrent under WAL.
+
+In serving mode a new serving snapshot is a full copy of the database, so
+the writer only publishes when asked: run_write_and_publish() publishes
+after its commit, before the caller is released, so the caller reads its
+own write (the prediction cache needs this). Ingest and training runs write
+with run_write() and call publish_writes() once when they finish; until
+then readers keep the previous snapshot.
+
+Usage:
+    def _write(session, rows):
+        session.execute(...)
+
+    run_write(_write, rows)  # blocks until committed, returns _write's result
+    publish_writes()  # at the end of the run
+"""
+
+import atexit
+import contextvars
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from .database import SessionLocal, publish_serving_snapshot
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_JOBS = 64
+
+
+class _Job:
+    __slots__ = ("fn", "args", "kwargs", "publish", "future", "context")
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict, publish: bool = False):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.publish = publish
+        self.future = Future()
+        # Run in the submitter's context, so its query stats count the write
+        self.context = contextvars.copy_context()
+
+    def run(self, session: Session) -> Any:
+        return self.context.run(self.fn, session, *self.args, **self.kwargs)
+
+
+class DatabaseWriter:
+    """
+    Background thread that owns every write transaction.
+
+    Args:
+        session_factory: Callable returning a new Session.
+        max_batch_jobs: Most queued jobs committed in one transaction.
+        on_publish: Called after a committed batch holding a job that asked
+            to publish, before its jobs' futures resolve. Failures are
+            logged, not raised.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_batch_jobs: int = MAX_BATCH_JOBS,
+        on_publish: Optional[Callable[[], None]] = None,
+    ):
+        self._session_factory = session_factory
+        self._max_batch_jobs = max_batch_jobs
+        self._on_publish = on_publish
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._local = threading.local()
+        self._thread = threading.Thread(
+            target=self._run_forever, name="db-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, fn: Callable, *args, publish: bool = False, **kwargs) -> Future:
+        """
+        Queue `fn(session, *args, **kwargs)`; the future resolves after
+        commit, and after publishing if `publish` is set.
+        """
+        job = _Job(fn, args, kwargs, publish)
+        self._queue.put(job)
+        return job.future
+
+    def run(self, fn: Callable, *args, publish: bool = False, **kwargs) -> Any:
+        """Queue `fn` and wait for it to commit. Nested calls run inline."""
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            self._local.publish = self._local.publish or publish
+            return fn(session, *args, **kwargs)
+        return self.submit(fn, *args, publish=publish, **kwargs).result()
+
+    def publish(self) -> None:
+        """Publish everything committed so far and wait for it."""
+        self.submit(_no_write, publish=True).result()
+
+    def close(self) -> None:
+        """Finish the queued jobs and stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _next_batch(self) -> list:
+        batch = [self._queue.get()]
+        while batch[-1] is not None and len(batch) < self._max_batch_jobs:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run_forever(self) -> None:
+        while True:
+            batch = self._next_batch()
+            stop = batch[-1] is None
+            jobs = [job for job in batch if job is not None]
+            if jobs:
+                self._run_batch(jobs)
+            if stop:
+                return
+
+    def _run_batch(self, jobs: list) -> None:
+        try:
+            results, publish = self._transaction(jobs)
+        except Exception as e:
+            if len(jobs) == 1:
+                jobs[0].future.set_exception(e)
+                return
+            # Isolate the failing job(s) without losing the others' writes
+            logger.warning(
+                f"Write batch of {len(jobs)} jobs failed, retrying one by one"
+            )
+            for job in jobs:
+                self._run_batch([job])
+            return
+        if publish and self._on_publish is not None:
+            try:
+                self._on_publish()
+            except Exception:
+                logger.exception("Publishing after commit failed")
+        for job, result in zip(jobs, results, strict=True):
+            job.future.set_result(result)
+
+    def _transaction(self, jobs: list) -> tuple:
+        session = self._session_factory()
+        self._local.session = session
+        self._local.publish = any(job.publish for job in jobs)
+        try:
+            results = [job.run(session) for job in jobs]
+            session.commit()
+            return results, self._local.publish
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            self._local.session = None
+            session.close()
+
+
+def _no_write(session: Session) -> None:
+    """Empty job, queued to publish what earlier jobs committed."""
+
+
+_writer: Optional[DatabaseWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> DatabaseWriter:
+    """The process-wide writer, started on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = DatabaseWriter(
+                on_publish=publish_serving_snapshot
+                if settings.SERVING_DATABASE_PATH
+                else None
+            )
+            atexit.register(_writer.close)
+        return _writer
+
+
+def run_write(fn: Callable, *args, **kwargs) -> Any:
+    """Run `fn(session, *args, **kwargs)` on the writer thread; wait for the commit."""
+    return get_writer().run(fn, *args, **kwargs)
+
+
+def run_write_and_publish(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Like run_write(), but in serving mode the caller is only released once a
+    snapshot holding the write is published, so its next read sees it.
+    """
+    return get_writer().run(fn, *args, publish=True, **kwargs)
+
+
+def publish_writes() -> None:
+    """
+    Publish every committed write as the new serving snapshot (serving mode
+    only). Ingest and training runs call this once when they finish.
+    """
+    if settings.SERVING_DATABASE_PATH:
+        get_writer().publish()
@@ -10,12 +10,14 @@ from .api.endpoints import (
     evaluate,
     fixtures,
     matchweek,
+    monitoring,
     predict,
     seasons,
     superbru,
     train,
 )
 from .core.config import settings
+from .db.query_stats import track_queries
 
 logging.basicConfig(
     level=logging.INFO,
@@ -39,6 +41,18 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def count_queries(request: Request, call_next):
+    """Count each request's SQL statements; exposed as headers in debug mode."""
+    label = f"{request.method} {request.url.path}"
+    with track_queries(label, level=logging.DEBUG) as stats:
+        response = await call_next(request)
+    if settings.DEBUG:
+        response.headers["X-DB-Statements"] = str(stats.statements)
+        response.headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.1f}"
+    return response
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.exception(
@@ -60,6 +74,7 @@ def healthcheck():
 app.include_router(train.router, prefix=settings.API_PREFIX)
 app.include_router(predict.router, prefix=settings.API_PREFIX)
 app.include_router(evaluate.router, prefix=settings.API_PREFIX)
+app.include_router(monitoring.router, prefix=settings.API_PREFIX)
 
 ## Fixtures
 app.include_router(fixtures.router, prefix=settings.API_PREFIX)
@@ -1,5 +1,7 @@
 from .requests import MatchInput
 from .responses import (
+    LeagueTableResponse,
+    LeagueTableRow,
     MatchRow,
     MatchweekResponse,
     ModelPerformance,
@@ -9,3 +11,17 @@ from .responses import (
     TrainResponse,
     ValidationPerformanceResponse,
 )
+
+__all__ = [
+    "LeagueTableResponse",
+    "LeagueTableRow",
+    "MatchInput",
+    "MatchRow",
+    "MatchweekResponse",
+    "ModelPerformance",
+    "SeasonSummaryResponse",
+    "SeasonsResponse",
+    "SuperbruLeaderboardResponse",
+    "TrainResponse",
+    "ValidationPerformanceResponse",
+]
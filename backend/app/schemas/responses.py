@@ -55,6 +55,26 @@ class SeasonSummaryResponse(BaseModel):
     computed_at: str
 
 
+class LeagueTableRow(BaseModel):
+    position: int
+    team_id: int
+    team: str
+    played: int
+    won: int
+    drawn: int
+    lost: int
+    goals_for: int
+    goals_against: int
+    goal_difference: int
+    points: int
+
+
+class LeagueTableResponse(BaseModel):
+    season: str
+    week: int
+    table: List[LeagueTableRow]
+
+
 class SeasonsResponse(BaseModel):
     seasons: List[str]
 
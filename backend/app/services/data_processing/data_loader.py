@@ -1,10 +1,20 @@
 import json
 
 import pandas as pd
+from sqlalchemy.orm import Session
 
 from ...core.config import settings
-from ...db.queries import get_seasons_fixtures, get_shooting_stats, get_team_details
+from ...db.queries import (
+    get_data_generation,
+    get_fixtures_frame,
+    get_season_generations,
+    get_season_with_predictions_frame,
+    get_seasons_fixtures_frame,
+    get_shooting_stats,
+    get_team_details,
+)
 from ..models.config import TRAINING_DATA_END_SEASON, TRAINING_DATA_START_SEASON
+from .snapshots import PREDICTION_COLUMNS, list_snapshot_seasons, load_snapshot_table
 
 
 def load_json_file(filepath):
@@ -45,26 +55,70 @@ def load_training_data(start_season: int = None, end_season: int = None) -> pd.D
     Returns:
         pd.DataFrame
     """
-    dfs = []
     if not start_season:
         start_season = TRAINING_DATA_START_SEASON
     if not end_season:
         end_season = TRAINING_DATA_END_SEASON
-    for season in generate_seasons(start_year=start_season, end_year=end_season):
-        df = pd.DataFrame(get_seasons_fixtures(season=season))
+    seasons = generate_seasons(start_year=start_season, end_year=end_season)
+
+    # Finished seasons come from their snapshots; the rest in a single query
+    dfs = []
+    live_seasons = []
+    generations = get_season_generations(seasons)
+    for season in seasons:
+        snapshot = load_snapshot_table(season, "fixtures", generations[season])
+        if snapshot is None:
+            live_seasons.append(season)
+        elif not snapshot.empty:
+            dfs.append(snapshot)
+    if live_seasons:
+        df = get_fixtures_frame(live_seasons)
         if not df.empty:
             dfs.append(df)
-    if dfs:
-        return pd.concat(dfs, ignore_index=True)
-    else:
+    if not dfs:
         return pd.DataFrame()  # Return empty DataFrame if no data
+    return (
+        pd.concat(dfs, ignore_index=True)
+        .sort_values(["season", "match_id"])
+        .reset_index(drop=True)
+    )
 
 
 def load_shooting_data(team: str) -> pd.DataFrame:
-    """Load training shooting data for a team from database"""
-    ...
+    """Load training shooting data for a team, from snapshots where available"""
+    finished = []
+    dfs = []
+    snapshot_seasons = list_snapshot_seasons()
+    generations = get_season_generations(snapshot_seasons)
+    for season in snapshot_seasons:
+        snapshot = load_snapshot_table(season, "shooting_stats", generations[season])
+        if snapshot is None:
+            continue
+        finished.append(season)
+        if not snapshot.empty:
+            dfs.append(snapshot[snapshot["team_name"] == team])
     team_id = get_team_details(team)["team_id"]
-    return pd.DataFrame(get_shooting_stats(team_id=team_id))
+    live = pd.DataFrame(get_shooting_stats(team_id=team_id, exclude_seasons=finished))
+    if not dfs:
+        return live
+    if not live.empty:
+        dfs.append(live)
+    return pd.concat(dfs, ignore_index=True).sort_values("stat_id", ignore_index=True)
+
+
+def load_season_with_predictions(season: str) -> pd.DataFrame:
+    """
+    Matches for a season with their cached predictions, from the season's
+    snapshot if it has one, otherwise from the database.
+    """
+    generation = get_data_generation(season)
+    fixtures = load_snapshot_table(season, "fixtures", generation)
+    predictions = load_snapshot_table(season, "predictions", generation)
+    if fixtures is None or predictions is None:
+        return get_season_with_predictions_frame(season)
+    if predictions.empty:
+        predictions = pd.DataFrame(columns=PREDICTION_COLUMNS)
+    return fixtures.merge(predictions, on="match_id", how="left")
 
 
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -80,16 +134,19 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def get_this_seasons_fixtures_data(season: str = None) -> pd.DataFrame:
+def get_this_seasons_fixtures_data(
+    season: str = None, session: Session = None
+) -> pd.DataFrame:
     """
     Reads fixtures data for the given season from the database.
-    Defaults to the current season if no season is specified.
+    Defaults to the current season if no season is specified. Pass `session`
+    to read through an existing (e.g. request-scoped) session.
 
     Returns:
         pd.DataFrame: DataFrame containing the fixtures data.
     """
     if season is None:
         season = settings.CURRENT_SEASON
-    df = pd.DataFrame(get_seasons_fixtures(season=season))
+    df = get_seasons_fixtures_frame(season=season, session=session)
     df.dropna(thresh=7, inplace=True)  # Dropping any NaN rows in the data
     return df
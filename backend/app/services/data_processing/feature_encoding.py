@@ -1,56 +1,90 @@
-import pickle
+import json
+from datetime import datetime
+from typing import Iterable
 
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import LabelEncoder
 
+VOCABULARY_FORMAT_VERSION = 1
+UNKNOWN_CODE = 0  # Reserved for teams/venues not seen when the vocabulary was fitted
 
-def fit_team_name_encoder(df: pd.DataFrame, all_known_teams: list[str] | None = None) -> LabelEncoder:
-    team_encoder = LabelEncoder()
+
+class Vocabulary:
+    """
+    Frozen mapping from categorical values to integer codes.
+
+    Known values are coded 1..n in sorted order; anything unseen (e.g. a newly
+    promoted side or a renamed stadium) encodes to UNKNOWN_CODE instead of
+    raising like LabelEncoder.transform does.
+    """
+
+    def __init__(self, values: Iterable[str]):
+        self.values = sorted({v for v in values if isinstance(v, str)})
+        self._codes = {value: code for code, value in enumerate(self.values, start=1)}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._codes
+
+    def encode(self, values: Iterable[str]) -> np.ndarray:
+        codes = self._codes
+        return np.fromiter(
+            (codes.get(value, UNKNOWN_CODE) for value in values), dtype=np.int64
+        )
+
+
+def fit_team_name_encoder(df: pd.DataFrame, all_known_teams: list[str] | None = None) -> Vocabulary:
     if all_known_teams:
         # Fit on every team that has ever appeared in the DB so promoted sides
         # are never unseen when encoding a future season's data.
-        team_encoder.fit(sorted(set(all_known_teams)))
-    else:
-        all_teams = pd.concat([df["home_team"], df["away_team"]]).unique()
-        team_encoder.fit(all_teams)
-    return team_encoder
+        return Vocabulary(all_known_teams)
+    return Vocabulary(pd.concat([df["home_team"], df["away_team"]]).unique())
 
 
-def encode_team_name_features(df: pd.DataFrame, encoder: LabelEncoder) -> pd.DataFrame:
-    df["home_team_encoded"] = encoder.transform(df["home_team"])
-    df["away_team_encoded"] = encoder.transform(df["away_team"])
+def encode_team_name_features(df: pd.DataFrame, encoder: Vocabulary) -> pd.DataFrame:
+    df["home_team_encoded"] = encoder.encode(df["home_team"])
+    df["away_team_encoded"] = encoder.encode(df["away_team"])
     return df
 
 
-def fit_venue_encoder(df: pd.DataFrame, all_known_venues: list[str] | None = None) -> LabelEncoder:
-    venue_encoder = LabelEncoder()
+def fit_venue_encoder(df: pd.DataFrame, all_known_venues: list[str] | None = None) -> Vocabulary:
     if all_known_venues:
-        venue_encoder.fit(sorted(set(all_known_venues)))
-    else:
-        venue_encoder.fit(sorted(df["venue"].dropna().unique()))
-    return venue_encoder
+        return Vocabulary(all_known_venues)
+    return Vocabulary(df["venue"].dropna().unique())
 
 
-def encode_venue_name_feature(df: pd.DataFrame, encoder: LabelEncoder) -> pd.DataFrame:
-    # Cleaning up mismatches and changes in Stadium names before encoding
-    venue_replacements = {
-        "The American Express Stadium": "The American Express Community Stadium",
-        "St Mary's Stadium": "St. Mary's Stadium",
-    }
-    df["venue"] = df["venue"].replace(venue_replacements)
-    df["venue_code"] = encoder.transform(df["venue"])
+def encode_venue_name_feature(df: pd.DataFrame, encoder: Vocabulary) -> pd.DataFrame:
+    # Venue names are resolved to their canonical form when matches are written
+    df["venue_code"] = encoder.encode(df["venue"])
     return df
 
 
-def load_encoder_file(filepath: str):
-    with open(filepath, "rb") as file:
-        return pickle.load(file)
-
-
-def save_encoder_to_file(encoder: LabelEncoder, filepath: str) -> None:
-    with open(filepath, "wb") as file:
-        pickle.dump(encoder, file)
+def save_vocabularies(
+    filepath, teams: Vocabulary, venues: Vocabulary, version: str
+) -> None:
+    """Write the team and venue vocabularies to a single versioned JSON artifact."""
+    artifact = {
+        "format": VOCABULARY_FORMAT_VERSION,
+        "version": version,
+        "created_at": datetime.utcnow().isoformat(),
+        "teams": teams.values,
+        "venues": venues.values,
+    }
+    with open(filepath, "w") as f:
+        json.dump(artifact, f, indent=2)
+
+
+def load_vocabularies(filepath) -> tuple[Vocabulary, Vocabulary]:
+    """Read a vocabulary artifact written by `save_vocabularies`."""
+    with open(filepath) as f:
+        artifact = json.load(f)
+    if artifact.get("format") != VOCABULARY_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported vocabulary format {artifact.get('format')!r} in {filepath}"
+        )
+    return Vocabulary(artifact["teams"]), Vocabulary(artifact["venues"])
 
 
 def encode_season_column(df: pd.DataFrame) -> pd.DataFrame:
@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
 
-from ...core.paths import data_dir
+from ...core.paths import SHOOTING_STATS_DATA_DIR
+from ...db.queries import get_team_season_aggregates
 from ..models.config import (
     SH_ROLLING_AWAY_COLS,
     SH_ROLLING_COLS,
@@ -8,6 +10,7 @@ from ..models.config import (
     SHOOTING_STATS_COLS,
 )
 from .data_loader import load_shooting_data
+from .team_registry import TeamRegistry
 
 
 def calculate_match_points(df: pd.DataFrame) -> pd.DataFrame:
@@ -146,43 +149,72 @@ def create_rolling_shooting_stats(teams: list[str]) -> pd.DataFrame:
     return merged_df
 
 
-def add_previous_season_standing(df: pd.DataFrame, default_rank: int = 18) -> pd.DataFrame:
+def _interleave(home: np.ndarray, away: np.ndarray) -> np.ndarray:
     """
-    Adds previous season's rank, GF, GA, and GD for home and away teams.
-    Promoted teams that weren't in the EPL the prior season get default values.
+    Interleave per-match home and away values into one array in match order,
+    i.e. [home_0, away_0, home_1, away_1, ...]. Grouping this array by team
+    code visits each team's matches in the order they appear in the frame.
     """
-    df = df.copy()
-    standings_df = pd.read_csv(f"{data_dir}/standings/2000-2025.csv")
-    standings_df = standings_df[["Season", "Pos", "Team", "GF", "GA", "GD"]].copy()
-
-    # GD column uses Unicode minus (U+2212) in some rows — normalise to ASCII
-    for col in ["GF", "GA", "GD"]:
-        standings_df[col] = (
-            standings_df[col]
-            .astype(str)
-            .str.replace("−", "-", regex=False)
-            .str.replace("+", "", regex=False)
-            .pipe(pd.to_numeric, errors="coerce")
-        )
+    return np.column_stack([home, away]).ravel()
+
+
+def _split(values) -> tuple[np.ndarray, np.ndarray]:
+    """Inverse of `_interleave`: return the (home, away) halves."""
+    pairs = np.asarray(values).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def _goals(df: pd.DataFrame, col: str) -> np.ndarray:
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
 
-    def reformat_season(season: str) -> str:
-        year = int(season.split("-")[0])
-        return f"{year}-{year + 1}"
+
+def add_previous_season_standing(
+    df: pd.DataFrame,
+    registry: TeamRegistry,
+    default_rank: int = 18,
+    default_goals: float = 52.0,
+) -> pd.DataFrame:
+    """
+    Adds previous season's rank, GF, GA, and GD for home and away teams, read
+    from team_season_aggregates. Promoted teams that weren't in the EPL the
+    prior season get default values: `default_rank` and the league-average
+    goals of the prior seasons, or `default_goals` (and a GD of 0) if none of
+    them have aggregates yet.
+    """
+    df = df.copy()
 
     def get_prev_season(season: str) -> str:
         year = int(season.split("-")[0])
         return f"{year - 1}-{year}"
 
-    standings_df["Season"] = standings_df["Season"].apply(reformat_season)
     df["prev_season"] = df["season"].apply(get_prev_season)
+    standings_df = get_team_season_aggregates(df["prev_season"].unique()).rename(
+        columns={
+            "season": "Season",
+            "team": "Team",
+            "position": "Pos",
+            "goals_for": "GF",
+            "goals_against": "GA",
+            "goal_difference": "GD",
+        }
+    )
+    # Float even when there are no rows, so the merged columns stay numeric
+    standings_df = standings_df.astype({"Pos": float, "GF": float, "GA": float, "GD": float})
+    standings_df["code"] = registry.lookup(standings_df["Team"])
+    standings_df = standings_df.drop_duplicates(subset=["Season", "code"])
+
+    if standings_df.empty:
+        league_avg_gf = league_avg_ga = default_goals
+        league_avg_gd = 0.0
+    else:
+        league_avg_gf = standings_df["GF"].mean()
+        league_avg_ga = standings_df["GA"].mean()
+        league_avg_gd = standings_df["GD"].mean()
 
-    league_avg_gf = standings_df["GF"].mean()
-    league_avg_ga = standings_df["GA"].mean()
-    league_avg_gd = standings_df["GD"].mean()
-
-    for side, team_col in [("h", "home_team"), ("a", "away_team")]:
+    for side, code_col in [("h", "home_code"), ("a", "away_code")]:
         rename = {
-            "Team": team_col,
+            "Season": "prev_season",
+            "code": code_col,
             "Pos": f"pos_last_season_{side}",
             "GF": f"gf_last_season_{side}",
             "GA": f"ga_last_season_{side}",
@@ -190,20 +222,16 @@ def add_previous_season_standing(df: pd.DataFrame, default_rank: int = 18) -> pd
         }
         df = pd.merge(
             df,
-            standings_df.rename(columns=rename),
+            standings_df[list(rename)].rename(columns=rename),
             how="left",
-            left_on=["prev_season", team_col],
-            right_on=["Season", team_col],
+            on=["prev_season", code_col],
         )
         df[f"pos_last_season_{side}"] = df[f"pos_last_season_{side}"].fillna(default_rank)
         df[f"gf_last_season_{side}"] = df[f"gf_last_season_{side}"].fillna(league_avg_gf)
         df[f"ga_last_season_{side}"] = df[f"ga_last_season_{side}"].fillna(league_avg_ga)
         df[f"gd_last_season_{side}"] = df[f"gd_last_season_{side}"].fillna(league_avg_gd)
 
-    df = df.drop(
-        columns=["prev_season", "Season_x", "Season_y", "home_team_y", "away_team_y"],
-        errors="ignore",
-    )
+    df = df.drop(columns=["prev_season"])
     return df
 
 
@@ -213,28 +241,17 @@ def add_days_rest(df: pd.DataFrame, default_days: int = 7) -> pd.DataFrame:
     Defaults to `default_days` for a team's first match of the dataset.
     """
     df = df.copy().sort_values("date").reset_index(drop=True)
-    df["days_rest_h"] = float(default_days)
-    df["days_rest_a"] = float(default_days)
-
-    last_match: dict[str, pd.Timestamp] = {}
-
-    for idx, row in df.iterrows():
-        home_team = row["home_team"]
-        away_team = row["away_team"]
-        match_date = row["date"]
-
-        if home_team in last_match:
-            df.at[idx, "days_rest_h"] = (match_date - last_match[home_team]).days
-        if away_team in last_match:
-            df.at[idx, "days_rest_a"] = (match_date - last_match[away_team]).days
-
-        last_match[home_team] = match_date
-        last_match[away_team] = match_date
+    codes = _interleave(df["home_code"].to_numpy(), df["away_code"].to_numpy())
+    dates = pd.Series(np.repeat(df["date"].to_numpy(), 2))
 
+    rest = dates.groupby(codes).diff().dt.days.astype(float).fillna(float(default_days))
+    df["days_rest_h"], df["days_rest_a"] = _split(rest)
     return df
 
 
-def add_xg_rolling_stats(df: pd.DataFrame, teams: list[str], window: int = 3) -> pd.DataFrame:
+def add_xg_rolling_stats(
+    df: pd.DataFrame, registry: TeamRegistry, window: int = 3
+) -> pd.DataFrame:
     """
     Adds rolling xG for and xG against averages for each team from the shooting
     stats CSV files (xG is not stored in the DB).
@@ -242,12 +259,13 @@ def add_xg_rolling_stats(df: pd.DataFrame, teams: list[str], window: int = 3) ->
     Adds columns: xg_rolling_h, xg_against_rolling_h, xg_rolling_a, xg_against_rolling_a.
     Falls back to 0 when xG data is unavailable (pre-2017 seasons).
     """
-    xg_records = []
+    xg_cols = ["xg_rolling_h", "xg_against_rolling_h", "xg_rolling_a", "xg_against_rolling_a"]
+    xg_frames = []
 
-    for team in teams:
+    for team in registry.loaded_names:
         # Normalise team name to match CSV filenames
         csv_name = team.replace(" ", "-").replace("'", "")
-        path = data_dir / "shooting_stats" / f"{csv_name}.csv"
+        path = SHOOTING_STATS_DATA_DIR / f"{csv_name}.csv"
         if not path.exists():
             continue
 
@@ -262,53 +280,64 @@ def add_xg_rolling_stats(df: pd.DataFrame, teams: list[str], window: int = 3) ->
         raw["GA_xg"] = pd.to_numeric(raw["GA"], errors="coerce").fillna(0)
 
         # Rolling xG for and against (left-closed = exclude current match)
-        raw["xg_rolling"] = raw["xG"].rolling(window, min_periods=1, closed="left").mean().fillna(0)
-        raw["xg_against_rolling"] = raw["GA_xg"].rolling(window, min_periods=1, closed="left").mean().fillna(0)
-
-        for _, row in raw.iterrows():
-            is_home = str(row.get("Venue", "")).strip() == "Home"
-            xg_records.append({
-                "date": row["date"],
-                "team": team,
-                "is_home": is_home,
-                "xg_rolling": row["xg_rolling"],
-                "xg_against_rolling": row["xg_against_rolling"],
-            })
-
-    if not xg_records:
-        for col in ["xg_rolling_h", "xg_against_rolling_h", "xg_rolling_a", "xg_against_rolling_a"]:
+        xg_frames.append(
+            pd.DataFrame(
+                {
+                    "date": raw["date"],
+                    "code": registry.intern(team),
+                    "is_home": raw.get("Venue", pd.Series("", index=raw.index))
+                    .astype(str)
+                    .str.strip()
+                    == "Home",
+                    "xg_rolling": raw["xG"]
+                    .rolling(window, min_periods=1, closed="left")
+                    .mean()
+                    .fillna(0),
+                    "xg_against_rolling": raw["GA_xg"]
+                    .rolling(window, min_periods=1, closed="left")
+                    .mean()
+                    .fillna(0),
+                }
+            )
+        )
+
+    if not xg_frames:
+        for col in xg_cols:
             df[col] = 0.0
         return df
 
-    xg_df = pd.DataFrame(xg_records)
+    xg_df = pd.concat(xg_frames, ignore_index=True)
     xg_home = xg_df[xg_df["is_home"]].rename(columns={
-        "team": "home_team",
+        "code": "home_code",
         "xg_rolling": "xg_rolling_h",
         "xg_against_rolling": "xg_against_rolling_h",
-    })[["date", "home_team", "xg_rolling_h", "xg_against_rolling_h"]]
+    })[["date", "home_code", "xg_rolling_h", "xg_against_rolling_h"]]
 
     xg_away = xg_df[~xg_df["is_home"]].rename(columns={
-        "team": "away_team",
+        "code": "away_code",
         "xg_rolling": "xg_rolling_a",
         "xg_against_rolling": "xg_against_rolling_a",
-    })[["date", "away_team", "xg_rolling_a", "xg_against_rolling_a"]]
+    })[["date", "away_code", "xg_rolling_a", "xg_against_rolling_a"]]
 
-    df = pd.merge(df, xg_home, how="left", on=["date", "home_team"])
-    df = pd.merge(df, xg_away, how="left", on=["date", "away_team"])
+    df = pd.merge(df, xg_home, how="left", on=["date", "home_code"])
+    df = pd.merge(df, xg_away, how="left", on=["date", "away_code"])
 
-    for col in ["xg_rolling_h", "xg_against_rolling_h", "xg_rolling_a", "xg_against_rolling_a"]:
+    for col in xg_cols:
         df[col] = df[col].fillna(0.0)
 
     return df
 
 
-def add_rolling_shooting_stats(df: pd.DataFrame, teams: list[str]) -> pd.DataFrame:
-    rolling_df = create_rolling_shooting_stats(teams)
+def add_rolling_shooting_stats(df: pd.DataFrame, registry: TeamRegistry) -> pd.DataFrame:
+    rolling_df = create_rolling_shooting_stats(registry.loaded_names)
+    rolling_df["home_code"] = registry.lookup(rolling_df["home_team"])
+    rolling_df["away_code"] = registry.lookup(rolling_df["away_team"])
+    rolling_df = rolling_df.drop(columns=["home_team", "away_team"])
     merged_df = pd.merge(
         df,
         rolling_df,
         how="left",
-        on=["date", "week", "home_team", "away_team"],
+        on=["date", "week", "home_code", "away_code"],
         suffixes=("", "_y"),
     )
     # Impute NA for rolling shooting stats
@@ -316,29 +345,21 @@ def add_rolling_shooting_stats(df: pd.DataFrame, teams: list[str]) -> pd.DataFra
     return merged_df
 
 
-def add_ppg_features(df: pd.DataFrame, teams: list[str]) -> pd.DataFrame:
-    """Adds points per game (PPG) features to the dataframe for each team."""
-    for team in teams:
-        # Get all the matches of a team
-        # Calculate the rolling points per game with a window of 3 games
-        team_df = df[(df["home_team"] == team) | (df["away_team"] == team)].copy()
-        team_df["Points"] = team_df["home_points"].where(
-            team_df["home_team"] == team, team_df["away_points"]
-        )
-        team_df["ppg_rolling"] = (
-            team_df["Points"].rolling(3, closed="left").mean().fillna(0)
-        )
-
-        team_df.loc[:, "Points"] = df["home_points"].where(
-            df["home_team"] == team, df["away_points"]
+def add_ppg_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds rolling points per game (PPG) over each team's previous 3 matches.
+    Teams with fewer than 3 previous results get 0.
+    """
+    codes = _interleave(df["home_code"].to_numpy(), df["away_code"].to_numpy())
+    points = pd.Series(
+        _interleave(
+            df["home_points"].to_numpy(dtype=float),
+            df["away_points"].to_numpy(dtype=float),
         )
-        df.loc[df["home_team"] == team, "ppg_rolling_h"] = team_df.loc[
-            team_df["home_team"] == team, "ppg_rolling"
-        ]
-        df.loc[df["away_team"] == team, "ppg_rolling_a"] = team_df.loc[
-            team_df["away_team"] == team, "ppg_rolling"
-        ]
-
+    )
+    by_team = points.groupby(codes)
+    ppg = (by_team.shift(1) + by_team.shift(2) + by_team.shift(3)) / 3
+    df["ppg_rolling_h"], df["ppg_rolling_a"] = _split(ppg.fillna(0))
     return df
 
 
@@ -353,7 +374,7 @@ def add_elo_ratings(
     Adds Elo ratings for home and away teams as features to the dataset.
 
     Args:
-        df (pd.DataFrame): Dataset with 'date', 'season', 'home_team', 'away_team', 'FTHG', 'FTAG'.
+        df (pd.DataFrame): Dataset with 'date', 'season', 'home_code', 'away_code', 'FTHG', 'FTAG'.
         k (int): Elo update factor (higher = faster rating changes).
         home_advantage (int): Rating boost for home team.
         base_rating (int): Initial Elo rating for new teams.
@@ -362,62 +383,85 @@ def add_elo_ratings(
     Returns:
         pd.DataFrame: Dataset with 'elo_h' and 'elo_a' columns.
     """
-    df = df.copy().sort_values("date")  # Ensure chronological order
-    df["elo_h"] = 0.0
-    df["elo_a"] = 0.0
-
-    # Initialize Elo ratings for all teams
-    teams = set(df["home_team"]).union(df["away_team"])
-    elo_ratings = {team: base_rating for team in teams}
+    df = df.copy().sort_values("date", kind="stable")  # Ensure chronological order
+    home_codes = df["home_code"].tolist()
+    away_codes = df["away_code"].tolist()
+    seasons = df["season"].tolist()
+    home_goals = _goals(df, "FTHG").tolist()
+    away_goals = _goals(df, "FTAG").tolist()
+
+    # Ratings indexed by team code
+    n_teams = max(home_codes + away_codes, default=-1) + 1
+    elo_ratings = [float(base_rating)] * n_teams
+    elo_h = [0.0] * len(df)
+    elo_a = [0.0] * len(df)
     current_season = None
 
-    for idx, row in df.iterrows():
-        home_team = row["home_team"]
-        away_team = row["away_team"]
-        season = row["season"]
-
+    for i, (home, away, season) in enumerate(
+        zip(home_codes, away_codes, seasons, strict=True)
+    ):
         # Season reset: Regress ratings toward base at new season
         if current_season != season and current_season is not None:
-            for team in elo_ratings:
-                elo_ratings[team] = base_rating * season_reset + elo_ratings[team] * (
-                    1 - season_reset
-                )
+            elo_ratings = [
+                base_rating * season_reset + rating * (1 - season_reset)
+                for rating in elo_ratings
+            ]
         current_season = season
 
         # Get current ratings (before this match updates them)
-        home_elo = elo_ratings[home_team] + home_advantage
-        away_elo = elo_ratings[away_team]
-
-        df.at[idx, "elo_h"] = home_elo
-        df.at[idx, "elo_a"] = away_elo
+        home_elo = elo_ratings[home] + home_advantage
+        away_elo = elo_ratings[away]
+        elo_h[i] = home_elo
+        elo_a[i] = away_elo
 
         # Update Elo ratings only if FTHG and FTAG are not None
-        if pd.notna(row["FTHG"]) and pd.notna(row["FTAG"]):
-            # Calculate expected scores
+        fthg, ftag = home_goals[i], away_goals[i]
+        if fthg == fthg and ftag == ftag:  # NaN check
             expected_home = 1 / (1 + 10 ** ((away_elo - home_elo) / 400))
             expected_away = 1 - expected_home
 
             # Determine actual scores (1 = win, 0.5 = draw, 0 = loss)
-            if row["FTHG"] > row["FTAG"]:
+            if fthg > ftag:
                 home_score, away_score = 1, 0
-            elif row["FTHG"] < row["FTAG"]:
+            elif fthg < ftag:
                 home_score, away_score = 0, 1
             else:
                 home_score, away_score = 0.5, 0.5
 
-            # Update Elo ratings
-            elo_ratings[home_team] += k * (home_score - expected_home)
-            elo_ratings[away_team] += k * (away_score - expected_away)
-
-    # Debug: Check Elo ranges
-    # print("Elo ratings sample:")
-    # print(df[["date", "season", "home_team", "away_team", "elo_h", "elo_a"]].head())
-    # print(f"Elo_h range: {df['elo_h'].min():.1f} - {df['elo_h'].max():.1f}")
-    # print(f"Elo_a range: {df['elo_a'].min():.1f} - {df['elo_a'].max():.1f}")
+            elo_ratings[home] += k * (home_score - expected_home)
+            elo_ratings[away] += k * (away_score - expected_away)
 
+    df["elo_h"] = elo_h
+    df["elo_a"] = elo_a
     return df
 
 
+def _previous_window_mean(
+    values: np.ndarray, keys: list[np.ndarray], window: int, default: float
+) -> np.ndarray:
+    """
+    Mean of the previous `window` values within each key group (excluding the
+    current row). Groups with no history, or whose window contains a missing
+    value, get `default`.
+    """
+    values = pd.Series(values)
+    filled = values.fillna(0.0)
+    missing = values.isna().astype(float)
+
+    def window_sum(series: pd.Series) -> np.ndarray:
+        by_key = series.groupby(keys).cumsum().groupby(keys)
+        return (
+            by_key.shift(1, fill_value=0.0) - by_key.shift(window + 1, fill_value=0.0)
+        ).to_numpy()
+
+    count = np.minimum(values.groupby(keys).cumcount().to_numpy(), window)
+    totals = window_sum(filled)
+    has_missing = window_sum(missing) > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = totals / count
+    return np.where((count == 0) | has_missing, default, means)
+
+
 def add_h2h_features(
     df: pd.DataFrame, window: int = 5, default_goals: float = 1.5
 ) -> pd.DataFrame:
@@ -425,63 +469,33 @@ def add_h2h_features(
     Adds head-to-head average goals features for home and away teams.
 
     Args:
-        df (pd.DataFrame): Dataset with 'date', 'season', 'home_team', 'away_team', 'FTHG', 'FTAG'.
+        df (pd.DataFrame): Dataset with 'date', 'season', 'home_code', 'away_code', 'FTHG', 'FTAG'.
         window (int): Number of previous H2H matches to consider (default: 5).
         default_goals (float): Default goals for teams with no H2H history (e.g., league avg).
 
     Returns:
         pd.DataFrame: Dataset with 'h2h_home_goals' and 'h2h_away_goals' columns.
     """
-    df = df.copy().sort_values("date")  # Ensure chronological order
-    df["h2h_avg_goals_a"] = 0.0
-    df["h2h_avg_goals_h"] = 0.0
-
-    for idx, row in df.iterrows():
-        home_team = row["home_team"]
-        away_team = row["away_team"]
-        match_date = row["date"]
-
-        # Filter past matches between these teams (both directions)
-        past_matches = df[
-            (df["date"] < match_date)
-            & (
-                ((df["home_team"] == home_team) & (df["away_team"] == away_team))
-                | ((df["home_team"] == away_team) & (df["away_team"] == home_team))
-            )
-        ].tail(window)  # Last `window` matches
-
-        if not past_matches.empty:
-            # Compute average goals
-            home_goals = []
-            away_goals = []
-            for _, match in past_matches.iterrows():
-                if match["home_team"] == home_team:
-                    home_goals.append(match["FTHG"])
-                    away_goals.append(match["FTAG"])
-                else:
-                    home_goals.append(match["FTAG"])  # Home team was away
-                    away_goals.append(match["FTHG"])  # Away team was home
-
-            df.at[idx, "h2h_avg_goals_h"] = (
-                sum(home_goals) / len(home_goals) if home_goals else default_goals
-            )
-            df.at[idx, "h2h_avg_goals_a"] = (
-                sum(away_goals) / len(away_goals) if away_goals else default_goals
-            )
-        else:
-            # No H2H history
-            df.at[idx, "h2h_avg_goals_h"] = default_goals
-            df.at[idx, "h2h_avg_goals_a"] = default_goals
-
-    # Debug: Check feature values
-    # print("H2H features sample:")
-    # print(df[["date", "season", "home_team", "away_team", "h2h_avg_goals_h", "h2h_avg_goals_a"]].head())
-    # print(f"H2H_home_goals range: {df['h2h_avg_goals_h'].min():.2f} - {df['h2h_avg_goals_h'].max():.2f}")
-    # print(f"H2H_away_goals range: {df['h2h_avg_goals_a'].min():.2f} - {df['h2h_avg_goals_a'].max():.2f}")
-
-    df[["h2h_avg_goals_h", "h2h_avg_goals_a"]] = df[
-        ["h2h_avg_goals_h", "h2h_avg_goals_a"]
-    ].fillna(default_goals)
+    df = df.copy().sort_values("date", kind="stable")  # Ensure chronological order
+    home = df["home_code"].to_numpy()
+    away = df["away_code"].to_numpy()
+    fthg = _goals(df, "FTHG")
+    ftag = _goals(df, "FTAG")
+
+    # Each pairing (in either direction) is keyed by (lower code, higher code);
+    # goals are tracked from the perspective of both teams in the pairing.
+    low = np.minimum(home, away)
+    high = np.maximum(home, away)
+    home_is_low = home == low
+    pair = [low, high]
+
+    low_goals = np.where(home_is_low, fthg, ftag)
+    high_goals = np.where(home_is_low, ftag, fthg)
+    h2h_low = _previous_window_mean(low_goals, pair, window, default_goals)
+    h2h_high = _previous_window_mean(high_goals, pair, window, default_goals)
+
+    df["h2h_avg_goals_h"] = np.where(home_is_low, h2h_low, h2h_high)
+    df["h2h_avg_goals_a"] = np.where(home_is_low, h2h_high, h2h_low)
     return df
 
 
@@ -490,28 +504,20 @@ def add_cumulative_season_points(df: pd.DataFrame) -> pd.DataFrame:
     Adds cumulative points earned so far in the current season for each team,
     computed strictly from matches before each game (no data leakage).
 
-    Requires 'date', 'season', 'home_team', 'away_team', 'home_points', 'away_points'.
+    Requires 'date', 'season', 'home_code', 'away_code', 'home_points', 'away_points'.
     Adds 'cum_pts_h' and 'cum_pts_a'.
     """
     df = df.copy().sort_values(["season", "date"]).reset_index(drop=True)
-    df["cum_pts_h"] = 0.0
-    df["cum_pts_a"] = 0.0
-
-    for season, season_df in df.groupby("season", sort=False):
-        season_idx = season_df.index
-        cumulative: dict[str, float] = {}
-
-        for idx in season_idx:
-            row = df.loc[idx]
-            home_team = row["home_team"]
-            away_team = row["away_team"]
-
-            df.at[idx, "cum_pts_h"] = cumulative.get(home_team, 0.0)
-            df.at[idx, "cum_pts_a"] = cumulative.get(away_team, 0.0)
-
-            # Update after recording pre-match values
-            if pd.notna(row["home_points"]) and pd.notna(row["away_points"]):
-                cumulative[home_team] = cumulative.get(home_team, 0.0) + row["home_points"]
-                cumulative[away_team] = cumulative.get(away_team, 0.0) + row["away_points"]
+    codes = _interleave(df["home_code"].to_numpy(), df["away_code"].to_numpy())
+    seasons = np.repeat(df["season"].to_numpy(), 2)
+    points = pd.Series(
+        _interleave(
+            df["home_points"].to_numpy(dtype=float),
+            df["away_points"].to_numpy(dtype=float),
+        )
+    ).fillna(0.0)
 
+    # Running total before each match = inclusive cumulative sum minus this match
+    cumulative = points.groupby([seasons, codes]).cumsum() - points
+    df["cum_pts_h"], df["cum_pts_a"] = _split(cumulative)
     return df
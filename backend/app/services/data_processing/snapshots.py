@@ -0,0 +1,224 @@
+"""
+snapshots.py
+
+Immutable columnar snapshots of finished seasons.
+
+Each finished season is exported once to data/snapshots/<season>/ as three
+.npz files (fixtures, shooting_stats, predictions), one array per column,
+plus a manifest.json holding each file's sha256 and the season fingerprint
+(row counts, highest ids, goals, last prediction time, data generation) the
+snapshot was taken from. Loaders read finished seasons from the snapshot and
+only query the database for seasons that have none, i.e. the live season,
+or whose data generation has moved since the export (e.g. a corrected
+result), until the snapshot is re-exported.
+"""
+
+import hashlib
+import json
+import shutil
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from ...core.config import settings
+from ...core.paths import SNAPSHOTS_DIR
+from ...db.queries import (
+    get_data_generation,
+    get_fixtures_frame,
+    get_season_fingerprint,
+    get_season_with_predictions_frame,
+    get_shooting_stats,
+)
+
+SNAPSHOT_FORMAT_VERSION = 1
+PREDICTION_COLUMNS = ["match_id", "PredFTHG", "PredFTAG", "PredScore", "PredResult"]
+_NULL_MASK_PREFIX = "__null__"
+
+
+def _sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _frame_to_arrays(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """One array per column; text columns get a null mask alongside them."""
+    arrays = {}
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_numeric_dtype(
+            series
+        ) or pd.api.types.is_datetime64_any_dtype(series):
+            arrays[column] = series.to_numpy()
+        else:
+            nulls = series.isna().to_numpy()
+            arrays[column] = series.where(~nulls, "").astype(str).to_numpy(dtype=str)
+            if nulls.any():
+                arrays[_NULL_MASK_PREFIX + column] = nulls
+    return arrays
+
+
+def _arrays_to_frame(arrays) -> pd.DataFrame:
+    columns = {}
+    for name in arrays.files:
+        if name.startswith(_NULL_MASK_PREFIX):
+            continue
+        values = arrays[name]
+        if values.dtype.kind == "U":
+            values = values.astype(object)
+            mask_name = _NULL_MASK_PREFIX + name
+            if mask_name in arrays.files:
+                values[arrays[mask_name]] = None
+            # Build from a list so pandas infers the same dtype as for DB rows
+            values = values.tolist()
+        columns[name] = values
+    return pd.DataFrame(columns)
+
+
+def season_snapshot_dir(season: str):
+    return SNAPSHOTS_DIR / season
+
+
+def read_manifest(season: str) -> dict | None:
+    path = season_snapshot_dir(season) / "manifest.json"
+    if not path.exists():
+        return None
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def list_snapshot_seasons() -> list[str]:
+    """Seasons that have a snapshot on disk, oldest first."""
+    if not SNAPSHOTS_DIR.exists():
+        return []
+    return sorted(
+        path.name
+        for path in SNAPSHOTS_DIR.iterdir()
+        if (path / "manifest.json").exists()
+    )
+
+
+def _season_tables(season: str) -> dict[str, pd.DataFrame]:
+    fixtures = get_fixtures_frame([season])
+
+    shooting = pd.DataFrame(get_shooting_stats(season=season))
+    if not shooting.empty:
+        shooting["date"] = pd.to_datetime(shooting["date"])
+        shooting["time"] = shooting["time"].map(
+            lambda t: t.isoformat() if t is not None else None
+        )
+        shooting = shooting.sort_values("stat_id", ignore_index=True)
+
+    predictions = get_season_with_predictions_frame(season)
+    if not predictions.empty:
+        predictions = predictions.loc[
+            predictions["PredScore"].notna(), PREDICTION_COLUMNS
+        ].reset_index(drop=True)
+
+    return {
+        "fixtures": fixtures,
+        "shooting_stats": shooting,
+        "predictions": predictions,
+    }
+
+
+def is_finished_season(season: str, fingerprint: dict) -> bool:
+    """Past seasons with every result recorded never change again."""
+    return (
+        season < settings.CURRENT_SEASON
+        and fingerprint["matches"] > 0
+        and fingerprint["unplayed"] == 0
+    )
+
+
+def export_season_snapshot(season: str, force: bool = False) -> bool:
+    """
+    Write the snapshot for a finished season.
+
+    Skips the export if the existing snapshot was taken from the same data
+    generation, unless `force` is set.
+
+    Returns:
+        bool: True if a snapshot was written.
+    """
+    fingerprint = get_season_fingerprint(season)
+    if not is_finished_season(season, fingerprint):
+        print(f"Season {season} is not finished, not snapshotting it")
+        return False
+    manifest = read_manifest(season)
+    if not force and manifest and manifest["generation"] == fingerprint:
+        return False
+
+    target = season_snapshot_dir(season)
+    tmp = target.with_name(target.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    files = {}
+    for table, df in _season_tables(season).items():
+        path = tmp / f"{table}.npz"
+        np.savez_compressed(path, **_frame_to_arrays(df))
+        files[table] = {"file": path.name, "rows": len(df), "sha256": _sha256(path)}
+
+    with open(tmp / "manifest.json", "w") as f:
+        json.dump(
+            {
+                "format": SNAPSHOT_FORMAT_VERSION,
+                "season": season,
+                "generation": fingerprint,
+                "created_at": datetime.utcnow().isoformat(),
+                "files": files,
+            },
+            f,
+            indent=2,
+        )
+
+    # Swap the finished snapshot in so readers never see a partial one
+    shutil.rmtree(target, ignore_errors=True)
+    tmp.rename(target)
+    _load_table.cache_clear()
+    return True
+
+
+@lru_cache(maxsize=None)
+def _load_table(season: str, table: str, sha256: str) -> pd.DataFrame | None:
+    path = season_snapshot_dir(season) / f"{table}.npz"
+    if not path.exists() or _sha256(path) != sha256:
+        print(f"Snapshot {path} is missing or fails its checksum, using the DB")
+        return None
+    with np.load(path, allow_pickle=False) as arrays:
+        return _arrays_to_frame(arrays)
+
+
+def load_snapshot_table(
+    season: str, table: str, generation: int = None
+) -> pd.DataFrame | None:
+    """
+    Return a table from a season's snapshot, or None if the season has no
+    valid snapshot or the snapshot is older than the season's data. Each file
+    is checksummed and read at most once per process; callers must not modify
+    the returned frame in place.
+
+    Args:
+        season: Season string e.g. "2023-2024".
+        table: "fixtures", "shooting_stats" or "predictions".
+        generation: The season's current data generation, if the caller
+            already has it (see get_season_generations); read from the
+            database otherwise.
+    """
+    manifest = read_manifest(season)
+    if manifest is None or table not in manifest["files"]:
+        return None
+    if generation is None:
+        generation = get_data_generation(season)
+    if manifest["generation"].get("data_generation") != generation:
+        print(f"Snapshot of {season} predates its latest data, using the DB")
+        return None
+    return _load_table(season, table, manifest["files"][table]["sha256"])
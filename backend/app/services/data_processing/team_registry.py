@@ -0,0 +1,111 @@
+"""
+team_registry.py
+
+Interned integer codes for teams. Feature stages work on dense code arrays
+instead of comparing team-name strings; names only appear when data is loaded
+and when results are returned.
+"""
+
+import threading
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from ...db.queries import get_teams
+
+UNKNOWN_TEAM_CODE = -1
+
+
+class TeamRegistry:
+    """
+    Maps team names, fullnames and fbref ids to dense integer codes (0..n-1).
+
+    Codes are assigned in the order teams are interned, so the first team
+    loaded from the teams table gets code 0. Fullnames and fbref ids resolve
+    to the same code as the team's short name.
+    """
+
+    def __init__(self, teams: Iterable[dict] = ()):
+        self._codes: dict[str, int] = {}
+        self._names: list[str] = []
+        self._lock = threading.Lock()
+        for team in teams:
+            code = self.intern(team["name"])
+            for alias in (team.get("fullname"), team.get("fbref_team_id")):
+                if alias:
+                    self._codes.setdefault(alias, code)
+        self._loaded = len(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._codes
+
+    @property
+    def names(self) -> list[str]:
+        """Team names indexed by code."""
+        return list(self._names)
+
+    @property
+    def loaded_names(self) -> list[str]:
+        """Names of the teams the registry was built from (the teams table)."""
+        return self._names[: self._loaded]
+
+    def intern(self, name: str) -> int:
+        """Return the code for `name`, assigning the next free code if unseen."""
+        code = self._codes.get(name)
+        if code is not None:
+            return code
+        with self._lock:
+            code = self._codes.get(name)
+            if code is None:
+                code = len(self._names)
+                self._names.append(name)
+                self._codes[name] = code
+        return code
+
+    def encode(self, names: Iterable[str]) -> np.ndarray:
+        """Encode names to codes, interning any name not seen before."""
+        return np.fromiter((self.intern(name) for name in names), dtype=np.int64)
+
+    def lookup(self, names: Iterable[str]) -> np.ndarray:
+        """Encode names to codes without interning; unknown names map to -1."""
+        codes = self._codes
+        return np.fromiter(
+            (codes.get(name, UNKNOWN_TEAM_CODE) for name in names), dtype=np.int64
+        )
+
+    def decode(self, codes: Iterable[int]) -> np.ndarray:
+        """Return the team name for each code."""
+        names = np.asarray(self._names, dtype=object)
+        return names[np.asarray(codes, dtype=np.int64)]
+
+
+_registry: TeamRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_team_registry() -> TeamRegistry:
+    """Return the process-wide registry, loading it from the teams table once."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = TeamRegistry(get_teams())
+    return _registry
+
+
+def reset_team_registry() -> None:
+    """Drop the cached registry so the next call reloads it from the DB."""
+    global _registry
+    with _registry_lock:
+        _registry = None
+
+
+def add_team_codes(df: pd.DataFrame, registry: TeamRegistry) -> pd.DataFrame:
+    """Add 'home_code' and 'away_code' columns encoded from the team names."""
+    df["home_code"] = registry.encode(df["home_team"])
+    df["away_code"] = registry.encode(df["away_team"])
+    return df
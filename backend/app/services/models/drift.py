@@ -0,0 +1,352 @@
+"""
+drift.py
+
+Streaming feature-drift monitoring.
+
+Training saves a reference profile of every feature in FEATURES (running
+mean/variance plus a histogram sketch over the training deciles). The
+prediction pipeline feeds each new feature row into a live profile with the
+same bin edges, so monitoring costs a constant amount of work per row and the
+two profiles can be compared at any time.
+"""
+
+import json
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ...core.paths import DRIFT_PROFILE_FILEPATH, season_drift_profile_path
+from .config import FEATURES
+
+# A feature is flagged when its population stability index or mean shift
+# (in reference standard deviations) crosses these thresholds.
+PSI_THRESHOLD = 0.25
+MEAN_SHIFT_THRESHOLD = 3.0
+REFERENCE_QUANTILES = np.linspace(0.1, 0.9, 9)
+_PSI_EPSILON = 1e-4
+
+
+class RunningStats:
+    """Count, mean, variance, min and max maintained with Welford updates."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, min=math.inf, max=-math.inf):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = min
+        self.max = max
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def update(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Combine another set of statistics into this one (Chan et al.)."""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def update_batch(self, values: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+        mean = float(values.mean())
+        self.merge(
+            RunningStats(
+                count=len(values),
+                mean=mean,
+                m2=float(((values - mean) ** 2).sum()),
+                min=float(values.min()),
+                max=float(values.max()),
+            )
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunningStats":
+        return cls(
+            count=data["count"],
+            mean=data["mean"],
+            m2=data["m2"],
+            min=math.inf if data["min"] is None else data["min"],
+            max=-math.inf if data["max"] is None else data["max"],
+        )
+
+
+class HistogramSketch:
+    """
+    Fixed-edge histogram. Bin i counts values in (edges[i-1], edges[i]], with
+    open-ended first and last bins. Sketches with the same edges merge by
+    adding counts.
+    """
+
+    def __init__(self, edges, counts=None):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = (
+            np.zeros(len(self.edges) + 1, dtype=np.int64)
+            if counts is None
+            else np.asarray(counts, dtype=np.int64)
+        )
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def update(self, x: float) -> None:
+        self.counts[np.searchsorted(self.edges, x, side="left")] += 1
+
+    def update_batch(self, values: np.ndarray) -> None:
+        bins = np.searchsorted(self.edges, values, side="left")
+        self.counts += np.bincount(bins, minlength=len(self.counts))
+
+    def merge(self, other: "HistogramSketch") -> None:
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histogram sketches with different edges")
+        self.counts += other.counts
+
+    def proportions(self) -> np.ndarray:
+        total = self.total
+        if total == 0:
+            return np.zeros(len(self.counts))
+        return self.counts / total
+
+    def quantile(self, q: float, lower: float, upper: float) -> float | None:
+        """Estimate the q-quantile by interpolating within the containing bin."""
+        total = self.total
+        if total == 0:
+            return None
+        bounds = np.concatenate([[lower], self.edges, [upper]])
+        target = q * total
+        cumulative = np.cumsum(self.counts)
+        i = int(np.searchsorted(cumulative, target, side="left"))
+        below = cumulative[i - 1] if i > 0 else 0
+        lo, hi = bounds[i], max(bounds[i + 1], bounds[i])
+        fraction = (target - below) / self.counts[i] if self.counts[i] else 0.0
+        return float(np.clip(lo + fraction * (hi - lo), lower, upper))
+
+    def to_dict(self) -> dict:
+        return {"edges": self.edges.tolist(), "counts": self.counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HistogramSketch":
+        return cls(data["edges"], data["counts"])
+
+
+class FeatureProfile:
+    """Running statistics and a histogram sketch for each monitored feature."""
+
+    def __init__(self, stats: dict, sketches: dict):
+        self.stats = stats
+        self.sketches = sketches
+
+    @property
+    def rows(self) -> int:
+        return max((s.count for s in self.stats.values()), default=0)
+
+    @classmethod
+    def from_frame(cls, X: pd.DataFrame) -> "FeatureProfile":
+        """Build a reference profile, using the data's deciles as bin edges."""
+        stats, sketches = {}, {}
+        for feature in X.columns:
+            values = X[feature].to_numpy(dtype=float)
+            values = values[~np.isnan(values)]
+            edges = (
+                np.unique(np.quantile(values, REFERENCE_QUANTILES))
+                if len(values)
+                else []
+            )
+            stats[feature] = RunningStats()
+            sketches[feature] = HistogramSketch(edges)
+        profile = cls(stats, sketches)
+        profile.update(X)
+        return profile
+
+    def empty_like(self) -> "FeatureProfile":
+        """A profile with the same features and bin edges but no observations."""
+        return FeatureProfile(
+            {feature: RunningStats() for feature in self.stats},
+            {feature: HistogramSketch(s.edges) for feature, s in self.sketches.items()},
+        )
+
+    def update(self, X: pd.DataFrame) -> None:
+        for feature, stats in self.stats.items():
+            if feature not in X.columns:
+                continue
+            values = X[feature].to_numpy(dtype=float)
+            values = values[~np.isnan(values)]
+            stats.update_batch(values)
+            self.sketches[feature].update_batch(values)
+
+    def to_dict(self) -> dict:
+        return {
+            feature: {
+                "stats": self.stats[feature].to_dict(),
+                "sketch": self.sketches[feature].to_dict(),
+            }
+            for feature in self.stats
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FeatureProfile":
+        return cls(
+            {f: RunningStats.from_dict(d["stats"]) for f, d in data.items()},
+            {f: HistogramSketch.from_dict(d["sketch"]) for f, d in data.items()},
+        )
+
+
+def population_stability_index(
+    reference: HistogramSketch, live: HistogramSketch
+) -> float:
+    expected = np.clip(reference.proportions(), _PSI_EPSILON, None)
+    actual = np.clip(live.proportions(), _PSI_EPSILON, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+class DriftMonitor:
+    """Compares live feature rows against a training reference profile."""
+
+    def __init__(self, reference: FeatureProfile, season: str = None):
+        self.season = season
+        self.reference = reference
+        self.live = reference.empty_like()
+        self._seen: set = set()
+        self._lock = threading.Lock()
+
+    def observe(self, X: pd.DataFrame, keys=None) -> None:
+        """
+        Add live feature rows. When `keys` (e.g. match ids) are given, rows
+        whose key has already been observed are skipped, so re-running the
+        pipeline over a season does not count its fixtures twice.
+        """
+        with self._lock:
+            if keys is not None:
+                keys = list(keys)
+                new = [k not in self._seen for k in keys]
+                self._seen.update(keys)
+                X = X[new]
+            self.live.update(X)
+
+    def report(self) -> dict:
+        with self._lock:
+            features = {
+                feature: _compare(
+                    self.reference.stats[feature],
+                    self.reference.sketches[feature],
+                    self.live.stats[feature],
+                    self.live.sketches[feature],
+                )
+                for feature in self.reference.stats
+            }
+            live_rows = self.live.rows
+        return {
+            "season": self.season,
+            "reference_rows": self.reference.rows,
+            "live_rows": live_rows,
+            "drifted_features": [f for f, r in features.items() if r["drifted"]],
+            "features": features,
+        }
+
+
+def _compare(ref_stats, ref_sketch, live_stats, live_sketch) -> dict:
+    def quantiles(stats, sketch):
+        if stats.count == 0:
+            return {"p05": None, "p50": None, "p95": None}
+        return {
+            f"p{int(q * 100):02d}": sketch.quantile(q, stats.min, stats.max)
+            for q in (0.05, 0.5, 0.95)
+        }
+
+    result = {
+        "reference_mean": ref_stats.mean,
+        "reference_std": ref_stats.std,
+        "reference_quantiles": quantiles(ref_stats, ref_sketch),
+        "live_count": live_stats.count,
+        "live_mean": None,
+        "live_std": None,
+        "live_quantiles": quantiles(live_stats, live_sketch),
+        "mean_shift": None,
+        "psi": None,
+        "drifted": False,
+    }
+    if live_stats.count == 0:
+        return result
+
+    if ref_stats.std > 0:
+        mean_shift = (live_stats.mean - ref_stats.mean) / ref_stats.std
+    else:
+        mean_shift = 0.0 if live_stats.mean == ref_stats.mean else math.inf
+    psi = population_stability_index(ref_sketch, live_sketch)
+    result.update(
+        live_mean=live_stats.mean,
+        live_std=live_stats.std,
+        mean_shift=mean_shift if math.isfinite(mean_shift) else None,
+        psi=psi,
+        drifted=psi > PSI_THRESHOLD or abs(mean_shift) > MEAN_SHIFT_THRESHOLD,
+    )
+    return result
+
+
+def save_reference_profile(X: pd.DataFrame, season: str = None) -> None:
+    """Profile the training features and persist them for the season."""
+    path = season_drift_profile_path(season) if season else DRIFT_PROFILE_FILEPATH
+    profile = FeatureProfile.from_frame(X[FEATURES])
+    with open(path, "w") as f:
+        json.dump(profile.to_dict(), f)
+    with _monitors_lock:
+        _monitors.pop(season, None)
+
+
+def load_reference_profile(season: str = None) -> FeatureProfile | None:
+    """Load a season's reference profile, falling back to the default one."""
+    path = season_drift_profile_path(season) if season else DRIFT_PROFILE_FILEPATH
+    if not path.exists():
+        path = DRIFT_PROFILE_FILEPATH
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return FeatureProfile.from_dict(json.load(f))
+
+
+_monitors: dict[str | None, DriftMonitor] = {}
+_monitors_lock = threading.Lock()
+
+
+def get_drift_monitor(season: str = None) -> DriftMonitor | None:
+    """Return the process-wide monitor for a season, or None if it has no profile."""
+    monitor = _monitors.get(season)
+    if monitor is None:
+        with _monitors_lock:
+            monitor = _monitors.get(season)
+            if monitor is None:
+                reference = load_reference_profile(season)
+                if reference is None:
+                    return None
+                monitor = _monitors[season] = DriftMonitor(reference, season=season)
+    return monitor
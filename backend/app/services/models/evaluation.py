@@ -8,11 +8,10 @@ from sklearn.metrics import (
 from sklearn.model_selection import train_test_split
 
 from ...core.config import settings
-from ...core.paths import SAVED_MODELS_DIRECTORY
 from ..data_processing.data_loader import clean_data, load_training_data
 from ..models.config import FEATURES, LABELS
-from ..models.save_load import load_model, load_model_for_season, load_scaler_for_season
-from ..models.train import preprocess_data
+from ..models.preprocess import preprocess_data
+from ..models.save_load import load_model_for_season, load_scaler_for_season
 
 
 def evaluate_model_performance(y_true: pd.DataFrame, y_pred: pd.DataFrame):
@@ -146,7 +145,7 @@ def evaluate_model(season: str = None):
     training_end_year = int(season.split("-")[0]) - 1
     df = load_training_data(end_season=training_end_year)
     df = clean_data(df)
-    df = preprocess_data(df)
+    df = preprocess_data(df, season=season)
     X = df[FEATURES]
     y = df[LABELS]
     X_train, X_val, y_train, y_val = train_test_split(
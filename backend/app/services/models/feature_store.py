@@ -0,0 +1,166 @@
+"""
+feature_store.py
+
+On-disk, memory-mapped copy of the scaled training feature matrix.
+
+Each store is a directory holding
+    - X.npy:        scaled features (float64, rows sorted by date)
+    - y.npy:        labels (FTHG, FTAG)
+    - index.csv:    match_id, season and date for every row
+    - scaler.joblib the scaler used (fitted on the first 80% of rows)
+    - meta.json     feature/label names, row count, the train/validation split
+                    and the data generation of the training inputs
+
+Scripts open the arrays with mmap_mode="r", so loading is zero-copy and joblib
+workers (e.g. RandomizedSearchCV with n_jobs=-1) share the pages instead of
+each receiving a pickled copy.
+"""
+
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from ...core.paths import feature_store_path
+from ...db.generations import TRAINING_INPUT_TABLES
+from ...db.queries import get_data_generation
+from ..data_processing.data_loader import clean_data, load_training_data
+from .config import FEATURES, LABELS
+from .preprocess import check_data, preprocess_data
+
+TRAIN_FRACTION = 0.8
+INDEX_COLUMNS = ["match_id", "season", "date"]
+
+
+class FeatureMatrix:
+    """Read-only view of a feature store."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path / "meta.json") as f:
+            self.meta = json.load(f)
+        self.X = np.load(self.path / "X.npy", mmap_mode="r")
+        self.y = np.load(self.path / "y.npy", mmap_mode="r")
+        self.split_idx = self.meta["split_idx"]
+
+    @property
+    def index(self) -> pd.DataFrame:
+        return pd.read_csv(self.path / "index.csv", parse_dates=["date"])
+
+    @property
+    def scaler(self) -> StandardScaler:
+        return joblib.load(self.path / "scaler.joblib")
+
+    @property
+    def X_train(self) -> np.ndarray:
+        return self.X[: self.split_idx]
+
+    @property
+    def X_val(self) -> np.ndarray:
+        return self.X[self.split_idx :]
+
+    @property
+    def y_train(self) -> np.ndarray:
+        return self.y[: self.split_idx]
+
+    @property
+    def y_val(self) -> np.ndarray:
+        return self.y[self.split_idx :]
+
+
+def training_data_generation() -> int:
+    """
+    Data generation of everything the training features are computed from,
+    across all seasons. Read it before loading the data it describes.
+    """
+    return get_data_generation(tables=TRAINING_INPUT_TABLES)
+
+
+def prepare_training_data(season: str = None, end_year: int = None) -> pd.DataFrame:
+    """
+    Load, clean and preprocess the training data for a target season, sorted
+    chronologically. Trains on data before `season` unless `end_year` is given.
+    """
+    if season and end_year is None:
+        end_year = int(season.split("-")[0]) - 1
+    df = load_training_data(end_season=end_year)
+    df = clean_data(df)
+    df = preprocess_data(df, test_data=False, season=season)
+    df = df.sort_values("date").reset_index(drop=True)
+    check_data(df[FEATURES])
+    return df
+
+
+def save_feature_matrix(
+    df: pd.DataFrame,
+    scaler: StandardScaler,
+    split_idx: int,
+    path: Path,
+    data_generation: int,
+) -> FeatureMatrix:
+    """
+    Write the scaled features of `df` to a store at `path` and open it.
+    `data_generation` is the training_data_generation() `df` was loaded at.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    np.save(tmp / "X.npy", scaler.transform(df[FEATURES]).astype(np.float64))
+    np.save(tmp / "y.npy", df[LABELS].to_numpy(dtype=np.float64))
+    df[INDEX_COLUMNS].to_csv(tmp / "index.csv", index=False)
+    joblib.dump(scaler, tmp / "scaler.joblib")
+    with open(tmp / "meta.json", "w") as f:
+        json.dump(
+            {
+                "features": FEATURES,
+                "labels": LABELS,
+                "rows": len(df),
+                "split_idx": split_idx,
+                "data_generation": data_generation,
+                "created_at": datetime.utcnow().isoformat(),
+            },
+            f,
+            indent=2,
+        )
+
+    # Swap the finished store into place so readers never see a partial one
+    shutil.rmtree(path, ignore_errors=True)
+    tmp.rename(path)
+    return FeatureMatrix(path)
+
+
+def build_feature_matrix(season: str = None, end_year: int = None) -> FeatureMatrix:
+    """Prepare the training data for a season and write its feature store."""
+    data_generation = training_data_generation()
+    df = prepare_training_data(season, end_year)
+    split_idx = int(len(df) * TRAIN_FRACTION)
+    scaler = StandardScaler().fit(df[FEATURES].iloc[:split_idx])
+    return save_feature_matrix(
+        df, scaler, split_idx, feature_store_path(season, end_year), data_generation
+    )
+
+
+def load_feature_matrix(
+    season: str = None, end_year: int = None, rebuild: bool = False
+) -> FeatureMatrix:
+    """
+    Open the feature store for a season, building it first if it is missing,
+    was written for a different feature list or from older data, or
+    `rebuild` is set.
+    """
+    path = feature_store_path(season, end_year)
+    if not rebuild and (path / "meta.json").exists():
+        matrix = FeatureMatrix(path)
+        if (
+            matrix.meta["features"] == FEATURES
+            and matrix.meta["labels"] == LABELS
+            and matrix.meta.get("data_generation") == training_data_generation()
+        ):
+            return matrix
+    return build_feature_matrix(season, end_year)
@@ -7,22 +7,35 @@ from datetime import datetime, timedelta
 
 import numpy as np
 import pandas as pd
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from ...core.config import settings
 from ...core.paths import (
     SAVED_MODELS_DIRECTORY,
 )
-from ...db.database import get_session
-from ...db.models import PredictionsCache
+from ...db.bulk import upsert_rows
+from ...db.database import read_session
+from ...db.generations import PREDICTION_INPUT_TABLES, bump_generations, generation_of
+from ...db.models import Match, PredictionsCache
+from ...db.queries import get_data_generation
+from ...db.query_stats import track_queries
+from ...db.writer import run_write_and_publish
 from ..data_processing.data_loader import (
     clean_data,
     get_this_seasons_fixtures_data,
     load_training_data,
 )
 from .config import FEATURES
+from .drift import get_drift_monitor
 from .preprocess import check_data, preprocess_data
-from .save_load import load_model, load_model_for_season, load_scaler, load_scaler_for_season
+from .save_load import (
+    load_model,
+    load_model_for_season,
+    load_scaler,
+    load_scaler_for_season,
+    model_version_for_season,
+)
 
 
 def assign_predictions(input_data: pd.DataFrame, future_scores) -> pd.DataFrame:
@@ -34,27 +47,49 @@ def assign_predictions(input_data: pd.DataFrame, future_scores) -> pd.DataFrame:
     return input_data
 
 
-def check_cache(match_ids: list, cache_duration_hours: float, db: Session) -> bool:
+def check_cache(
+    match_ids: list,
+    cache_duration_hours: float,
+    db: Session,
+    model_version: str = None,
+) -> bool:
     """
-    Check if all match_ids have valid cache entries.
+    Check if all match_ids have valid cache entries. An entry is valid while
+    the matches and shooting stats of its season and every earlier season
+    (the history its features are built from) are at the data generation it
+    was computed from, and while it was made by the current model.
 
     Args:
         match_ids: List of match IDs to check.
-        cache_duration_hours: Cache validity in hours.
+        cache_duration_hours: Optional age limit in hours on top of the
+            generation check; None trusts an entry until the data changes.
         db: SQLAlchemy session.
+        model_version: model_version_for_season() of the model that would
+            make the predictions now; None skips the check.
 
     Returns:
         True if all are cached and valid, else False.
     """
-    cached_count = (
-        db.query(PredictionsCache)
-        .filter(
+    current = generation_of(
+        Match.season, PREDICTION_INPUT_TABLES, include_earlier=True
+    ).scalar_subquery()
+    stmt = (
+        select(func.count())
+        .select_from(PredictionsCache)
+        .join(Match, Match.match_id == PredictionsCache.match_id)
+        .where(
             PredictionsCache.match_id.in_(match_ids),
-            PredictionsCache.timestamp
-            >= datetime.utcnow() - timedelta(hours=cache_duration_hours),
+            PredictionsCache.data_generation == current,
         )
-        .count()
     )
+    if model_version is not None:
+        stmt = stmt.where(PredictionsCache.model_version == model_version)
+    if cache_duration_hours is not None:
+        stmt = stmt.where(
+            PredictionsCache.timestamp
+            >= datetime.utcnow() - timedelta(hours=cache_duration_hours)
+        )
+    cached_count = db.scalar(stmt)
     is_all_cached = cached_count == len(match_ids)
     # logger.info(f"All cached: {is_all_cached} ({cached_count}/{len(match_ids)})")
     return is_all_cached
@@ -80,39 +115,70 @@ def get_cached_predictions(match_ids: list, db: Session) -> list:
     return [cached_dict[mid] for mid in match_ids]
 
 
-def update_cache(predictions_df: pd.DataFrame, db: Session, logger: logging.Logger):
+def _write_cache(session: Session, rows: list[dict]) -> None:
+    upsert_rows(
+        session,
+        PredictionsCache.__table__,
+        rows,
+        key_columns=["match_id"],
+        update_columns=[
+            "pred_fthg",
+            "pred_ftag",
+            "pred_score",
+            "pred_result",
+            "timestamp",
+            "data_generation",
+            "model_version",
+        ],
+        keep_existing_when_null=False,
+    )
+    match_ids = [r["match_id"] for r in rows]
+    seasons = session.scalars(
+        select(Match.season).distinct().where(Match.match_id.in_(match_ids))
+    )
+    bump_generations(session, [(season, "predictions_cache") for season in seasons])
+
+
+def update_cache(
+    predictions_df: pd.DataFrame,
+    logger: logging.Logger,
+    data_generation: int = None,
+    model_version: str = None,
+):
     """
     Cache predictions for given match IDs (update or insert).
 
+    All rows are written with one INSERT ... ON CONFLICT (match_id) through
+    the database writer.
+
     Args:
-        predictions_df: DataFrame with match_id, PredFTHG, PredFTAG.
-        db: SQLAlchemy session.
+        predictions_df: DataFrame with match_id, PredFTHG, PredFTAG, PredScore
+            and PredResult.
+        data_generation: Generation of PREDICTION_INPUT_TABLES up to the
+            season, read before the input data was loaded. Entries without
+            one are treated as stale by check_cache.
+        model_version: model_version_for_season() of the model used.
     """
-    for _, row in predictions_df.iterrows():
-        cache_entry = (
-            db.query(PredictionsCache)
-            .filter(PredictionsCache.match_id == row["match_id"])
-            .first()
-        )
-        if cache_entry:
-            cache_entry.pred_fthg = row["PredFTHG"]
-            cache_entry.pred_ftag = row["PredFTAG"]
-            cache_entry.pred_score = row["PredScore"]
-            cache_entry.pred_result = row["PredResult"]
-            cache_entry.timestamp = datetime.utcnow()
-        else:
-            cache_entry = PredictionsCache(
-                match_id=row["match_id"],
-                pred_fthg=row["PredFTHG"],
-                pred_ftag=row["PredFTAG"],
-                pred_score=row["PredScore"],
-                pred_result=row["PredResult"],
-            )
-            db.add(cache_entry)
-    db.commit()
+    timestamp = datetime.utcnow()
+    rows = [
+        {
+            "match_id": int(row["match_id"]),
+            "pred_fthg": int(row["PredFTHG"]),
+            "pred_ftag": int(row["PredFTAG"]),
+            "pred_score": row["PredScore"],
+            "pred_result": row["PredResult"],
+            "timestamp": timestamp,
+            "data_generation": data_generation,
+            "model_version": model_version,
+        }
+        for row in predictions_df.to_dict("records")
+    ]
+    # Published before returning, so the caller's next read sees the cache
+    run_write_and_publish(_write_cache, rows)
     logger.info(f"Cached/Updated {len(predictions_df)} predictions")
 
 
+@track_queries("predict_pipeline")
 def predict_pipeline(
     fixtures_df: pd.DataFrame,
     cache_duration_hours: int,
@@ -124,7 +190,8 @@ def predict_pipeline(
 
     Args:
         fixtures_df: DataFrame of fixture rows sent from the endpoint.
-        cache_duration_hours: How long to trust cached predictions.
+        cache_duration_hours: Optional age limit on cached predictions; None
+            trusts them until the season's data changes.
         logger: Logger instance.
         season: Season string e.g. "2024-2025". Defaults to CURRENT_SEASON.
 
@@ -141,15 +208,23 @@ def predict_pipeline(
 
     match_ids = fixtures_df["match_id"].tolist()
 
-    with get_session() as db:
+    with read_session() as db:
+        # Read before loading anything, so a write landing mid-run leaves
+        # the cached predictions stale rather than wrongly fresh
+        data_generation = get_data_generation(
+            season, PREDICTION_INPUT_TABLES, session=db, include_earlier=True
+        )
+        model_version = model_version_for_season(season)
+
         # Load season fixtures (needed for both cache and full pipeline paths)
-        fixtures_raw = get_this_seasons_fixtures_data(season=season)
+        with track_queries("predict_pipeline: load fixtures"):
+            fixtures_raw = get_this_seasons_fixtures_data(season=season)
         fthg_ftag = fixtures_raw[["match_id", "FTHG", "FTAG"]].copy()
         fixtures_df = clean_data(
             fixtures_raw.drop(columns=["FTHG", "FTAG"], errors="ignore")
         )
 
-        if check_cache(match_ids, cache_duration_hours, db):
+        if check_cache(match_ids, cache_duration_hours, db, model_version):
             logger.info("Returning all cached predictions")
             predictions = get_cached_predictions(match_ids, db)
             result_df = fixtures_df.copy()
@@ -159,12 +234,13 @@ def predict_pipeline(
             return result_df
 
         # Load historical data for Elo and other features
-        historical_df = load_training_data(end_season=training_end_year)
+        with track_queries("predict_pipeline: load training data"):
+            historical_df = load_training_data(end_season=training_end_year)
         historical_df = clean_data(historical_df)
 
         # Combine historical and new season data for consistent Elo calculation
         combined_df = pd.concat([historical_df, fixtures_df], ignore_index=True)
-        combined_df = preprocess_data(combined_df, test_data=True)
+        combined_df = preprocess_data(combined_df, test_data=True, season=season)
 
         # Split back into historical and new season data
         new_season_df = combined_df.iloc[len(historical_df) :].copy()
@@ -173,6 +249,11 @@ def predict_pipeline(
         X = new_season_df[FEATURES]
         check_data(X)
 
+        # Feed the live rows to the drift monitor (cheap running updates)
+        monitor = get_drift_monitor(season)
+        if monitor is not None:
+            monitor.observe(X, keys=new_season_df["match_id"])
+
         # Scaling features
         scaler = load_scaler_for_season(season)
         X_scaled = scaler.transform(X)
@@ -187,13 +268,15 @@ def predict_pipeline(
         new_season_df = assign_predictions(new_season_df, future_scores)
 
         # Update cache for all
-        update_cache(
-            new_season_df[
-                ["match_id", "PredFTHG", "PredFTAG", "PredScore", "PredResult"]
-            ],
-            db,
-            logger,
-        )
+        with track_queries("predict_pipeline: update cache"):
+            update_cache(
+                new_season_df[
+                    ["match_id", "PredFTHG", "PredFTAG", "PredScore", "PredResult"]
+                ],
+                logger,
+                data_generation,
+                model_version,
+            )
 
     # Return results
     result_df = fixtures_df.copy()
@@ -1,10 +1,6 @@
 import pandas as pd
 
-from ...core.paths import (
-    TEAM_ENCODER_FILEPATH,
-    VENUE_ENCODER_FILEPATH,
-)
-from ...db.queries import get_all_venues, get_teams_names
+from ...db.queries import get_all_venues
 from ..data_processing.feature_encoding import (
     encode_day_of_week,
     encode_season_column,
@@ -12,8 +8,6 @@ from ..data_processing.feature_encoding import (
     encode_venue_name_feature,
     fit_team_name_encoder,
     fit_venue_encoder,
-    load_encoder_file,
-    save_encoder_to_file,
 )
 from ..data_processing.feature_engineering import (
     add_cumulative_season_points,
@@ -27,46 +21,55 @@ from ..data_processing.feature_engineering import (
     add_xg_rolling_stats,
     calculate_match_points,
 )
+from ..data_processing.team_registry import add_team_codes, get_team_registry
+from .save_load import load_vocabularies_for_season, save_vocabularies_for_season
 
 
-def preprocess_data(df: pd.DataFrame, test_data: bool = True) -> pd.DataFrame:
+def preprocess_data(
+    df: pd.DataFrame, test_data: bool = True, season: str = None
+) -> pd.DataFrame:
     """
     Preprocesses the data for model input
     Args:
         df (pd.DataFrame): Input data to be preprocessed
+        test_data (bool): Encode with the saved vocabularies instead of fitting new ones
+        season (str): Season whose vocabulary artifact is loaded or saved
     Returns:
        X (pd.DataFrame): Preprocessed data
     """
-    teams = get_teams_names()
+    registry = get_team_registry()
+    teams = registry.loaded_names
 
     ###### Encoding ####################
     # Encode categorical features
     if test_data:
-        # Load encoders
-        team_encoder = load_encoder_file(TEAM_ENCODER_FILEPATH)
-        venue_encoder = load_encoder_file(VENUE_ENCODER_FILEPATH)
+        # Load the season's vocabularies (read from disk once per process)
+        team_encoder, venue_encoder = load_vocabularies_for_season(season)
     else:
         # Fit encoders on all teams/venues ever seen in the DB so that promoted
         # sides are never unseen when encoding a future season's fixture list.
         team_encoder = fit_team_name_encoder(df, all_known_teams=teams)
         venue_encoder = fit_venue_encoder(df, all_known_venues=get_all_venues())
-        save_encoder_to_file(team_encoder, filepath=TEAM_ENCODER_FILEPATH)
-        save_encoder_to_file(venue_encoder, filepath=VENUE_ENCODER_FILEPATH)
+        save_vocabularies_for_season(team_encoder, venue_encoder, season=season)
 
     df = encode_team_name_features(df, encoder=team_encoder)
     df = encode_venue_name_feature(df, encoder=venue_encoder)
 
+    # Team names are only needed again at the output edge; every feature
+    # stage below works on the interned integer codes.
+    df = add_team_codes(df, registry)
+
     # Feature engineering
     df = encode_day_of_week(df)
     df = encode_season_column(df)
     df = add_hour_feature(df)
-    df = add_rolling_shooting_stats(df, teams)
+    df = add_rolling_shooting_stats(df, registry)
     df = calculate_match_points(df)
     df = add_cumulative_season_points(df)
-    df = add_ppg_features(df, teams)
-    df = add_previous_season_standing(df)
+    df = add_ppg_features(df)
+    df = add_previous_season_standing(df, registry)
     df = add_days_rest(df)
-    df = add_xg_rolling_stats(df, teams)
+    df = add_xg_rolling_stats(df, registry)
     df = add_elo_ratings(df)
     df = add_h2h_features(df)
 
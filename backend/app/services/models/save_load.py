@@ -1,10 +1,23 @@
 import json
 import pickle
+from functools import lru_cache
 
 import joblib
 from sklearn.preprocessing import StandardScaler
 
-from ...core.paths import SAVED_MODELS_DIRECTORY, artifacts_dir, season_model_path, season_scaler_path
+from ...core.paths import (
+    SAVED_MODELS_DIRECTORY,
+    VOCABULARY_FILEPATH,
+    artifacts_dir,
+    season_model_path,
+    season_scaler_path,
+    season_vocabulary_path,
+)
+from ..data_processing.feature_encoding import (
+    Vocabulary,
+    load_vocabularies,
+    save_vocabularies,
+)
 
 SCALER_FILEPATH = artifacts_dir / "scaler.pkl"
 
@@ -65,6 +78,49 @@ def load_scaler_for_season(season: str) -> StandardScaler:
     return joblib.load(SCALER_FILEPATH)
 
 
+def model_version_for_season(season: str) -> str:
+    """
+    Identify the model and scaler that load_model_for_season and
+    load_scaler_for_season would use, by file name and modification time.
+    Retraining rewrites the files, so the version changes with them.
+    """
+    model_path = season_model_path(season)
+    if not model_path.exists():
+        model_path = SAVED_MODELS_DIRECTORY / "best_model.joblib"
+    scaler_path = season_scaler_path(season)
+    if not scaler_path.exists():
+        scaler_path = SCALER_FILEPATH
+    return ";".join(
+        f"{path.name}@{path.stat().st_mtime_ns if path.exists() else 0}"
+        for path in (model_path, scaler_path)
+    )
+
+
+@lru_cache(maxsize=None)
+def load_vocabularies_for_season(season: str = None) -> tuple[Vocabulary, Vocabulary]:
+    """
+    Load the (teams, venues) vocabularies for a season, falling back to the
+    default artifact. Cached so each process reads the file at most once;
+    `save_vocabularies_for_season` clears the cache, but a process that did
+    not do the retraining keeps its cached copy until it is restarted.
+    """
+    if season:
+        path = season_vocabulary_path(season)
+        if path.exists():
+            return load_vocabularies(path)
+    return load_vocabularies(VOCABULARY_FILEPATH)
+
+
+def save_vocabularies_for_season(
+    teams: Vocabulary, venues: Vocabulary, season: str = None
+) -> None:
+    """Persist vocabularies for a season (or the default artifact if no season)."""
+    path = season_vocabulary_path(season) if season else VOCABULARY_FILEPATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    save_vocabularies(path, teams, venues, version=season or "default")
+    load_vocabularies_for_season.cache_clear()
+
+
 def select_and_save_best_model(losses, models_trained, save_path="best_model"):
     """
     Select the best model based on validation MSE and save it along with metadata.
@@ -3,15 +3,16 @@ summary.py
 
 Compute and cache season-level summary statistics (superbru points,
 model performance) so they don't need to be recalculated on every request.
+Cached summaries are keyed on the season's data generation.
 """
 
 import json
 from datetime import datetime
 
-import pandas as pd
-
 from ...core.paths import SEASON_SUMMARIES_CACHE
-from ...db.queries import get_season_with_predictions
+from ...db.generations import SUMMARY_INPUT_TABLES
+from ...db.queries import get_data_generation
+from ..data_processing.data_loader import load_season_with_predictions
 from ..utils.superbru_points_calculator import get_superbru_points
 from .evaluation import evaluate_model_performance
 from .save_load import load_model_for_season
@@ -44,12 +45,10 @@ def _save_cache(cache: dict) -> None:
 
 def compute_season_summary(season: str) -> dict:
     """Compute superbru points and model performance for a full season."""
-    rows = get_season_with_predictions(season)
-    if not rows:
+    df = load_season_with_predictions(season)
+    if df.empty:
         return {}
 
-    df = pd.DataFrame(rows)
-
     # Model performance — only on played matches
     played = df.dropna(subset=["FTHG", "FTAG", "PredFTHG", "PredFTAG"])
     if played.empty:
@@ -83,33 +82,36 @@ def compute_season_summary(season: str) -> dict:
     }
 
 
-def get_or_compute_summary(season: str, current_season: str, force: bool = False) -> dict:
+def _store_summary(season: str, summary: dict, data_generation: int) -> None:
+    summary["data_generation"] = data_generation
+    cache = _load_cache()
+    cache[season] = summary
+    _save_cache(cache)
+
+
+def get_or_compute_summary(season: str, force: bool = False) -> dict:
     """
-    Return cached summary for finished seasons (never expires).
-    For the current season recomputes every time (live data).
+    Return the cached summary while the season's matches and predictions
+    are at the data generation it was computed from; recompute otherwise.
+    Finished seasons therefore never recompute, and the current season only
+    does after new results or predictions are written.
     """
-    is_finished = season != current_season
-
-    if is_finished and not force:
-        cache = _load_cache()
-        if season in cache:
-            return cache[season]
+    data_generation = get_data_generation(season, SUMMARY_INPUT_TABLES)
+    if not force:
+        cached = _load_cache().get(season)
+        if cached and cached.get("data_generation") == data_generation:
+            return cached
 
     summary = compute_season_summary(season)
-
-    if is_finished and summary:
-        cache = _load_cache()
-        cache[season] = summary
-        _save_cache(cache)
-
+    if summary:
+        _store_summary(season, summary, data_generation)
     return summary
 
 
 def save_summary_for_season(season: str) -> dict:
     """Called from the training pipeline to pre-compute and persist the summary."""
+    data_generation = get_data_generation(season, SUMMARY_INPUT_TABLES)
     summary = compute_season_summary(season)
     if summary:
-        cache = _load_cache()
-        cache[season] = summary
-        _save_cache(cache)
+        _store_summary(season, summary, data_generation)
     return summary
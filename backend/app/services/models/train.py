@@ -26,14 +26,23 @@ from sklearn.preprocessing import StandardScaler
 from ...core.config import settings
 from ...core.paths import (
     SAVED_MODELS_DIRECTORY,
+    feature_store_path,
 )
-from ..data_processing.data_loader import clean_data, load_training_data
+from ...db.query_stats import track_queries
+from ..data_processing.data_loader import load_training_data
 from ..models.config import FEATURES, LABELS
+from ..models.drift import save_reference_profile
+from ..models.feature_store import (
+    TRAIN_FRACTION,
+    prepare_training_data,
+    save_feature_matrix,
+    training_data_generation,
+)
 from ..models.save_load import save_model, save_model_for_season, save_scaler, save_scaler_for_season
 from ..models.wrapper import GoalPredictor
-from .preprocess import check_data, preprocess_data
 
 
+@track_queries("train_pipeline")
 def train_pipeline(season: str = None):
     """
     Train a model for the given season.
@@ -47,28 +56,23 @@ def train_pipeline(season: str = None):
         season: Target season string e.g. "2024-2025". Trains on data up to
                 but not including this season.
     """
-    if season:
-        # e.g. "2024-2025" → train on 2014-2023
-        end_year = int(season.split("-")[0]) - 1
-    else:
-        end_year = None  # use config default
-
     # Load data
-    df = load_training_data(end_season=end_year)
-    df = clean_data(df)
-    df = preprocess_data(df, test_data=False)
-    df = df.sort_values("date").reset_index(drop=True)
+    with track_queries("train_pipeline: load training data"):
+        data_generation = training_data_generation()
+        df = prepare_training_data(season)
     X = df[FEATURES]
     y = df[LABELS]
-    check_data(X)
 
-    split_idx = int(len(df) * 0.8)
-    X_train, X_val = X.iloc[:split_idx], X.iloc[split_idx:]
-    y_train, y_val = y.iloc[:split_idx], y.iloc[split_idx:]
+    split_idx = int(len(df) * TRAIN_FRACTION)
+    X_train = X.iloc[:split_idx]
+    y_train = y.iloc[:split_idx]
     # Scaling features
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
 
+    # Share the scaled matrix with the compare/tune scripts
+    save_feature_matrix(df, scaler, split_idx, feature_store_path(season), data_generation)
+
     # Train model — swap the estimator here to change the model type
     model = GoalPredictor(LinearRegression())
     model.fit(X_train_scaled, y_train)
@@ -77,26 +81,34 @@ def train_pipeline(season: str = None):
     if season:
         save_model_for_season(model, season)
         save_scaler_for_season(scaler, season)
+        save_reference_profile(X_train, season)
 
         # Run predictions on the test season and cache them, then save summary
-        _cache_predictions_and_summary(season, scaler, model)
+        with track_queries("train_pipeline: cache predictions"):
+            _cache_predictions_and_summary(season, scaler, model)
     else:
         save_model(model, "best_model.joblib", SAVED_MODELS_DIRECTORY)
         save_scaler(scaler)
+        save_reference_profile(X_train)
 
 
 def _cache_predictions_and_summary(season: str, scaler, model) -> None:
     """After training, generate predictions for the test season and persist summary."""
     import logging
 
+    from ...db.generations import PREDICTION_INPUT_TABLES
+    from ...db.queries import get_data_generation
     from ..data_processing.data_loader import clean_data, get_this_seasons_fixtures_data
     from ..models.config import FEATURES
     from ..models.predict import assign_predictions, update_cache
+    from ..models.save_load import model_version_for_season
     from ..models.summary import save_summary_for_season
-    from ...db.database import get_session
 
     logger = logging.getLogger(__name__)
     training_end_year = int(season.split("-")[0]) - 1
+    data_generation = get_data_generation(
+        season, PREDICTION_INPUT_TABLES, include_earlier=True
+    )
 
     fixtures_raw = get_this_seasons_fixtures_data(season=season)
     if fixtures_raw.empty:
@@ -111,7 +123,7 @@ def _cache_predictions_and_summary(season: str, scaler, model) -> None:
     from .preprocess import check_data, preprocess_data
 
     combined_df = __import__("pandas").concat([historical_df, fixtures_df], ignore_index=True)
-    combined_df = preprocess_data(combined_df, test_data=True)
+    combined_df = preprocess_data(combined_df, test_data=True, season=season)
     new_season_df = combined_df.iloc[len(historical_df):].copy()
 
     X = new_season_df[FEATURES]
@@ -122,12 +134,12 @@ def _cache_predictions_and_summary(season: str, scaler, model) -> None:
 
     new_season_df = assign_predictions(new_season_df, future_scores)
 
-    with get_session() as db:
-        update_cache(
-            new_season_df[["match_id", "PredFTHG", "PredFTAG", "PredScore", "PredResult"]],
-            db,
-            logger,
-        )
+    update_cache(
+        new_season_df[["match_id", "PredFTHG", "PredFTAG", "PredScore", "PredResult"]],
+        logger,
+        data_generation,
+        model_version_for_season(season),
+    )
 
     save_summary_for_season(season)
     logger.info(f"Predictions cached and summary saved for season {season}")
@@ -20,8 +20,9 @@ class GoalPredictor:
         if self.away_model is None:
             self.home_model.fit(X, y)
         else:
-            self.home_model.fit(X, y.iloc[:, 0])
-            self.away_model.fit(X, y.iloc[:, 1])
+            y = np.asarray(y)
+            self.home_model.fit(X, y[:, 0])
+            self.away_model.fit(X, y[:, 1])
         return self
 
     def predict(self, X) -> np.ndarray:
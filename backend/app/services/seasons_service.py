@@ -7,10 +7,14 @@ Business logic for season and matchweek data retrieval, isolated from the endpoi
 import logging
 
 import pandas as pd
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from ..core.config import settings
-from ..db.database import get_session
-from ..db.queries import get_matchweek_with_predictions, get_season_match_ids
+from ..db.async_database import run_query
+from ..db.database import read_session
+from ..db.queries import get_matchweek_frame, get_season_match_ids
 from ..services.data_processing.data_loader import get_this_seasons_fixtures_data
 from ..services.models.predict import check_cache, predict_pipeline
 from ..services.utils.superbru_points_calculator import get_superbru_points
@@ -27,7 +31,7 @@ COLUMN_MAPPING = {
     "result": "Result",
     "PredScore": "PredScore",
     "PredResult": "PredResult",
-    "venue": "Venue",
+    "venue_display": "Venue",
     "week": "week",
     "FTHG": "FTHG",
     "FTAG": "FTAG",
@@ -35,40 +39,61 @@ COLUMN_MAPPING = {
     "PredFTAG": "PredFTAG",
 }
 
-VENUE_ALIASES = {
-    "The American Express Community Stadium": "The AMEX",
-}
-
 
-def ensure_predictions_cached(season: str) -> None:
+def ensure_predictions_cached(season: str, db: Session) -> None:
     """Run the full predict pipeline for the current season if predictions aren't cached yet."""
-    match_ids = get_season_match_ids(season)
+    match_ids = get_season_match_ids(season, session=db)
     if not match_ids:
         return
-    with get_session() as db:
-        if not check_cache(match_ids, cache_duration_hours=24, db=db):
-            logger.info("Prediction cache stale for %s — running pipeline", season)
-            fixtures_df = get_this_seasons_fixtures_data(season=season)
-            predict_pipeline(
-                fixtures_df, cache_duration_hours=24, logger=logger, season=season
-            )
+    if not check_cache(match_ids, cache_duration_hours=None, db=db):
+        logger.info("Prediction cache stale for %s — running pipeline", season)
+        fixtures_df = get_this_seasons_fixtures_data(season=season, session=db)
+        predict_pipeline(
+            fixtures_df, cache_duration_hours=None, logger=logger, season=season
+        )
+        # End the read transaction so the rows below include the new predictions
+        db.rollback()
 
 
-def get_matchweek(season: str, week: int) -> dict:
+def get_matchweek(season: str, week: int, db: Session = None) -> dict:
     """
     Return sanitised match rows and superbru points for a single matchweek.
 
     For finished seasons predictions are read directly from the DB.
     For the current season the prediction pipeline is triggered if needed.
+
+    Args:
+        season: Season string e.g. "2024-2025".
+        week: Matchweek number.
+        db: Session to read through; the endpoint passes its request-scoped
+            one so the whole request uses a single connection.
     """
+    if db is None:
+        with read_session() as db:
+            return get_matchweek(season, week, db)
+
     if season == settings.CURRENT_SEASON:
-        ensure_predictions_cached(season)
+        ensure_predictions_cached(season, db)
+
+    return format_matchweek(get_matchweek_frame(season=season, week=week, session=db))
 
-    rows = get_matchweek_with_predictions(season=season, week=week)
-    if not rows:
-        return None
 
-    df = pd.DataFrame(rows)
+async def get_matchweek_async(season: str, week: int, db: AsyncSession) -> dict:
+    """
+    Async get_matchweek() for async endpoints. Finished seasons are read on
+    the event loop; the current season may run the prediction pipeline, so
+    it goes to the threadpool with a sync session of its own.
+    """
+    if season == settings.CURRENT_SEASON:
+        return await run_in_threadpool(get_matchweek, season, week)
+    df = await run_query(db, get_matchweek_frame, season=season, week=week)
+    return format_matchweek(df)
+
+
+def format_matchweek(df: pd.DataFrame) -> dict:
+    """Matchweek frame as the response: display columns plus superbru points."""
+    if df.empty:
+        return None
 
     try:
         points_df = df.rename(columns={"result": "Result"})
@@ -82,8 +107,6 @@ def get_matchweek(season: str, week: int) -> dict:
         if col in df.columns:
             df[col] = df[col].astype(str)
     df["Score"] = df["Score"].replace("None-None", "")
-    for long, short in VENUE_ALIASES.items():
-        df["Venue"] = df["Venue"].replace(long, short)
 
     df = df.replace([float("inf"), float("-inf")], None)
     df = df.fillna("")
@@ -9,7 +9,12 @@ from datetime import datetime, timedelta
 
 from ..core.config import settings
 from ..core.paths import SUPERBRU_LEADERBOARD_CACHE as CACHE_PATH
+from ..db.queries import get_data_generation
 
+# The leaderboard is scraped from Superbru, not computed from our data, so
+# new results only make a refresh worthwhile: it is scraped at most once per
+# MIN_REFRESH_INTERVAL, and at least once per CACHE_TTL regardless.
+MIN_REFRESH_INTERVAL = timedelta(hours=12)
 CACHE_TTL = timedelta(days=90)
 
 _CURRENT_KEYS = {"global_top", "global_top_10_pct", "uk_top_10_pct"}
@@ -19,19 +24,23 @@ def get_leaderboard(season: str) -> dict:
     """
     Return cached leaderboard points for a season.
 
-    Finished seasons are cached permanently. The current season is
-    refreshed after CACHE_TTL expires.
+    Finished seasons are cached permanently (the scraper only sees the live
+    leaderboard). The current season is refreshed once new results have
+    been written, i.e. when the generation of its matches moves, but no more
+    often than MIN_REFRESH_INTERVAL; CACHE_TTL bounds its age otherwise.
 
     Returns:
         dict with keys: global_top, global_top_10_pct, uk_top_10_pct
     """
     cache = _load_cache()
     entry = cache.get(season)
+    data_generation = get_data_generation(season, ["matches"])
 
     if entry and _CURRENT_KEYS.issubset(entry):
         is_finished = season != settings.CURRENT_SEASON
-        ts = datetime.fromisoformat(entry["timestamp"])
-        if is_finished or datetime.now() - ts < CACHE_TTL:
+        age = datetime.now() - datetime.fromisoformat(entry["timestamp"])
+        unchanged = entry.get("data_generation") == data_generation
+        if is_finished or age < MIN_REFRESH_INTERVAL or (unchanged and age < CACHE_TTL):
             return {k: entry[k] for k in _CURRENT_KEYS}
 
     from .web_scraping.superbru.leaderboard_scraper import get_top_points
@@ -39,6 +48,7 @@ def get_leaderboard(season: str) -> dict:
 
     cache[season] = {
         "timestamp": datetime.now().isoformat(),
+        "data_generation": data_generation,
         "global_top": global_top,
         "global_top_10_pct": global_top_10_pct,
         "uk_top_10_pct": uk_top_10_pct,
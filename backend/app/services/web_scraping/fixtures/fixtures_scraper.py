@@ -11,6 +11,7 @@ import requests
 
 from ....core.config import settings
 from ....db.updaters.fixtures import upsert_fixtures
+from ....db.writer import publish_writes
 
 FOOTBALL_DATA_BASE_URL = settings.FOOTBALL_DATA_BASE_URL
 CURRENT_SEASON = settings.CURRENT_SEASON
@@ -43,6 +44,7 @@ def scrape_and_save_fixtures(season: str = None) -> None:
         0
     ]
     upsert_fixtures(df, season=season)
+    publish_writes()
     print("Fixtures data fetched and saved to database")
 
 
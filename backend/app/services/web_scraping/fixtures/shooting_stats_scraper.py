@@ -13,6 +13,7 @@ import requests
 from ....core.config import settings
 from ....db.loaders.shooting_stats import add_shooting_stats
 from ....db.queries import get_teams_by_season
+from ....db.writer import publish_writes
 
 FOOTBALL_DATA_BASE_URL = settings.FOOTBALL_DATA_BASE_URL
 CURRENT_SEASON = settings.CURRENT_SEASON
@@ -81,4 +82,6 @@ def scrape_and_save_shooting_stats(seasons: list[str]) -> None:
         if counter == 3:
             time.sleep(10)
         counter += 1
+    # One snapshot for the whole run, not one per team
+    publish_writes()
     print("Scraping completed")
@@ -5,6 +5,8 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 
 from ....core.config import settings
+from ....db.teams import resolve_team_ids
+from ....db.writer import run_write
 from .login import login_to_superbru
 from .popups import close_pop_up
 
@@ -12,12 +14,25 @@ from .popups import close_pop_up
 # h - home team, a - away team
 
 
-def check_team_names_match(input_team: str, team_name: str, team_fullname: str):
-    special_mappings = {
-        "Manchester Utd": "Man. United",
-        "Manchester City": "Man. City",
+def resolve_fixture_keys(
+    site_fixtures: list[tuple[str, str]], predictions: list[dict]
+) -> tuple[list[tuple], dict[tuple, dict]]:
+    """
+    Key the site's fixtures and our predictions by (home_team_id,
+    away_team_id), resolving every team name through the shared alias index
+    in one pass. New spellings are persisted as aliases, so the lookup goes
+    through the writer thread.
+    """
+    names = {name for fixture in site_fixtures for name in fixture}
+    names.update(p[side] for p in predictions for side in ("home_team", "away_team"))
+    team_ids = run_write(lambda session: resolve_team_ids(session, names))
+
+    site_keys = [(team_ids.get(h), team_ids.get(a)) for h, a in site_fixtures]
+    predictions_by_key = {
+        (team_ids.get(p["home_team"]), team_ids.get(p["away_team"])): p
+        for p in predictions
     }
-    return input_team in [team_name, team_fullname, special_mappings.get(team_name)]
+    return site_keys, predictions_by_key
 
 
 def save_predictions(driver: webdriver) -> None:
@@ -44,36 +59,36 @@ def find_and_input_predictions(driver: webdriver, predictions: list[dict]) -> No
     """
     This function finds and inputs the predictions on the SuperBru website.
     """
-    for pred in predictions:
-        PredFTHG = pred["PredFTHG"]
-        PredFTAG = pred["PredFTAG"]
-
-        driver.execute_script("window.stop();")  # Prevent popups
-        home_team_goal_inputs = driver.find_elements(
-            By.XPATH, "//input[@class='editable-dropdown soccer-left-score']"
+    driver.execute_script("window.stop();")  # Prevent popups
+    home_team_goal_inputs = driver.find_elements(
+        By.XPATH, "//input[@class='editable-dropdown soccer-left-score']"
+    )
+    away_team_goal_inputs = driver.find_elements(
+        By.XPATH, "//input[@class='editable-dropdown soccer-right-score']"
+    )
+    inputs = list(zip(home_team_goal_inputs, away_team_goal_inputs, strict=False))
+    site_fixtures = [
+        (
+            h_element.get_attribute("data-bru-team-name"),
+            a_element.get_attribute("data-bru-team-name"),
         )
-        away_team_goal_inputs = driver.find_elements(
-            By.XPATH, "//input[@class='editable-dropdown soccer-right-score']"
+        for h_element, a_element in inputs
+    ]
+    site_keys, predictions_by_key = resolve_fixture_keys(site_fixtures, predictions)
+
+    for (h_element, a_element), (h_team_name, a_team_name), key in zip(
+        inputs, site_fixtures, site_keys, strict=True
+    ):
+        pred = predictions_by_key.get(key)
+        if pred is None or None in key:
+            continue
+        print(
+            f"Submitting prediction for {h_team_name} vs {a_team_name}: {pred['PredFTHG']}-{pred['PredFTAG']}"
         )
-
-        for h_element, a_element in zip(
-            home_team_goal_inputs, away_team_goal_inputs, strict=False
-        ):
-            h_team_name = h_element.get_attribute("data-bru-team-name")
-            a_team_name = a_element.get_attribute("data-bru-team-name")
-            if check_team_names_match(
-                h_team_name, pred["home_team"], pred["home_team_fullname"]
-            ) and check_team_names_match(
-                a_team_name, pred["away_team"], pred["away_team_fullname"]
-            ):
-                print(
-                    f"Submitting prediction for {h_team_name} vs {a_team_name}: {pred['PredFTHG']}-{pred['PredFTAG']}"
-                )
-                h_element.clear()
-                h_element.send_keys(str(PredFTHG))
-                a_element.clear()
-                a_element.send_keys(str(PredFTAG))
-                break
+        h_element.clear()
+        h_element.send_keys(str(pred["PredFTHG"]))
+        a_element.clear()
+        a_element.send_keys(str(pred["PredFTAG"]))
 
 
 def submit_to_superbru(predictions: list[dict], week: int):
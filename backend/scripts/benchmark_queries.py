@@ -0,0 +1,229 @@
+"""
+Benchmark the hot DB read paths with and without the secondary indexes and
+SQLite connection pragmas.
+
+Builds a synthetic database (seasons x 380 matches, two shooting stat rows
+and one cached prediction per match) in a temporary directory, then times
+each query function from app.db.queries / the prediction cache against it.
+
+Run from the backend directory:
+    uv run python scripts/benchmark_queries.py
+    uv run python scripts/benchmark_queries.py --seasons 20 --repeat 200
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from datetime import time as dt_time
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, ".")
+
+from app.db import queries
+from app.db.database import Base, _set_sqlite_pragmas
+from app.db.models import Match, MatchShootingStat, PredictionsCache, Team, Venue
+from app.services.models import predict
+
+TEAMS = 20
+
+
+def build_database(path: Path, seasons: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(0)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Team),
+            [
+                {
+                    "team_id": i,
+                    "name": f"Team {i}",
+                    "fullname": f"Team {i} FC",
+                    "fbref_team_id": f"t{i}",
+                }
+                for i in range(1, TEAMS + 1)
+            ],
+        )
+        conn.execute(
+            insert(Venue),
+            [{"venue_id": i, "name": f"Ground {i}"} for i in range(1, TEAMS + 1)],
+        )
+        matches, stats, predictions = [], [], []
+        match_id = 0
+        for s in range(seasons):
+            start_year = 2014 + s
+            season = f"{start_year}-{start_year + 1}"
+            fixtures = [
+                (h, a)
+                for h in range(1, TEAMS + 1)
+                for a in range(1, TEAMS + 1)
+                if h != a
+            ]
+            rng.shuffle(fixtures)
+            last = s == seasons - 1
+            for n, (home, away) in enumerate(fixtures):
+                match_id += 1
+                week = n // 10 + 1
+                played = not last or week < 20
+                matches.append(
+                    {
+                        "match_id": match_id,
+                        "season": season,
+                        "week": week,
+                        "date": date(start_year, 8, 10)
+                        + timedelta(days=7 * (week - 1)),
+                        "time": dt_time(15, 0),
+                        "home_team_id": home,
+                        "away_team_id": away,
+                        "home_goals": rng.randint(0, 4) if played else None,
+                        "away_goals": rng.randint(0, 3) if played else None,
+                        "venue_id": home,
+                    }
+                )
+                for team, side in ((home, "Home"), (away, "Away")):
+                    stats.append(
+                        {
+                            "match_id": match_id,
+                            "team_id": team,
+                            "venue": side,
+                            "round": f"Matchweek {week}",
+                            "sh": rng.randint(3, 25),
+                            "sot": rng.randint(0, 10),
+                        }
+                    )
+                predictions.append(
+                    {
+                        "match_id": match_id,
+                        "pred_fthg": 1,
+                        "pred_ftag": 1,
+                        "pred_score": "1-1",
+                        "pred_result": "D",
+                        "timestamp": datetime.utcnow(),
+                    }
+                )
+        conn.execute(insert(Match), matches)
+        conn.execute(insert(MatchShootingStat), stats)
+        conn.execute(insert(PredictionsCache), predictions)
+        conn.execute(text("ANALYZE"))
+    engine.dispose()
+
+
+def drop_indexes(path: Path) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+        conn.execute(text("ANALYZE"))
+    engine.dispose()
+
+
+def benchmarks(seasons: int):
+    last = f"{2014 + seasons - 1}-{2014 + seasons}"
+    match_ids = list(range(1, 381))
+    return {
+        "matchweek with predictions": lambda s: queries.get_matchweek_with_predictions(
+            last, 10
+        ),
+        "season with predictions frame": lambda s: (
+            queries.get_season_with_predictions_frame(last)
+        ),
+        "match id by (season, week, teams)": lambda s: queries.get_match_id(
+            last, 10, 3, 7
+        ),
+        "fixture lookup (season, date, teams)": lambda s: s.execute(
+            text(
+                "SELECT match_id FROM matches WHERE season = :season AND date = :date "
+                "AND home_team_id = :home AND away_team_id = :away"
+            ),
+            {
+                "season": last,
+                "date": date(2014 + seasons - 1, 10, 12),
+                "home": 3,
+                "away": 7,
+            },
+        ).all(),
+        "shooting stats for a team": lambda s: queries.get_shooting_stats(team_id=5),
+        "missing results check": lambda s: queries.check_missing_results(
+            _quiet_logger()
+        ),
+        "prediction cache freshness": lambda s: predict.check_cache(match_ids, 24, s),
+    }
+
+
+class _quiet_logger:
+    def info(self, *args, **kwargs):
+        pass
+
+    warning = info
+
+
+def run(path: Path, seasons: int, repeat: int, pragmas: bool) -> dict[str, float]:
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    if pragmas:
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    Session = sessionmaker(bind=engine)
+
+    @contextmanager
+    def get_session():
+        session = Session()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    results = {}
+    with patch.object(queries, "read_session", get_session), Session() as session:
+        for name, call in benchmarks(seasons).items():
+            call(session)  # warm up
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                call(session)
+                timings.append(time.perf_counter() - start)
+            results[name] = statistics.median(timings) * 1000
+    engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--seasons", type=int, default=12, help="Seasons of synthetic data"
+    )
+    parser.add_argument("--repeat", type=int, default=100, help="Timed calls per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        build_database(path, args.seasons)
+        after = run(path, args.seasons, args.repeat, pragmas=True)
+        drop_indexes(path)
+        # Fresh connection without the pragmas (WAL persists in the file, so
+        # switch the journal back to the SQLite default first)
+        with create_engine(f"sqlite:///{path}").begin() as conn:
+            conn.execute(text("PRAGMA journal_mode=DELETE"))
+        before = run(path, args.seasons, args.repeat, pragmas=False)
+
+    print(f"{args.seasons} seasons, median of {args.repeat} calls (ms)\n")
+    print(f"{'Query':<40}{'Before':>10}{'After':>10}{'Speed-up':>10}")
+    print("-" * 70)
+    for name in after:
+        speed_up = before[name] / after[name]
+        print(f"{name:<40}{before[name]:>10.3f}{after[name]:>10.3f}{speed_up:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Populate a fresh database from the local CSV dumps under data/ (fixtures,
+shooting stats and standings), offline and in a single bulk transaction.
+
+Does nothing if the database already holds matches. In serving mode
+(SERVING_DATABASE_PATH set) the result is published as the serving snapshot.
+
+Run from the backend directory:
+    uv run python scripts/bootstrap_db.py
+"""
+
+import sys
+
+sys.path.insert(0, ".")
+
+from app.db.database import publish_serving_snapshot
+from app.db.loaders.bootstrap import bootstrap_database
+
+
+def main():
+    if bootstrap_database():
+        publish_serving_snapshot()
+
+
+if __name__ == "__main__":
+    main()
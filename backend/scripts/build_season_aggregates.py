@@ -0,0 +1,39 @@
+"""
+Rebuild team_season_aggregates for every finished season in the database,
+and reload the standings CSV (official positions, and the seasons before the
+first fixtures), e.g. after a new CSV. The migration that adds the table
+fills it and the fixture writers add each later season when it finishes.
+
+Run from the backend directory:
+    uv run python scripts/build_season_aggregates.py
+"""
+
+import sys
+
+sys.path.insert(0, ".")
+
+from app.core.paths import STANDINGS_FILEPATH
+from app.db.loaders.standings import add_standings, read_standings
+from app.db.queries import get_available_seasons
+from app.db.season_aggregates import close_season_if_finished
+from app.db.writer import publish_writes, run_write
+
+
+def main():
+    standings = read_standings(STANDINGS_FILEPATH)
+
+    def write(session):
+        # Official positions first, so the aggregates built below use them
+        seeded = add_standings(session, standings)
+        seasons = get_available_seasons(session=session)
+        closed = [s for s in seasons if close_season_if_finished(session, s)]
+        return closed, seeded
+
+    closed, seeded = run_write(write)
+    publish_writes()
+    print(f"Built aggregates for {len(closed)} finished seasons.")
+    print(f"Seeded {seeded} rows for earlier seasons from {STANDINGS_FILEPATH}.")
+
+
+if __name__ == "__main__":
+    main()
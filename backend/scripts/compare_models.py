@@ -18,14 +18,12 @@ import numpy as np
 import pandas as pd
 from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
 from sklearn.linear_model import LinearRegression, PoissonRegressor
-from sklearn.preprocessing import StandardScaler
 
 sys.path.insert(0, ".")
 
-from app.services.data_processing.data_loader import clean_data, load_training_data
-from app.services.models.config import FEATURES, LABELS
+from app.services.models.config import LABELS
 from app.services.models.evaluation import evaluate_model_performance
-from app.services.models.preprocess import check_data, preprocess_data
+from app.services.models.feature_store import load_feature_matrix
 from app.services.models.wrapper import GoalPredictor
 
 
@@ -97,33 +95,19 @@ DISPLAY_METRICS = [
 def _train_and_evaluate(model_name: str, predictor, season: str) -> dict | None:
     """Train predictor on data before season, evaluate on season's held-out 20%."""
     import copy
-    end_year = int(season.split("-")[0]) - 1
     is_baseline = isinstance(predictor, FixedScorePredictor)
     try:
-        df = load_training_data(end_season=end_year)
-        df = clean_data(df)
-        if not is_baseline:
-            df = preprocess_data(df, test_data=False)
-        df = df.sort_values("date").reset_index(drop=True)
-
-        y = df[LABELS]
-        split_idx = int(len(df) * 0.8)
-        y_val = y.iloc[split_idx:].reset_index(drop=True)
+        # Memory-mapped, already scaled — shared by every model for this season
+        matrix = load_feature_matrix(season)
+        y_val = pd.DataFrame(matrix.y_val, columns=LABELS)
 
         p = copy.deepcopy(predictor)
 
         if is_baseline:
             raw_preds = p.predict(np.zeros((len(y_val), 1)))
         else:
-            X = df[FEATURES]
-            check_data(X)
-            X_train, X_val = X.iloc[:split_idx], X.iloc[split_idx:]
-            y_train = y.iloc[:split_idx]
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_val_scaled = scaler.transform(X_val)
-            p.fit(X_train_scaled, y_train)
-            raw_preds = p.predict(X_val_scaled)
+            p.fit(matrix.X_train, matrix.y_train)
+            raw_preds = p.predict(matrix.X_val)
 
         y_pred = pd.DataFrame(raw_preds, columns=LABELS)
         return evaluate_model_performance(y_val, y_pred)
@@ -136,8 +120,17 @@ def _train_and_evaluate(model_name: str, predictor, season: str) -> dict | None:
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--output", help="Save results table to this CSV path", default=None)
+    parser.add_argument(
+        "--rebuild-features",
+        action="store_true",
+        help="Rebuild each season's feature store from the DB before evaluating",
+    )
     args = parser.parse_args()
 
+    if args.rebuild_features:
+        for season in TRAINABLE_SEASONS:
+            load_feature_matrix(season, rebuild=True)
+
     records = []
     for model_name, predictor in MODEL_CONFIGS:
         print(f"\nEvaluating: {model_name}")
@@ -0,0 +1,55 @@
+"""
+Export immutable snapshots of finished seasons (fixtures, shooting stats and
+predictions) so training, evaluation and prediction stop reloading them from
+the database.
+
+Seasons whose snapshot was taken from the current data are skipped; the live
+season (or any season with unplayed matches) is never snapshotted.
+
+Run from the backend directory:
+    uv run python scripts/export_season_snapshots.py
+    uv run python scripts/export_season_snapshots.py --season 2023-2024 --force
+"""
+
+import argparse
+import logging
+import sys
+
+sys.path.insert(0, ".")
+
+from app.db.queries import get_available_seasons
+from app.services.data_processing.snapshots import export_season_snapshot
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--season",
+        help="Export a single season only (e.g. 2023-2024)",
+        default=None,
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-export even if the snapshot matches the current data",
+    )
+    args = parser.parse_args()
+
+    seasons = [args.season] if args.season else get_available_seasons()
+
+    for season in seasons:
+        if export_season_snapshot(season, force=args.force):
+            logger.info(f"Exported snapshot for season {season}")
+        else:
+            logger.info(f"No snapshot written for season {season}")
+
+    logger.info("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Rebuild the materialised league table of every season in the database, e.g.
+after editing matches by hand. The migration that adds the table fills it
+and the fixture writers keep it current from then on.
+
+Run from the backend directory:
+    uv run python scripts/rebuild_league_table.py
+"""
+
+import sys
+
+sys.path.insert(0, ".")
+
+from app.db.generations import bump_generations
+from app.db.league_table import refresh_league_table
+from app.db.queries import get_available_seasons
+from app.db.writer import publish_writes, run_write
+
+
+def main():
+    def write(session):
+        seasons = get_available_seasons(session=session)
+        rows = sum(refresh_league_table(session, season) for season in seasons)
+        bump_generations(session, [(season, "league_table") for season in seasons])
+        return len(seasons), rows
+
+    seasons, rows = run_write(write)
+    publish_writes()
+    print(f"Rebuilt the league table of {seasons} seasons ({rows} rows).")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,13 +19,10 @@ from scipy.stats import randint, uniform
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import RandomizedSearchCV, TimeSeriesSplit
 from sklearn.multioutput import MultiOutputRegressor
-from sklearn.preprocessing import StandardScaler
 
 sys.path.insert(0, ".")
 
-from app.services.data_processing.data_loader import clean_data, load_training_data
-from app.services.models.config import FEATURES, LABELS
-from app.services.models.preprocess import check_data, preprocess_data
+from app.services.models.feature_store import load_feature_matrix
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -47,20 +44,17 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--n-iter", type=int, default=60, help="Number of random search iterations")
     parser.add_argument("--cv-splits", type=int, default=4, help="Number of TimeSeriesSplit folds")
+    parser.add_argument(
+        "--rebuild-features",
+        action="store_true",
+        help="Rebuild the feature store from the DB instead of reusing it",
+    )
     args = parser.parse_args()
 
     logger.info(f"Loading training data up to {TUNE_END_YEAR}-{TUNE_END_YEAR + 1}...")
-    df = load_training_data(end_season=TUNE_END_YEAR)
-    df = clean_data(df)
-    df = preprocess_data(df, test_data=False)
-    df = df.sort_values("date").reset_index(drop=True)
-
-    X = df[FEATURES]
-    y = df[LABELS]
-    check_data(X)
-
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
+    # Memory-mapped so the n_jobs=-1 workers share one copy of the matrix
+    matrix = load_feature_matrix(end_year=TUNE_END_YEAR, rebuild=args.rebuild_features)
+    X_scaled, y = matrix.X, matrix.y
 
     logger.info(f"Running RandomizedSearchCV: {args.n_iter} iterations, {args.cv_splits} folds")
     logger.info(f"Training samples: {len(X_scaled)}, features: {X_scaled.shape[1]}")
@@ -7,11 +7,16 @@ any local database, trained models, or data files.
 """
 
 import os
+from contextlib import contextmanager
+from datetime import date, time
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 os.environ.setdefault("DATABASE_URL", "sqlite:///./test_epl.db")
 os.environ.setdefault("FOOTBALL_DATA_BASE_URL", "")
@@ -21,6 +26,18 @@ os.environ.setdefault("SUPERBRU_PASSWORD", "")
 
 from app.main import app  # noqa: E402  (env vars must be set first)
 from app.core.config import settings  # noqa: E402
+from app.db import queries  # noqa: E402
+from app.db import writer as db_writer  # noqa: E402
+from app.db.database import Base  # noqa: E402
+from app.db.metadata_cache import clear_metadata_cache  # noqa: E402
+from app.db.models import (  # noqa: E402
+    Match,
+    MatchShootingStat,
+    PredictionsCache,
+    Team,
+    Venue,
+)
+from app.db.writer import DatabaseWriter  # noqa: E402
 
 SEASON = settings.CURRENT_SEASON
 
@@ -35,7 +52,7 @@ _FIXTURE_ROWS = [
         "home_team": "Arsenal", "away_team": "Wolves",
         "home_team_fullname": "Arsenal FC", "away_team_fullname": "Wolverhampton Wanderers",
         "Score": "2-1", "FTHG": 2, "FTAG": 1, "result": "H",
-        "venue": "Emirates Stadium",
+        "venue": "Emirates Stadium", "venue_display": "Emirates Stadium",
         "PredScore": "2-1", "PredResult": "H", "PredFTHG": 2, "PredFTAG": 1,
     },
     {
@@ -44,7 +61,7 @@ _FIXTURE_ROWS = [
         "home_team": "Chelsea", "away_team": "Manchester City",
         "home_team_fullname": "Chelsea FC", "away_team_fullname": "Manchester City FC",
         "Score": "1-2", "FTHG": 1, "FTAG": 2, "result": "A",
-        "venue": "Stamford Bridge",
+        "venue": "Stamford Bridge", "venue_display": "Stamford Bridge",
         "PredScore": "1-1", "PredResult": "D", "PredFTHG": 1, "PredFTAG": 1,
     },
     {
@@ -53,7 +70,7 @@ _FIXTURE_ROWS = [
         "home_team": "Arsenal", "away_team": "Chelsea",
         "home_team_fullname": "Arsenal FC", "away_team_fullname": "Chelsea FC",
         "Score": "1-0", "FTHG": 1, "FTAG": 0, "result": "H",
-        "venue": "Emirates Stadium",
+        "venue": "Emirates Stadium", "venue_display": "Emirates Stadium",
         "PredScore": "1-0", "PredResult": "H", "PredFTHG": 1, "PredFTAG": 0,
     },
 ]
@@ -100,6 +117,10 @@ MOCK_LEADERBOARD = {
 }
 
 
+def _mock_matchweek(season, week, **kw):
+    return None if week == 999 else MOCK_MATCHWEEK
+
+
 # ---------------------------------------------------------------------------
 # Session-scoped autouse mock — covers the entire test run
 # ---------------------------------------------------------------------------
@@ -128,7 +149,11 @@ def mock_all_io():
         ),
         patch(
             "app.services.seasons_service.get_matchweek",
-            side_effect=lambda season, week: None if week == 999 else MOCK_MATCHWEEK,
+            side_effect=_mock_matchweek,
+        ),
+        patch(
+            "app.services.seasons_service.get_matchweek_async",
+            side_effect=_mock_matchweek,
         ),
 
         # --- Matchweek ---
@@ -153,3 +178,67 @@ def mock_all_io():
 @pytest.fixture(scope="session")
 def client():
     return TestClient(app)
+
+
+@pytest.fixture()
+def db():
+    """In-memory SQLite database with a few seeded matches, used by the query layer."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    @contextmanager
+    def get_session():
+        session = Session()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    with get_session() as session:
+        arsenal = Team(name="Arsenal", fullname="Arsenal FC", fbref_team_id="a")
+        chelsea = Team(name="Chelsea", fullname="Chelsea FC", fbref_team_id="c")
+        emirates = Venue(name="Emirates Stadium")
+        session.add_all([arsenal, chelsea, emirates])
+        session.flush()
+        session.add_all([
+            Match(
+                season="2023-2024", week=1, day="Sat", date=date(2023, 8, 12),
+                time=time(15, 0), home_team_id=arsenal.team_id,
+                away_team_id=chelsea.team_id, home_goals=2, away_goals=1,
+                result="H", venue_id=emirates.venue_id,
+            ),
+            Match(
+                season="2024-2025", week=1, day="Sun", date=date(2024, 8, 18),
+                time=time(16, 30), home_team_id=chelsea.team_id,
+                away_team_id=arsenal.team_id, home_goals=None, away_goals=None,
+            ),
+            Match(
+                season="2022-2023", week=1, day="Sat", date=date(2022, 8, 6),
+                time=None, home_team_id=chelsea.team_id,
+                away_team_id=arsenal.team_id, home_goals=0, away_goals=0,
+                result="D",
+            ),
+        ])
+        session.flush()
+        session.add_all([
+            PredictionsCache(
+                match_id=1, pred_fthg=1, pred_ftag=0, pred_score="1-0", pred_result="H"
+            ),
+            MatchShootingStat(match_id=1, team_id=arsenal.team_id, sh=12, sot=5),
+            MatchShootingStat(match_id=1, team_id=chelsea.team_id, sh=8, sot=2),
+        ])
+
+    writer = DatabaseWriter(Session)
+    clear_metadata_cache()
+    with patch.object(queries, "read_session", get_session), patch.object(
+        db_writer, "_writer", writer
+    ):
+        yield engine
+    writer.close()
+    clear_metadata_cache()
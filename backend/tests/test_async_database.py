@@ -0,0 +1,63 @@
+"""
+Async read path: sync queries run on an AsyncSession through the async driver.
+"""
+
+import asyncio
+
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import queries
+from app.db.async_database import async_url, run_query
+from app.db.serving import publish_snapshot, serving_url, watch_snapshot
+
+
+def test_async_url_switches_to_async_drivers():
+    assert async_url(make_url("sqlite:///./epl.db")).drivername == "sqlite+aiosqlite"
+    assert (
+        async_url(make_url("postgresql://u@h/epl")).drivername == "postgresql+asyncpg"
+    )
+    assert async_url(make_url("sqlite+aiosqlite://")).drivername == "sqlite+aiosqlite"
+
+
+def test_run_query_reads_through_the_async_driver(db, tmp_path):
+    path = publish_snapshot(db, tmp_path / "epl.db")  # file copy of the seeded db
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    Session = async_sessionmaker(engine)
+
+    async def read():
+        async with Session() as session:
+            seasons = await run_query(session, queries.get_available_seasons)
+            rows = await run_query(
+                session, queries.get_matchweek_with_predictions, "2023-2024", 1
+            )
+            driver = (await session.connection()).dialect.driver
+        await engine.dispose()
+        return seasons, rows, driver
+
+    seasons, rows, driver = asyncio.run(read())
+    assert driver == "aiosqlite"
+    assert seasons == ["2022-2023", "2023-2024", "2024-2025"]
+    assert rows[0]["home_team"] == "Arsenal" and rows[0]["PredScore"] == "1-0"
+
+
+def test_async_serving_engine_moves_to_a_new_snapshot(db, tmp_path):
+    path = tmp_path / "serving.db"
+    engine = create_async_engine(serving_url(path, "sqlite+aiosqlite"))
+    watch_snapshot(engine.sync_engine, path, db)  # publishes on first connect
+    Session = async_sessionmaker(engine)
+
+    async def match_ids():
+        async with Session() as session:
+            return await run_query(session, queries.get_season_match_ids, "2022-2023")
+
+    async def read():
+        before = await match_ids()
+        with db.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM matches WHERE season = '2022-2023'")
+        publish_snapshot(db, path)
+        after = await match_ids()
+        await engine.dispose()
+        return before, after
+
+    assert asyncio.run(read()) == ([3], [])
@@ -0,0 +1,131 @@
+"""
+Offline database bootstrap from local CSV dumps.
+"""
+
+from datetime import date, time
+
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.db.loaders.bootstrap import bootstrap_database
+from app.db.models import Match, MatchShootingStat, TeamSeasonAggregate
+
+FIXTURES_2023 = """Wk,Day,Date,Time,Home,Score,Away,Attendance,Venue,Referee,Notes
+1,Sat,2023-08-12,15:00,Arsenal,2–1,Chelsea,"60,123",Emirates Stadium,M Oliver,
+,,,,,,,,,,
+2,Sat,2023-08-19,12:30,Chelsea,1–1,Manchester Utd,40000,Stamford Bridge,,
+3,Sun,2023-08-27,,Manchester Utd,,Arsenal,,Old Trafford,,Postponed
+"""
+FIXTURES_2022 = """Wk,Day,Date,Time,Home,Score,Away,Attendance,Venue,Referee,Notes
+1,Sat,2022-08-06,17:30,Chelsea,0–0,Arsenal,,Stamford Bridge,,
+"""
+# 2021-22 predates the fixtures and seeds its aggregates; 2022-23 is built
+# from matches but keeps the official positions
+STANDINGS = """Season,Pos,Team,GF,GA,GD
+2021-22,1,Chelsea,76,33,+43
+2021-22,5,Arsenal,61,48,+13
+2021-22,20,Norwich City,23,84,−61
+2022-23,1,Chelsea,0,0,0
+2022-23,2,Arsenal,0,0,0
+"""
+SHOOTING_HEADER = (
+    "Date,Round,Day,Venue,Result,GF,GA,Opponent,"
+    "Sh,SoT,SoT%,G/Sh,G/SoT,Dist,FK,PK,PKatt\n"
+)
+ARSENAL_SHOOTING = SHOOTING_HEADER + (
+    "2022-08-06,Matchweek 1,Sat,Away,D,0,0,Chelsea,9,3,33.3,0.0,0.0,17.1,0,0,0\n"
+    "2023-08-12,Matchweek 1,Sat,Home,W,2,1,Chelsea,12,5,41.7,0.17,0.4,15.2,1,0,0\n"
+    "2023-08-12,Matchweek 1,Sat,Home,W,2,1,Chelsea,12,5,41.7,0.17,0.4,15.2,1,0,0\n"
+)
+UNITED_SHOOTING = SHOOTING_HEADER + (
+    "2023-08-19,Matchweek 2,Sat,Away,D,1,1,Chelsea,10,4,40.0,0.1,0.25,16.0,0,0,0\n"
+)
+
+
+@pytest.fixture()
+def csv_dirs(tmp_path):
+    fixtures_dir = tmp_path / "fixtures_training_data"
+    stats_dir = tmp_path / "shooting_stats"
+    fixtures_dir.mkdir()
+    stats_dir.mkdir()
+    (fixtures_dir / "2023-24.csv").write_text(FIXTURES_2023)
+    (fixtures_dir / "2022-23.csv").write_text(FIXTURES_2022)
+    (stats_dir / "Arsenal.csv").write_text(ARSENAL_SHOOTING)
+    (stats_dir / "Manchester-United.csv").write_text(UNITED_SHOOTING)
+    (tmp_path / "standings.csv").write_text(STANDINGS)
+    return {
+        "fixtures_dir": fixtures_dir,
+        "stats_dir": stats_dir,
+        "standings_path": tmp_path / "standings.csv",
+    }
+
+
+@pytest.fixture()
+def empty_engine():
+    return create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+
+
+def test_bootstrap_database_loads_csvs(empty_engine, csv_dirs):
+    counts = bootstrap_database(empty_engine, **csv_dirs)
+    # Tables after 2022-23 week 1 (2 teams) and 2023-24 weeks 1-2 (3 teams)
+    assert counts == {
+        "teams": 3,
+        "matches": 4,
+        "shooting_stats": 3,
+        "league_table": 8,
+        "team_season_aggregates": 7,
+    }
+
+    with Session(empty_engine) as session:
+        matches = session.scalars(select(Match).order_by(Match.match_id)).all()
+        assert [m.season for m in matches] == ["2022-2023"] + ["2023-2024"] * 3
+        opener = matches[1]
+        assert (opener.home_team.name, opener.away_team.name) == ("Arsenal", "Chelsea")
+        assert (opener.home_goals, opener.away_goals, opener.result) == (2, 1, "H")
+        assert opener.date == date(2023, 8, 12) and opener.time == time(15, 0)
+        assert opener.attendance == 60123 and opener.venue.name == "Emirates Stadium"
+        postponed = matches[3]
+        assert postponed.time is None and postponed.home_goals is None
+        assert postponed.result is None and postponed.notes == "Postponed"
+
+        stats = session.execute(
+            select(
+                MatchShootingStat.match_id,
+                MatchShootingStat.team_id,
+                MatchShootingStat.sh,
+            ).order_by(MatchShootingStat.match_id)
+        ).all()
+        # Manchester-United.csv resolves through the team's full name
+        assert [tuple(s) for s in stats] == [(1, 1, 9), (2, 1, 12), (3, 3, 10)]
+
+        # 2023-24 is over despite its postponed match; Norwich isn't a known team
+        aggregates = session.execute(
+            select(
+                TeamSeasonAggregate.season,
+                TeamSeasonAggregate.team_id,
+                TeamSeasonAggregate.position,
+                TeamSeasonAggregate.goal_difference,
+                TeamSeasonAggregate.points,
+            ).order_by(TeamSeasonAggregate.season, TeamSeasonAggregate.position)
+        ).all()
+        assert [tuple(a) for a in aggregates] == [
+            ("2021-2022", 2, 1, 43, None),
+            ("2021-2022", 1, 5, 13, None),
+            ("2022-2023", 2, 1, 0, 1),  # ranked by name on matches alone
+            ("2022-2023", 1, 2, 0, 1),
+            ("2023-2024", 1, 1, 1, 3),
+            ("2023-2024", 3, 2, 0, 1),
+            ("2023-2024", 2, 3, -1, 1),
+        ]
+
+    indexes = {i["name"] for i in inspect(empty_engine).get_indexes("matches")}
+    assert {"uq_matches_natural_key", "ix_matches_missing_result"} <= indexes
+
+
+def test_bootstrap_database_leaves_populated_database_alone(empty_engine, csv_dirs):
+    bootstrap_database(empty_engine, **csv_dirs)
+    assert bootstrap_database(empty_engine, **csv_dirs) == {}
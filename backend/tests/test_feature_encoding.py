@@ -0,0 +1,82 @@
+"""
+Team and venue vocabularies: unseen values, the JSON artifact and the
+per-season fallback.
+"""
+
+import pytest
+
+from app.services.data_processing.feature_encoding import (
+    UNKNOWN_CODE,
+    Vocabulary,
+    load_vocabularies,
+    save_vocabularies,
+)
+from app.services.models import save_load
+
+
+@pytest.fixture()
+def vocabulary_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(save_load, "VOCABULARY_FILEPATH", tmp_path / "vocabulary.json")
+    monkeypatch.setattr(
+        save_load,
+        "season_vocabulary_path",
+        lambda season: tmp_path / f"vocabulary_{season}.json",
+    )
+    save_load.load_vocabularies_for_season.cache_clear()
+    yield tmp_path
+    save_load.load_vocabularies_for_season.cache_clear()
+
+
+def test_unseen_values_encode_to_unknown():
+    vocabulary = Vocabulary(["Chelsea", "Arsenal", None, "Arsenal"])
+
+    assert vocabulary.values == ["Arsenal", "Chelsea"]
+    assert vocabulary.encode(["Arsenal", "Chelsea", "Ipswich"]).tolist() == [
+        1,
+        2,
+        UNKNOWN_CODE,
+    ]
+    assert "Ipswich" not in vocabulary
+
+
+def test_vocabularies_round_trip_through_json(tmp_path):
+    teams = Vocabulary(["Chelsea", "Arsenal"])
+    venues = Vocabulary(["Emirates Stadium"])
+    path = tmp_path / "vocabulary.json"
+
+    save_vocabularies(path, teams, venues, version="2024-2025")
+    loaded_teams, loaded_venues = load_vocabularies(path)
+
+    assert loaded_teams.values == teams.values
+    assert loaded_venues.values == venues.values
+    assert (
+        loaded_teams.encode(["Chelsea"]).tolist() == teams.encode(["Chelsea"]).tolist()
+    )
+
+
+def test_unsupported_format_is_rejected(tmp_path):
+    path = tmp_path / "vocabulary.json"
+    path.write_text('{"format": 99, "teams": [], "venues": []}')
+
+    with pytest.raises(ValueError, match="Unsupported vocabulary format"):
+        load_vocabularies(path)
+
+
+def test_season_without_an_artifact_falls_back_to_the_default(vocabulary_dir):
+    save_load.save_vocabularies_for_season(Vocabulary(["Arsenal"]), Vocabulary([]))
+    save_load.save_vocabularies_for_season(
+        Vocabulary(["Arsenal", "Ipswich"]), Vocabulary([]), season="2024-2025"
+    )
+
+    teams, _ = save_load.load_vocabularies_for_season("2023-2024")
+    assert teams.values == ["Arsenal"]
+    teams, _ = save_load.load_vocabularies_for_season("2024-2025")
+    assert teams.values == ["Arsenal", "Ipswich"]
+
+
+def test_saving_replaces_the_cached_vocabulary(vocabulary_dir):
+    save_load.save_vocabularies_for_season(Vocabulary(["Arsenal"]), Vocabulary([]))
+    assert save_load.load_vocabularies_for_season()[0].values == ["Arsenal"]
+
+    save_load.save_vocabularies_for_season(Vocabulary(["Chelsea"]), Vocabulary([]))
+    assert save_load.load_vocabularies_for_season()[0].values == ["Chelsea"]
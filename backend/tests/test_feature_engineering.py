@@ -0,0 +1,232 @@
+"""
+Prior-season standing features, read from team_season_aggregates.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.db.season_aggregates import build_team_season_aggregates
+from app.db.writer import run_write
+from app.services.data_processing.feature_engineering import (
+    add_cumulative_season_points,
+    add_days_rest,
+    add_elo_ratings,
+    add_h2h_features,
+    add_ppg_features,
+    add_previous_season_standing,
+    calculate_match_points,
+)
+from app.services.data_processing.team_registry import TeamRegistry, add_team_codes
+from app.services.models.preprocess import check_data
+
+COLUMNS = [
+    f"{stat}_last_season_{side}"
+    for side in ("h", "a")
+    for stat in ("pos", "gf", "ga", "gd")
+]
+
+
+def _fixtures(registry, season):
+    return pd.DataFrame(
+        {
+            "season": [season],
+            "home_code": registry.lookup(["Arsenal"]),
+            "away_code": registry.lookup(["Chelsea"]),
+        }
+    )
+
+
+def test_previous_season_standing_without_aggregates_uses_defaults(db):
+    registry = TeamRegistry([{"name": "Arsenal"}, {"name": "Chelsea"}])
+    df = add_previous_season_standing(_fixtures(registry, "2024-2025"), registry)
+
+    check_data(df[COLUMNS])
+    assert all(pd.api.types.is_numeric_dtype(df[column]) for column in COLUMNS)
+    assert df[COLUMNS].iloc[0].tolist() == [18, 52, 52, 0, 18, 52, 52, 0]
+
+
+def test_previous_season_standing_reads_the_aggregates(db):
+    run_write(build_team_season_aggregates, "2023-2024")
+    registry = TeamRegistry([{"name": "Arsenal"}, {"name": "Chelsea"}])
+    df = add_previous_season_standing(_fixtures(registry, "2024-2025"), registry)
+
+    assert df[COLUMNS].iloc[0].tolist() == [1, 2, 1, 1, 2, 1, 2, -1]
+
+
+# Reference implementations: the row-by-row, team-name based stages that the
+# code-based stages replaced. The rewrite must reproduce them exactly.
+
+
+def _reference_days_rest(df, default_days=7):
+    df = df.copy().sort_values("date").reset_index(drop=True)
+    df["days_rest_h"] = float(default_days)
+    df["days_rest_a"] = float(default_days)
+    last_match = {}
+    for idx, row in df.iterrows():
+        home_team, away_team = row["home_team"], row["away_team"]
+        if home_team in last_match:
+            df.at[idx, "days_rest_h"] = (row["date"] - last_match[home_team]).days
+        if away_team in last_match:
+            df.at[idx, "days_rest_a"] = (row["date"] - last_match[away_team]).days
+        last_match[home_team] = last_match[away_team] = row["date"]
+    return df
+
+
+def _reference_ppg(df, teams):
+    for team in teams:
+        team_df = df[(df["home_team"] == team) | (df["away_team"] == team)].copy()
+        team_df["Points"] = team_df["home_points"].where(
+            team_df["home_team"] == team, team_df["away_points"]
+        )
+        team_df["ppg_rolling"] = (
+            team_df["Points"].rolling(3, closed="left").mean().fillna(0)
+        )
+        df.loc[df["home_team"] == team, "ppg_rolling_h"] = team_df.loc[
+            team_df["home_team"] == team, "ppg_rolling"
+        ]
+        df.loc[df["away_team"] == team, "ppg_rolling_a"] = team_df.loc[
+            team_df["away_team"] == team, "ppg_rolling"
+        ]
+    return df
+
+
+def _reference_elo(df, k=30, home_advantage=100, base_rating=1500, season_reset=0.2):
+    df = df.copy().sort_values("date")
+    df["elo_h"] = 0.0
+    df["elo_a"] = 0.0
+    elo_ratings = {
+        team: base_rating for team in set(df["home_team"]) | set(df["away_team"])
+    }
+    current_season = None
+    for idx, row in df.iterrows():
+        home_team, away_team = row["home_team"], row["away_team"]
+        if current_season != row["season"] and current_season is not None:
+            for team in elo_ratings:
+                elo_ratings[team] = base_rating * season_reset + elo_ratings[team] * (
+                    1 - season_reset
+                )
+        current_season = row["season"]
+        home_elo = elo_ratings[home_team] + home_advantage
+        away_elo = elo_ratings[away_team]
+        df.at[idx, "elo_h"] = home_elo
+        df.at[idx, "elo_a"] = away_elo
+        if pd.notna(row["FTHG"]) and pd.notna(row["FTAG"]):
+            expected_home = 1 / (1 + 10 ** ((away_elo - home_elo) / 400))
+            if row["FTHG"] > row["FTAG"]:
+                home_score = 1
+            elif row["FTHG"] < row["FTAG"]:
+                home_score = 0
+            else:
+                home_score = 0.5
+            elo_ratings[home_team] += k * (home_score - expected_home)
+            elo_ratings[away_team] += k * ((1 - home_score) - (1 - expected_home))
+    return df
+
+
+def _reference_h2h(df, window=5, default_goals=1.5):
+    df = df.copy().sort_values("date")
+    df["h2h_avg_goals_h"] = default_goals
+    df["h2h_avg_goals_a"] = default_goals
+    for idx, row in df.iterrows():
+        home_team, away_team = row["home_team"], row["away_team"]
+        past = df[
+            (df["date"] < row["date"])
+            & (
+                ((df["home_team"] == home_team) & (df["away_team"] == away_team))
+                | ((df["home_team"] == away_team) & (df["away_team"] == home_team))
+            )
+        ].tail(window)
+        if not past.empty:
+            same = past["home_team"] == home_team
+            df.at[idx, "h2h_avg_goals_h"] = (
+                past["FTHG"].where(same, past["FTAG"]).mean(skipna=False)
+            )
+            df.at[idx, "h2h_avg_goals_a"] = (
+                past["FTAG"].where(same, past["FTHG"]).mean(skipna=False)
+            )
+    df[["h2h_avg_goals_h", "h2h_avg_goals_a"]] = df[
+        ["h2h_avg_goals_h", "h2h_avg_goals_a"]
+    ].fillna(default_goals)
+    return df
+
+
+def _reference_cumulative_points(df):
+    df = df.copy().sort_values(["season", "date"]).reset_index(drop=True)
+    df["cum_pts_h"] = 0.0
+    df["cum_pts_a"] = 0.0
+    for _, season_df in df.groupby("season", sort=False):
+        cumulative = {}
+        for idx in season_df.index:
+            row = df.loc[idx]
+            home_team, away_team = row["home_team"], row["away_team"]
+            df.at[idx, "cum_pts_h"] = cumulative.get(home_team, 0.0)
+            df.at[idx, "cum_pts_a"] = cumulative.get(away_team, 0.0)
+            if pd.notna(row["home_points"]) and pd.notna(row["away_points"]):
+                cumulative[home_team] = (
+                    cumulative.get(home_team, 0.0) + row["home_points"]
+                )
+                cumulative[away_team] = (
+                    cumulative.get(away_team, 0.0) + row["away_points"]
+                )
+    return df
+
+
+TEAMS = ["Arsenal", "Chelsea", "Everton", "Fulham", "Liverpool"]
+
+
+@pytest.fixture
+def matches():
+    """Two seasons of random fixtures between a few teams, some unplayed."""
+    rng = np.random.default_rng(7)
+    n = 60
+    pairs = [rng.choice(len(TEAMS), size=2, replace=False) for _ in range(n)]
+    fthg = rng.integers(0, 4, size=n).astype(float)
+    ftag = rng.integers(0, 4, size=n).astype(float)
+    unplayed = rng.random(n) < 0.15
+    fthg[unplayed] = np.nan
+    ftag[unplayed] = np.nan
+    gaps = rng.integers(1, 10, size=n).cumsum()
+    df = pd.DataFrame(
+        {
+            "date": pd.Timestamp("2022-08-01") + pd.to_timedelta(gaps, unit="D"),
+            "season": ["2022-2023"] * (n // 2) + ["2023-2024"] * (n - n // 2),
+            "home_team": [TEAMS[home] for home, _ in pairs],
+            "away_team": [TEAMS[away] for _, away in pairs],
+            "FTHG": fthg,
+            "FTAG": ftag,
+        }
+    )
+    df = calculate_match_points(df)
+    registry = TeamRegistry([{"name": team} for team in TEAMS])
+    return add_team_codes(df, registry)
+
+
+@pytest.mark.parametrize(
+    "stage, reference, columns",
+    [
+        (add_days_rest, _reference_days_rest, ["days_rest_h", "days_rest_a"]),
+        (
+            add_ppg_features,
+            lambda df: _reference_ppg(df, TEAMS),
+            ["ppg_rolling_h", "ppg_rolling_a"],
+        ),
+        (add_elo_ratings, _reference_elo, ["elo_h", "elo_a"]),
+        (add_h2h_features, _reference_h2h, ["h2h_avg_goals_h", "h2h_avg_goals_a"]),
+        (
+            add_cumulative_season_points,
+            _reference_cumulative_points,
+            ["cum_pts_h", "cum_pts_a"],
+        ),
+    ],
+)
+def test_code_based_stages_match_the_name_based_reference(
+    matches, stage, reference, columns
+):
+    expected = reference(matches.copy())
+    actual = stage(matches.copy())
+
+    pd.testing.assert_frame_equal(
+        actual[columns].reset_index(drop=True),
+        expected[columns].reset_index(drop=True).astype(float),
+    )
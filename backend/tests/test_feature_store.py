@@ -0,0 +1,42 @@
+"""
+Memory-mapped feature stores, reused only while the training data is unchanged.
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from app.db.generations import bump_generations
+from app.db.writer import run_write
+from app.services.models import feature_store
+from app.services.models.config import FEATURES, LABELS
+
+
+def _store(path, data_generation):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        rng.random((4, len(FEATURES) + len(LABELS))), columns=FEATURES + LABELS
+    )
+    df["match_id"] = range(4)
+    df["season"] = "2023-2024"
+    df["date"] = pd.date_range("2023-08-12", periods=4)
+    scaler = StandardScaler().fit(df[FEATURES])
+    return feature_store.save_feature_matrix(df, scaler, 3, path, data_generation)
+
+
+def test_feature_store_is_rebuilt_when_training_data_changes(db, tmp_path):
+    path = tmp_path / "features"
+    _store(path, feature_store.training_data_generation())
+
+    with (
+        patch.object(feature_store, "feature_store_path", return_value=path),
+        patch.object(feature_store, "build_feature_matrix") as build,
+    ):
+        matrix = feature_store.load_feature_matrix("2024-2025")
+        assert not build.called and matrix.X.shape == (4, len(FEATURES))
+
+        run_write(lambda session: bump_generations(session, [("2023-2024", "matches")]))
+        feature_store.load_feature_matrix("2024-2025")
+        build.assert_called_once_with("2024-2025", None)
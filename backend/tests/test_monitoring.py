@@ -0,0 +1,121 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.models.config import FEATURES
+from app.services.models.drift import (
+    DriftMonitor,
+    FeatureProfile,
+    HistogramSketch,
+    RunningStats,
+    population_stability_index,
+)
+
+client = TestClient(app)
+
+
+def _make_monitor() -> DriftMonitor:
+    rng = np.random.default_rng(0)
+    training = pd.DataFrame(
+        rng.normal(1.5, 0.5, size=(500, len(FEATURES))), columns=FEATURES
+    )
+    monitor = DriftMonitor(FeatureProfile.from_frame(training), season="2024-2025")
+
+    live = pd.DataFrame(
+        rng.normal(1.5, 0.5, size=(100, len(FEATURES))), columns=FEATURES
+    )
+    live["xg_rolling_h"] = 0.0  # e.g. the shooting stats CSV went missing
+    monitor.observe(live, keys=range(100))
+    monitor.observe(live, keys=range(100))  # repeated rows are not double-counted
+    return monitor
+
+
+def test_get_feature_drift():
+    with patch(
+        "app.api.endpoints.monitoring.get_drift_monitor",
+        return_value=_make_monitor(),
+    ):
+        response = client.get("/api/monitoring/drift", params={"season": "2024-2025"})
+    assert response.status_code == 200
+    report = response.json()
+    assert report["reference_rows"] == 500
+    assert report["live_rows"] == 100
+    assert report["drifted_features"] == ["xg_rolling_h"]
+    assert set(report["features"]) == set(FEATURES)
+    feature = report["features"]["xg_rolling_h"]
+    assert feature["live_mean"] == 0.0
+    assert feature["psi"] > 0.25
+
+
+def test_get_feature_drift_without_profile():
+    with patch("app.api.endpoints.monitoring.get_drift_monitor", return_value=None):
+        response = client.get("/api/monitoring/drift")
+    assert response.status_code == 404
+
+
+def test_running_stats_match_numpy_across_merged_batches():
+    values = np.random.default_rng(1).normal(3.0, 2.0, size=1000)
+    stats = RunningStats()
+    for chunk in np.array_split(values, [1, 10, 400, 999]):
+        part = RunningStats()
+        part.update_batch(chunk)
+        stats.merge(part)
+    single = RunningStats()
+    for x in values[:50]:
+        single.update(x)
+
+    assert stats.count == len(values)
+    np.testing.assert_allclose(stats.mean, values.mean())
+    np.testing.assert_allclose(stats.variance, values.var(ddof=1))
+    assert (stats.min, stats.max) == (values.min(), values.max())
+    np.testing.assert_allclose(single.variance, values[:50].var(ddof=1))
+    restored = RunningStats.from_dict(stats.to_dict())
+    assert restored.to_dict() == stats.to_dict()
+
+
+def test_histogram_sketch_merge_and_quantiles():
+    values = np.random.default_rng(2).uniform(0.0, 10.0, size=10_000)
+    edges = np.arange(1.0, 10.0)
+    first, second = HistogramSketch(edges), HistogramSketch(edges)
+    first.update_batch(values[:3000])
+    second.update_batch(values[3000:])
+    first.merge(second)
+
+    assert first.total == len(values)
+    assert first.counts.tolist() == np.histogram(values, np.arange(11.0))[0].tolist()
+    for q in (0.05, 0.5, 0.95):
+        assert abs(first.quantile(q, 0.0, 10.0) - np.quantile(values, q)) < 0.1
+    assert HistogramSketch(edges).quantile(0.5, 0.0, 10.0) is None
+    with pytest.raises(ValueError):
+        first.merge(HistogramSketch(edges + 0.5))
+
+
+def test_population_stability_index():
+    edges = [1.0, 2.0, 3.0]
+    reference = HistogramSketch(edges, counts=[25, 25, 25, 25])
+    same = HistogramSketch(edges, counts=[50, 50, 50, 50])
+    shifted = HistogramSketch(edges, counts=[0, 0, 50, 50])
+
+    assert population_stability_index(reference, same) == 0.0
+    expected = 2 * (0.5 - 0.25) * np.log(0.5 / 0.25) + 2 * (1e-4 - 0.25) * np.log(
+        1e-4 / 0.25
+    )
+    np.testing.assert_allclose(population_stability_index(reference, shifted), expected)
+
+
+def test_reobserving_the_same_matches_leaves_the_stats_unchanged():
+    monitor = _make_monitor()
+    before = monitor.live.to_dict()
+    rng = np.random.default_rng(3)
+    again = pd.DataFrame(
+        rng.normal(9.0, 1.0, size=(100, len(FEATURES))), columns=FEATURES
+    )
+
+    monitor.observe(again, keys=range(100))
+    assert monitor.live.to_dict() == before
+    monitor.observe(again.head(1), keys=[100])
+    assert monitor.live.rows == 101
@@ -0,0 +1,232 @@
+"""
+Query-layer tests against an in-memory SQLite database.
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import metadata_cache, queries
+from app.db.generations import bump_generations
+from app.db.metadata_cache import bump_data_generation
+from app.db.models import Match, Team, Venue
+
+
+def test_get_fixtures_frame(db):
+    df = queries.get_fixtures_frame(["2023-2024", "2024-2025"])
+
+    assert df["season"].tolist() == ["2023-2024", "2024-2025"]
+    assert df["home_team"].tolist() == ["Arsenal", "Chelsea"]
+    assert df["away_team"].tolist() == ["Chelsea", "Arsenal"]
+    assert df["venue"].iloc[0] == "Emirates Stadium"
+    assert pd.isna(df["venue"].iloc[1])
+    assert pd.api.types.is_datetime64_any_dtype(df["date"])
+    assert df["date"].iloc[0] == pd.Timestamp("2023-08-12")
+    assert df["time"].iloc[1].startswith("16:30")
+    assert df["FTHG"].iloc[0] == 2
+    assert pd.isna(df["FTAG"].iloc[1])
+
+
+def test_get_fixtures_frame_matches_orm_fixtures(db):
+    bulk = queries.get_fixtures_frame(["2022-2023", "2023-2024"])
+    orm = pd.DataFrame(
+        queries.get_seasons_fixtures(season="2022-2023")
+        + queries.get_seasons_fixtures(season="2023-2024")
+    )
+    columns = ["match_id", "season", "week", "home_team", "away_team", "FTHG", "FTAG"]
+    pd.testing.assert_frame_equal(bulk[columns], orm[columns], check_dtype=False)
+
+
+def test_get_fixtures_frame_empty(db):
+    assert queries.get_fixtures_frame(["1999-2000"]).empty
+
+
+def _add_matches(engine, season: str, count: int) -> None:
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        teams = [
+            Team(name=f"Team {i}", fullname=f"Team {i} FC", fbref_team_id=f"t{i}")
+            for i in range(count * 2)
+        ]
+        venue = Venue(name=f"Ground {season}")
+        session.add_all(teams + [venue])
+        session.flush()
+        session.add_all(
+            [
+                Match(
+                    season=season,
+                    week=1,
+                    date=date(2024, 8, 17),
+                    home_team_id=teams[2 * i].team_id,
+                    away_team_id=teams[2 * i + 1].team_id,
+                    venue_id=venue.venue_id,
+                )
+                for i in range(count)
+            ]
+        )
+        session.commit()
+
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda: queries.get_seasons_fixtures(season="2019-2020"),
+        lambda: queries.get_matchweek_with_predictions("2019-2020", 1),
+        lambda: queries.get_season_with_predictions("2019-2020"),
+    ],
+)
+def test_match_queries_issue_one_statement(db, call):
+    _add_matches(db, "2019-2020", 20)
+    with count_statements(db) as statements:
+        rows = call()
+    assert len(rows) == 20
+    assert {r["home_team"] for r in rows} == {f"Team {i}" for i in range(0, 40, 2)}
+    assert all(r["venue"] == "Ground 2019-2020" for r in rows)
+    assert len(statements) == 1
+
+
+def test_queries_read_through_the_callers_session(db):
+    commits = []
+    with (
+        Session(db) as session,
+        patch.object(
+            queries, "read_session", side_effect=AssertionError("opened a session")
+        ),
+    ):
+        event.listen(session, "after_commit", commits.append)
+        assert queries.get_available_seasons(session=session) == [
+            "2022-2023",
+            "2023-2024",
+            "2024-2025",
+        ]
+        assert queries.get_season_match_ids("2023-2024", session=session) == [1]
+        assert (
+            len(queries.get_matchweek_with_predictions("2023-2024", 1, session=session))
+            == 1
+        )
+        assert queries.get_teams_names(session=session) == ["Arsenal", "Chelsea"]
+        assert not queries.check_missing_results(
+            MagicMock(), datetime(2024, 8, 18, 17, 0), session=session
+        )
+    assert commits == []
+
+
+def test_metadata_reads_are_cached_until_the_next_write(db, monkeypatch):
+    monkeypatch.setattr(metadata_cache, "WATERMARK_CHECK_SECONDS", 3600)
+    assert queries.get_available_seasons() == ["2022-2023", "2023-2024", "2024-2025"]
+    queries.get_teams_names()
+    queries.get_all_venues()
+    with count_statements(db) as statements:
+        seasons = queries.get_available_seasons()
+        seasons.append("mutated")
+        assert queries.get_teams_names() == ["Arsenal", "Chelsea"]
+        assert queries.get_all_venues() == ["Emirates Stadium"]
+        assert queries.get_available_seasons()[-1] == "2024-2025"
+    assert statements == []
+
+    _add_matches(db, "2019-2020", 1)  # bypasses the writers: still cached
+    assert "2019-2020" not in queries.get_available_seasons()
+    bump_data_generation()
+    assert queries.get_available_seasons()[0] == "2019-2020"
+    assert "Team 0" in queries.get_teams_names()
+
+
+def test_metadata_cache_sees_writes_from_other_processes(db, monkeypatch):
+    monkeypatch.setattr(metadata_cache, "WATERMARK_CHECK_SECONDS", 0)
+    assert "2019-2020" not in queries.get_available_seasons()
+    _add_matches(db, "2019-2020", 1)
+    assert "2019-2020" not in queries.get_available_seasons()
+    # Another process's writer bumps the generation with its write
+    with Session(db) as session:
+        bump_generations(session, [("2019-2020", "matches")])
+        session.commit()
+    assert "2019-2020" in queries.get_available_seasons()
+
+
+def test_season_with_predictions_includes_cached_predictions(db):
+    rows = queries.get_season_with_predictions("2023-2024")
+    assert rows[0]["PredScore"] == "1-0"
+    assert rows[0]["home_team_fullname"] == "Arsenal FC"
+
+
+def test_match_reads_build_no_orm_instances(db):
+    with Session(db) as session:
+        rows = queries.get_seasons_fixtures(season="2023-2024", session=session)
+        assert len(session.identity_map) == 0
+        # Same shape and values as the ORM serialisation they replace
+        assert rows == [session.get(Match, 1).to_dict()]
+
+
+def test_match_frames_match_the_row_reads(db):
+    pd.testing.assert_frame_equal(
+        queries.get_matchweek_frame("2024-2025", 1),
+        pd.DataFrame(queries.get_matchweek_with_predictions("2024-2025", 1)),
+    )
+    pd.testing.assert_frame_equal(
+        queries.get_season_with_predictions_frame("2023-2024"),
+        pd.DataFrame(queries.get_season_with_predictions("2023-2024")),
+    )
+    empty = queries.get_seasons_fixtures_frame(season="1999-2000")
+    assert empty.empty and "home_team" in empty.columns
+
+
+def test_get_shooting_stats_issues_one_statement(db):
+    with count_statements(db) as statements:
+        stats = queries.get_shooting_stats(match_id=1)
+    assert len(statements) == 1
+    assert {s["team_name"] for s in stats} == {"Arsenal", "Chelsea"}
+    assert all(s["date"] == date(2023, 8, 12) and s["week"] == 1 for s in stats)
+
+
+@pytest.mark.parametrize(
+    "now, overdue",
+    [
+        # Match 2 kicks off 2024-08-18 16:30 UK time (15:30 UTC)
+        (datetime(2024, 8, 18, 18, 29), False),
+        (datetime(2024, 8, 18, 18, 31), True),
+    ],
+)
+def test_check_missing_results(db, now, overdue):
+    assert queries.check_missing_results(MagicMock(), current_datetime=now) is overdue
+
+
+def test_check_missing_results_uses_partial_index(db):
+    captured = []
+    listener = lambda *args: captured.append((args[2], args[3]))  # noqa: E731
+    event.listen(db, "before_cursor_execute", listener)
+    try:
+        queries.check_missing_results(MagicMock())
+    finally:
+        event.remove(db, "before_cursor_execute", listener)
+
+    ((statement, params),) = captured
+    with db.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).all()
+    assert "USING INDEX ix_matches_missing_result" in plan[0][-1]
+
+
+def test_kickoff_utc_filled_on_insert(db):
+    with db.connect() as conn:
+        kickoffs = (
+            conn.execute(text("SELECT kickoff_utc FROM matches ORDER BY match_id"))
+            .scalars()
+            .all()
+        )
+    assert kickoffs[0].startswith("2023-08-12 14:00:00")  # BST
+    assert kickoffs[2].startswith("2022-08-05 23:00:00")  # No time: UK midnight
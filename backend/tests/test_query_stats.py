@@ -0,0 +1,54 @@
+"""
+Per-request / per-stage SQL statement counts and the slow-query log.
+"""
+
+import logging
+
+from app.core.config import settings
+from app.db import queries
+from app.db.models import Team
+from app.db.query_stats import instrument_engine, track_queries
+from app.db.writer import run_write
+
+
+def _add_team(session, name):
+    session.add(Team(name=name, fullname=f"{name} FC", fbref_team_id=name.lower()))
+    session.flush()
+
+
+def test_nested_stages_count_into_their_parents(db):
+    instrument_engine(db)
+    with track_queries("outer") as outer:
+        queries.get_season_match_ids("2023-2024")
+        with track_queries("inner") as inner:
+            queries.get_season_match_ids("2024-2025")
+    assert inner.statements == 1
+    assert outer.statements == 2
+    assert outer.seconds >= inner.seconds > 0
+
+
+def test_writes_count_towards_the_submitting_stage(db):
+    instrument_engine(db)
+    with track_queries("ingest") as stats:
+        run_write(_add_team, "Spurs")
+    assert stats.statements >= 1
+
+
+def test_slow_queries_are_logged_with_their_plan(db, monkeypatch, caplog):
+    instrument_engine(db)
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-6)
+    with caplog.at_level(logging.WARNING, logger="app.db.query_stats"):
+        queries.get_season_match_ids("2023-2024")
+    message = caplog.records[0].getMessage()
+    assert "Slow query" in message and "'2023-2024'" in message
+    assert "Query plan:" in message and "matches" in message
+
+
+def test_debug_mode_exposes_request_totals(client, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", True)
+    response = client.get("/api/status")
+    assert response.headers["X-DB-Statements"] == "0"
+    assert "X-DB-Time-Ms" in response.headers
+
+    monkeypatch.setattr(settings, "DEBUG", False)
+    assert "X-DB-Statements" not in client.get("/api/status").headers
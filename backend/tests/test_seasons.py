@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
 
 from app.core.config import settings
@@ -77,3 +79,37 @@ def test_get_finished_season_matchweek():
         body = response.json()
         assert "matches" in body
         assert "week_points" in body
+
+
+def test_get_season_table():
+    rows = [
+        {
+            "week": 3,
+            "position": 1,
+            "team_id": 1,
+            "team": "Arsenal",
+            "played": 3,
+            "won": 3,
+            "drawn": 0,
+            "lost": 0,
+            "goals_for": 7,
+            "goals_against": 1,
+            "goal_difference": 6,
+            "points": 9,
+        },
+    ]
+    with patch(
+        "app.api.endpoints.seasons.get_league_table", return_value=rows
+    ) as query:
+        response = client.get(f"/api/seasons/{SEASON}/table")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["week"] == 3
+    assert body["table"][0]["team"] == "Arsenal" and body["table"][0]["points"] == 9
+    assert query.call_args.kwargs["week"] is None
+
+
+def test_get_season_table_not_found():
+    with patch("app.api.endpoints.seasons.get_league_table", return_value=[]):
+        response = client.get("/api/seasons/1900-1901/table?week=5")
+    assert response.status_code == 404
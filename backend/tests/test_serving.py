@@ -0,0 +1,77 @@
+"""
+Serving snapshots: publish, atomic swap and read-only access.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, event, insert, select, text
+from sqlalchemy.exc import OperationalError
+
+from app.db.database import Base, _set_sqlite_pragmas
+from app.db.models import Team
+from app.db.serving import create_serving_engine, publish_snapshot
+
+
+@pytest.fixture()
+def staging(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'staging.db'}")
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _add_team(engine, name):
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Team),
+            {"name": name, "fullname": f"{name} FC", "fbref_team_id": name},
+        )
+
+
+def _team_names(conn):
+    return set(conn.scalars(select(Team.name)))
+
+
+def test_readers_move_to_a_new_snapshot_on_next_checkout(staging, tmp_path):
+    path = tmp_path / "serving.db"
+    _add_team(staging, "Arsenal")
+    serving = create_serving_engine(path, staging)  # publishes on first connect
+
+    with serving.connect() as conn:
+        assert _team_names(conn) == {"Arsenal"}
+
+    with serving.connect() as in_flight:
+        _add_team(staging, "Chelsea")
+        publish_snapshot(staging, path)
+        # A request already holding a connection keeps its snapshot
+        assert _team_names(in_flight) == {"Arsenal"}
+
+    with serving.connect() as conn:
+        assert _team_names(conn) == {"Arsenal", "Chelsea"}
+    assert not list(tmp_path.glob("*.tmp"))
+    serving.dispose()
+
+
+def test_concurrent_publishes_never_share_a_temp_file(staging, tmp_path):
+    path = tmp_path / "serving.db"
+    _add_team(staging, "Arsenal")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for future in [pool.submit(publish_snapshot, staging, path) for _ in range(8)]:
+            future.result()
+
+    serving = create_serving_engine(path, staging)
+    with serving.connect() as conn:
+        assert _team_names(conn) == {"Arsenal"}
+    assert not list(tmp_path.glob("*.tmp"))
+    serving.dispose()
+
+
+def test_serving_snapshot_is_read_only(staging, tmp_path):
+    serving = create_serving_engine(tmp_path / "serving.db", staging)
+    with serving.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+        with pytest.raises(OperationalError):
+            _add_team(serving, "Arsenal")
+    serving.dispose()
@@ -0,0 +1,99 @@
+"""
+Finished-season snapshots, exported from and checked against an in-memory DB.
+"""
+
+import pandas as pd
+import pytest
+from sqlalchemy import update
+
+from app.db.generations import bump_generations
+from app.db.models import Match
+from app.db.writer import run_write
+from app.services.data_processing import snapshots
+from app.services.data_processing.data_loader import (
+    load_season_with_predictions,
+    load_shooting_data,
+    load_training_data,
+)
+
+from .test_queries import count_statements
+
+
+def _with_none_nulls(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype(object).where(df.notna(), None)
+
+
+@pytest.fixture()
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, "SNAPSHOTS_DIR", tmp_path)
+    snapshots._load_table.cache_clear()
+    yield tmp_path
+    snapshots._load_table.cache_clear()
+
+
+def test_export_only_finished_seasons(db, snapshot_dir):
+    assert snapshots.export_season_snapshot("2023-2024")
+    assert not snapshots.export_season_snapshot("2024-2025")  # has unplayed matches
+    assert snapshots.list_snapshot_seasons() == ["2023-2024"]
+
+    manifest = snapshots.read_manifest("2023-2024")
+    assert manifest["generation"]["matches"] == 1
+    assert set(manifest["files"]) == {"fixtures", "shooting_stats", "predictions"}
+
+    # Unchanged data generation: nothing to re-export
+    assert not snapshots.export_season_snapshot("2023-2024")
+
+
+def test_loaders_read_snapshots_without_the_db(db, snapshot_dir):
+    from_db = load_training_data(start_season=2022, end_season=2024)
+    shooting_from_db = load_shooting_data("Arsenal")
+    snapshots.export_season_snapshot("2022-2023")
+    snapshots.export_season_snapshot("2023-2024")
+
+    # Only the data generations are read, to check the snapshots are current
+    with count_statements(db) as statements:
+        finished = load_training_data(start_season=2022, end_season=2023)
+    assert len(statements) == 1 and "data_generation" in statements[0]
+
+    # A text column that is all null within a season (2022-2023 has no kick-off
+    # time or venue) comes back as object rather than str dtype
+    pd.testing.assert_frame_equal(
+        _with_none_nulls(load_training_data(start_season=2022, end_season=2024)),
+        _with_none_nulls(from_db),
+    )
+    columns = ["stat_id", "match_id", "team_name", "sh", "sot", "week"]
+    pd.testing.assert_frame_equal(
+        load_shooting_data("Arsenal")[columns], shooting_from_db[columns]
+    )
+    assert finished["season"].tolist() == ["2022-2023", "2023-2024"]
+
+    season = load_season_with_predictions("2023-2024")
+    assert season["PredScore"].tolist() == ["1-0"]
+
+
+def test_corrupt_snapshot_falls_back_to_db(db, snapshot_dir):
+    snapshots.export_season_snapshot("2023-2024")
+    with open(snapshot_dir / "2023-2024" / "fixtures.npz", "ab") as f:
+        f.write(b"corrupt")
+
+    df = load_training_data(start_season=2023, end_season=2023)
+    assert df["home_team"].tolist() == ["Arsenal"]
+
+
+def test_snapshot_is_bypassed_once_its_season_changes(db, snapshot_dir):
+    snapshots.export_season_snapshot("2023-2024")
+    run_write(
+        lambda session: (
+            session.execute(
+                update(Match).where(Match.match_id == 1).values(home_goals=3)
+            ),
+            bump_generations(session, [("2023-2024", "matches")]),
+        )
+    )
+
+    df = load_training_data(start_season=2023, end_season=2023)
+    assert df["FTHG"].tolist() == [3]
+    assert snapshots.export_season_snapshot("2023-2024")  # re-exported
+    assert snapshots.load_snapshot_table("2023-2024", "fixtures")["FTHG"].tolist() == [
+        3
+    ]
@@ -1,9 +1,13 @@
 from typing import Union
 
 from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 from app.main import app
 from app.core.config import settings
+from app.db.models import TeamAlias
+from app.services.web_scraping.superbru.submit_predictions import resolve_fixture_keys
 
 client = TestClient(app)
 
@@ -30,3 +34,16 @@ def test_retrieve_superbru_leaderboard_points():
     assert isinstance(resj["global_top_10_pct"], Union[int, float])
     assert "uk_top_10_pct" in resj
     assert isinstance(resj["uk_top_10_pct"], Union[int, float])
+
+
+def test_resolve_fixture_keys_persists_new_spellings(db):
+    predictions = [{"home_team": "Arsenal", "away_team": "Chelsea"}]
+    site_keys, predictions_by_key = resolve_fixture_keys(
+        [("Arsenal FC", "Chelsea FC")], predictions
+    )
+    assert site_keys == [(1, 2)]
+    assert predictions_by_key == {(1, 2): predictions[0]}
+
+    with Session(db) as session:
+        aliases = session.scalars(select(TeamAlias.alias)).all()
+    assert {"Arsenal FC", "Chelsea FC"} <= set(aliases)
@@ -0,0 +1,369 @@
+"""
+Write-path tests against the in-memory SQLite database.
+"""
+
+from datetime import date, time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import queries
+from app.db.generations import PREDICTION_INPUT_TABLES, bump_generations
+from app.db.loaders.shooting_stats import add_shooting_stats
+from app.db.metadata_cache import data_generation
+from app.db.models import (
+    LeagueTableEntry,
+    Match,
+    MatchShootingStat,
+    TeamAlias,
+    Venue,
+    VenueAlias,
+)
+from app.db.teams import resolve_team_ids
+from app.db.updaters.fixtures import upsert_fixtures
+from app.db.venues import resolve_venue_ids
+from app.db.writer import run_write
+from app.services.models.predict import check_cache, update_cache
+
+from .test_queries import count_statements
+
+
+def _scraped(**overrides) -> pd.DataFrame:
+    rows = [
+        # Existing match, result now known
+        {
+            "Wk": 1,
+            "Day": "Sun",
+            "Date": "2024-08-18",
+            "Time": "16:30",
+            "Home": "Chelsea",
+            "Away": "Arsenal",
+            "Score": "1–3",
+            "Venue": "Stamford Bridge",
+        },
+        # New fixture
+        {
+            "Wk": 2,
+            "Day": "Sat",
+            "Date": "2024-08-24",
+            "Time": "15:00",
+            "Home": "Arsenal",
+            "Away": "Chelsea",
+            "Score": None,
+            "Venue": "Emirates Stadium",
+        },
+        # Unknown team
+        {
+            "Wk": 2,
+            "Day": "Sat",
+            "Date": "2024-08-24",
+            "Time": "15:00",
+            "Home": "Real Madrid",
+            "Away": "Chelsea",
+            "Score": None,
+            "Venue": None,
+        },
+    ]
+    return pd.DataFrame(rows).assign(**overrides)
+
+
+def test_upsert_fixtures_counts_and_writes(db):
+    generation = data_generation()
+    counts = upsert_fixtures(_scraped(), season="2024-2025")
+    assert counts == {"inserted": 1, "updated": 1, "unchanged": 0, "skipped": 1}
+    assert data_generation() > generation
+
+    with Session(db) as session:
+        matches = session.scalars(
+            select(Match).where(Match.season == "2024-2025").order_by(Match.date)
+        ).all()
+        assert len(matches) == 2
+        played, fixture = matches
+        assert played.venue.name == "Stamford Bridge"
+    assert (played.home_goals, played.away_goals, played.result) == (1, 3, "A")
+    assert fixture.date == date(2024, 8, 24) and fixture.time == time(15, 0)
+    assert fixture.home_goals is None and fixture.week == 2
+
+
+def test_upsert_fixtures_skips_malformed_rows(db):
+    scraped = _scraped()
+    malformed = scraped.iloc[[1]].assign(Date="2024-08-31", Attendance="60,704")
+    counts = upsert_fixtures(
+        pd.concat([scraped, malformed], ignore_index=True), season="2024-2025"
+    )
+    assert counts == {"inserted": 1, "updated": 1, "unchanged": 0, "skipped": 2}
+
+    with Session(db) as session:
+        dates = session.scalars(
+            select(Match.date).where(Match.season == "2024-2025").order_by(Match.date)
+        ).all()
+    assert dates == [date(2024, 8, 18), date(2024, 8, 24)]
+
+
+def test_upsert_fixtures_is_idempotent_and_set_based(db):
+    upsert_fixtures(_scraped(), season="2024-2025")
+    with count_statements(db) as statements:
+        counts = upsert_fixtures(_scraped(), season="2024-2025")
+    assert counts == {"inserted": 0, "updated": 0, "unchanged": 2, "skipped": 1}
+    # Team aliases (plus the alias/team scan to retry the unknown team), venue
+    # aliases and existing matches; nothing to write
+    assert len(statements) == 5
+
+
+def test_upsert_fixtures_logs_changed_matches(db):
+    upsert_fixtures(_scraped(), season="2024-2025")
+    changes = queries.get_changes_since(0, table_name="matches")
+    assert [(c["match_id"], c["operation"], c["columns"]) for c in changes] == [
+        (4, "insert", None),
+        (2, "update", ["home_goals", "away_goals", "result", "venue_id"]),
+    ]
+
+    seq = queries.get_latest_change_seq()
+    upsert_fixtures(_scraped(), season="2024-2025")
+    assert queries.get_changes_since(seq) == []
+
+
+def test_upsert_fixtures_keeps_stored_values_missing_from_scrape(db):
+    upsert_fixtures(_scraped(), season="2024-2025")
+    upsert_fixtures(_scraped(Score=None, Time=None), season="2024-2025")
+
+    with Session(db) as session:
+        played = session.scalars(
+            select(Match).where(Match.season == "2024-2025", Match.week == 1)
+        ).one()
+    assert (played.home_goals, played.away_goals) == (1, 3)
+    assert played.time == time(16, 30)
+
+
+def test_resolve_team_ids_persists_new_spellings(db):
+    with Session(db) as session:
+        team_ids = resolve_team_ids(
+            session, ["Chelsea", "Arsenal FC", "Chelsae", "Real Madrid"]
+        )
+        session.commit()
+        sources = dict(session.execute(select(TeamAlias.alias, TeamAlias.source)).all())
+    assert team_ids == {"Chelsea": 2, "Arsenal FC": 1, "Chelsae": 2}
+    assert sources == {"Chelsea": "name", "Arsenal FC": "fullname", "Chelsae": "fuzzy"}
+
+
+def test_resolve_team_ids_skips_fuzzy_matching_for_known_aliases(db):
+    with Session(db) as session:
+        first = resolve_team_ids(session, ["Chelsae", "Arsenal"])
+        with (
+            count_statements(db) as statements,
+            patch("app.db.teams.process.extractOne", side_effect=AssertionError),
+        ):
+            assert resolve_team_ids(session, ["Chelsae", "Arsenal"]) == first
+    assert len(statements) == 1
+
+
+def test_resolve_venue_ids_maps_aliases_to_the_canonical_venue(db):
+    with Session(db) as session:
+        alias, canonical = (
+            "The American Express Stadium",
+            "The American Express Community Stadium",
+        )
+        venue_ids = resolve_venue_ids(session, [alias, canonical])
+        session.commit()
+        venues = session.execute(select(Venue.name, Venue.display_name)).all()
+        aliases = session.execute(select(VenueAlias.alias, VenueAlias.venue_id)).all()
+    amex = venue_ids[canonical]
+    assert venue_ids[alias] == amex
+    assert (canonical, "The AMEX") in venues
+    assert dict(aliases) == {alias: amex, canonical: amex}
+
+
+def test_resolve_venue_ids_creates_one_row_per_new_venue(db):
+    with Session(db) as session:
+        first = resolve_venue_ids(session, ["Emirates Stadium", "Portman Road", None])
+        session.commit()
+        assert resolve_venue_ids(session, ["Portman Road"]) == {
+            "Portman Road": first["Portman Road"]
+        }
+        session.commit()
+        names = session.scalars(select(Venue.name).order_by(Venue.venue_id)).all()
+    assert first["Emirates Stadium"] == 1
+    assert names == ["Emirates Stadium", "Portman Road"]
+
+
+def test_match_to_dict_reports_the_venue(db):
+    with Session(db) as session:
+        session.get(Venue, 1).display_name = "The Emirates"
+        home, away = session.get(Match, 1), session.get(Match, 2)
+        assert (home.to_dict()["venue"], home.to_dict()["venue_display"]) == (
+            "Emirates Stadium",
+            "The Emirates",
+        )
+        assert away.to_dict()["venue"] is away.to_dict()["venue_display"] is None
+        session.get(Venue, 1).display_name = None
+        assert home.to_dict()["venue_display"] == "Emirates Stadium"
+
+
+def test_add_shooting_stats_bulk_inserts_new_rows(db):
+    df = pd.DataFrame(
+        [
+            # Already stored (conftest)
+            {
+                "Date": "2023-08-12",
+                "Venue": "Home",
+                "Opponent": "Chelsea",
+                "Sh": 12,
+                "SoT": 5,
+            },
+            {
+                "Date": "2022-08-06",
+                "Venue": "Away",
+                "Opponent": "Chelsea",
+                "Sh": 9,
+                "SoT": None,
+            },
+            {
+                "Date": "2024-08-18",
+                "Venue": "Away",
+                "Opponent": "Chelsea",
+                "Sh": 14,
+                "SoT": 6,
+            },
+            {
+                "Date": "2024-08-18",
+                "Venue": "Away",
+                "Opponent": "Real Madrid",
+                "Sh": 1,
+                "SoT": 1,
+            },
+        ]
+    )
+    seasons = ["2022-2023", "2023-2024", "2024-2025"]
+    add_shooting_stats(df, "Arsenal", seasons)
+    with count_statements(db) as statements:
+        add_shooting_stats(df.iloc[:3], "Arsenal", seasons)
+
+    # Team aliases, matches and stored keys; nothing left to insert
+    assert len(statements) == 3
+    changes = queries.get_changes_since(0, table_name="match_shooting_stats")
+    assert sorted(c["match_id"] for c in changes) == [2, 3]
+    with Session(db) as session:
+        stats = session.execute(
+            select(
+                MatchShootingStat.match_id, MatchShootingStat.sh, MatchShootingStat.sot
+            )
+            .where(MatchShootingStat.team_id == 1)
+            .order_by(MatchShootingStat.match_id)
+        ).all()
+    assert stats == [(1, 12, 5), (2, 14, 6), (3, 9, None)]
+
+
+def _table(season, week):
+    return [
+        (r["team"], r["position"], r["played"], r["points"], r["goal_difference"])
+        for r in queries.get_league_table(season, week)
+    ]
+
+
+def test_upsert_fixtures_refreshes_league_table_from_the_affected_week(db):
+    upsert_fixtures(_scraped(), season="2024-2025")
+    assert _table("2024-2025", 1) == [("Arsenal", 1, 1, 3, 2), ("Chelsea", 2, 1, 0, -2)]
+    assert _table("2024-2025", 2) == []  # no week 2 results yet
+
+    # Marks week 1 so a rewrite would show
+    with Session(db) as session:
+        session.execute(
+            update(LeagueTableEntry).where(LeagueTableEntry.week == 1).values(won=9)
+        )
+        session.commit()
+    upsert_fixtures(_scraped(Score=["1–3", "2–2", None]), season="2024-2025")
+
+    assert [r["won"] for r in queries.get_league_table("2024-2025", 1)] == [9, 9]
+    assert _table("2024-2025", None) == [
+        ("Arsenal", 1, 2, 4, 2),
+        ("Chelsea", 2, 2, 1, -2),
+    ]
+
+
+def test_season_aggregates_are_built_when_the_last_result_arrives(db, monkeypatch):
+    monkeypatch.setattr(settings, "CURRENT_SEASON", "2024-2025")  # still in progress
+    upsert_fixtures(_scraped(), season="2024-2025")
+    assert queries.get_team_season_aggregates(["2024-2025"]).empty  # week 2 unplayed
+
+    upsert_fixtures(_scraped(Score=["1–3", "2–2", None]), season="2024-2025")
+    aggregates = queries.get_team_season_aggregates(["2024-2025", "2023-2024"])
+    assert aggregates.to_dict("records") == [
+        {
+            "season": "2024-2025",
+            "team": "Arsenal",
+            "position": 1,
+            "goals_for": 5,
+            "goals_against": 3,
+            "goal_difference": 2,
+        },
+        {
+            "season": "2024-2025",
+            "team": "Chelsea",
+            "position": 2,
+            "goals_for": 3,
+            "goals_against": 5,
+            "goal_difference": -2,
+        },
+    ]
+    assert queries.get_data_generation("2024-2025", ["team_season_aggregates"]) == 1
+
+
+def test_writers_bump_the_generation_of_what_changed(db):
+    upsert_fixtures(_scraped(), season="2024-2025")
+    assert queries.get_data_generation("2024-2025", ["matches"]) == 1
+    upsert_fixtures(_scraped(), season="2024-2025")  # nothing new
+    assert queries.get_data_generation("2024-2025", ["matches"]) == 1
+    assert queries.get_data_generation("2023-2024") == 0
+
+
+def test_cached_predictions_valid_until_season_data_changes(db):
+    predictions = pd.DataFrame(
+        [
+            {
+                "match_id": 2,
+                "PredFTHG": 1,
+                "PredFTAG": 1,
+                "PredScore": "1-1",
+                "PredResult": "D",
+            }
+        ]
+    )
+    generation = queries.get_data_generation("2024-2025", PREDICTION_INPUT_TABLES)
+    update_cache(predictions, MagicMock(), generation)
+    assert queries.get_data_generation("2024-2025", ["predictions_cache"]) == 1
+
+    with Session(db) as session:
+        assert check_cache([2], None, session)
+        assert not check_cache([1, 2], None, session)  # match 1 has no generation
+
+    upsert_fixtures(_scraped(), season="2024-2025")
+    with Session(db) as session:
+        assert not check_cache([2], None, session)
+
+
+def test_cached_predictions_depend_on_earlier_seasons_and_the_model(db):
+    predictions = pd.DataFrame(
+        {
+            "match_id": [2],
+            "PredFTHG": [1],
+            "PredFTAG": [1],
+            "PredScore": ["1-1"],
+            "PredResult": ["D"],
+        }
+    )
+    generation = queries.get_data_generation(
+        "2024-2025", PREDICTION_INPUT_TABLES, include_earlier=True
+    )
+    update_cache(predictions, MagicMock(), generation, model_version="model@1")
+
+    with Session(db) as session:
+        assert check_cache([2], None, session, model_version="model@1")
+        assert not check_cache([2], None, session, model_version="model@2")
+
+    # A correction to history changes the features of later seasons
+    run_write(bump_generations, [("2023-2024", "matches")])
+    with Session(db) as session:
+        assert not check_cache([2], None, session, model_version="model@1")
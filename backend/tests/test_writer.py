@@ -0,0 +1,97 @@
+"""
+Tests for the single database writer.
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.models import Team
+from app.db.writer import DatabaseWriter, run_write
+
+
+def _add_team(session, name):
+    session.add(Team(name=name, fullname=f"{name} FC", fbref_team_id=name.lower()))
+    session.flush()
+    return threading.current_thread().name
+
+
+def _team_names(engine):
+    with Session(engine) as session:
+        return set(session.scalars(select(Team.name)))
+
+
+def test_run_write_commits_on_writer_thread(db):
+    assert run_write(_add_team, "Spurs") == "db-writer"
+    assert "Spurs" in _team_names(db)
+
+
+def test_queued_jobs_share_one_transaction(db):
+    commits = []
+    session_factory = sessionmaker(bind=db)
+    event.listen(session_factory, "after_commit", commits.append)
+    writer = DatabaseWriter(session_factory)
+    gate = threading.Event()
+    try:
+        blocker = writer.submit(lambda session: gate.wait())
+        futures = [writer.submit(_add_team, f"Team {i}") for i in range(5)]
+        gate.set()
+        blocker.result()
+        for future in futures:
+            future.result()
+    finally:
+        writer.close()
+    # The blocked job commits alone; everything queued behind it commits once
+    assert len(commits) <= 2
+    assert {f"Team {i}" for i in range(5)} <= _team_names(db)
+
+
+def test_failing_job_does_not_roll_back_the_rest_of_the_batch(db):
+    writer = DatabaseWriter(sessionmaker(bind=db))
+    gate = threading.Event()
+    try:
+        writer.submit(lambda session: gate.wait())
+        good = writer.submit(_add_team, "Spurs")
+        bad = writer.submit(_add_team, "Arsenal")  # duplicate name
+        also_good = writer.submit(_add_team, "Everton")
+        gate.set()
+        good.result(), also_good.result()
+        with pytest.raises(IntegrityError):
+            bad.result()
+    finally:
+        writer.close()
+    assert {"Spurs", "Everton"} <= _team_names(db)
+
+
+def test_nested_run_write_runs_inline(db):
+    def outer(session):
+        # Would deadlock if it queued behind its own job
+        return run_write(_add_team, "Spurs")
+
+    assert run_write(outer) == "db-writer"
+    assert "Spurs" in _team_names(db)
+
+
+def test_publishes_only_when_asked_before_callers_are_released(db):
+    calls = []
+
+    def on_publish():
+        calls.append(_team_names(db))
+        raise RuntimeError("publish failed")  # logged, the write still succeeds
+
+    writer = DatabaseWriter(sessionmaker(bind=db), on_publish=on_publish)
+    try:
+        writer.submit(_add_team, "Spurs").result()
+        writer.submit(_add_team, "Fulham").result()
+        assert calls == []  # plain writes wait for the end of the run
+
+        writer.submit(_add_team, "Brentford", publish=True).result()
+        assert len(calls) == 1 and "Brentford" in calls[0]
+
+        writer.publish()
+        assert len(calls) == 2
+    finally:
+        writer.close()